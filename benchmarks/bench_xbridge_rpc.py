@@ -0,0 +1,101 @@
+"""
+Benchmark XBridge JSON-RPC throughput against a local stub server.
+
+Compares the legacy per-call ClientSession path (``session=None``) with the
+pooled keep-alive session used by XBridgeManager, and with JSON-RPC batching
+on top of the pooled session.
+
+Usage:
+    python benchmarks/bench_xbridge_rpc.py [--calls 2000] [--concurrency 5] [--batch-size 10]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.rpc import create_rpc_session, rpc_batch_call, rpc_call  # noqa: E402
+
+RPC_USER = "bench"
+RPC_PASSWORD = "bench"
+
+
+async def _handle(request: web.Request) -> web.Response:
+    data = await request.json()
+    if isinstance(data, list):
+        return web.json_response([{"jsonrpc": "2.0", "result": {"method": d.get("method")}, "id": d.get("id")}
+                                  for d in data])
+    return web.json_response({"jsonrpc": "2.0", "result": {"method": data.get("method")}, "id": data.get("id")})
+
+
+async def start_stub_server():
+    app = web.Application()
+    app.router.add_post("/", _handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port
+
+
+async def run_calls(port, calls, concurrency, session):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await rpc_call("dxGetOrder", [f"order{i}"], rpc_user=RPC_USER, rpc_password=RPC_PASSWORD,
+                                  rpc_port=port, debug=0, session=session)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+    assert all(r is not None for r in results)
+    return calls / elapsed
+
+
+async def run_batched_calls(port, calls, concurrency, batch_size, session):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_batch(start):
+        async with semaphore:
+            batch = [("dxGetOrder", [f"order{i}"]) for i in range(start, min(start + batch_size, calls))]
+            return await rpc_batch_call(batch, rpc_user=RPC_USER, rpc_password=RPC_PASSWORD,
+                                        rpc_port=port, session=session)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one_batch(i) for i in range(0, calls, batch_size)))
+    elapsed = time.perf_counter() - start
+    assert all(item is not None for batch in results for item in batch)
+    return calls / elapsed
+
+
+async def main(calls, concurrency, batch_size):
+    runner, port = await start_stub_server()
+    try:
+        per_call = await run_calls(port, calls, concurrency, session=None)
+        print(f"per-call session : {per_call:10.1f} calls/sec")
+
+        session = create_rpc_session(RPC_USER, RPC_PASSWORD, limit=concurrency)
+        try:
+            pooled = await run_calls(port, calls, concurrency, session=session)
+            batched = await run_batched_calls(port, calls, concurrency, batch_size, session=session)
+        finally:
+            await session.close()
+        print(f"pooled keep-alive: {pooled:10.1f} calls/sec  (x{pooled / per_call:.2f})")
+        print(f"pooled + batch {batch_size:<3}: {batched:10.1f} calls/sec  (x{batched / per_call:.2f})")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.concurrency, args.batch_size))
@@ -13,7 +13,7 @@ Key improvements:
 import asyncio
 import copy
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -28,6 +28,7 @@ import numpy as np
 import pandas as pd
 
 from definitions.logger import setup_logging
+from definitions.orders import GridOrder
 from strategies.range_maker_strategy import RangeMakerStrategy
 
 
@@ -352,40 +353,40 @@ class PortfolioTracker:
         )
         self.snapshots.append(snapshot)
 
-    def execute_trade(self, order: Dict[str, Any], timestamp: datetime, base_price: float = None) -> Optional[
+    def execute_trade(self, order: GridOrder, timestamp: datetime, base_price: float = None) -> Optional[
         TradeRecord]:
         """Execute trade and update balances."""
         # Check sufficient balance
-        maker_token = order['maker']
-        maker_size = order['maker_size']
+        maker_token = order.maker
+        maker_size = order.maker_size
 
         if self.current_balances.get(maker_token, 0) < maker_size:
             return None
 
         # Update balances
-        self.current_balances[order['maker']] -= order['maker_size']
-        self.current_balances[order['taker']] += order['taker_size']
+        self.current_balances[order.maker] -= order.maker_size
+        self.current_balances[order.taker] += order.taker_size
 
         # Create trade record
-        if order['type'] == 'buy':
-            base_amount = order['taker_size']
-            quote_amount = order['maker_size']
+        if order.type == 'buy':
+            base_amount = order.taker_size
+            quote_amount = order.maker_size
         else:
-            base_amount = order['maker_size']
-            quote_amount = order['taker_size']
+            base_amount = order.maker_size
+            quote_amount = order.taker_size
 
         # Use provided base_price or fall back to order price
-        trade_base_price = base_price if base_price is not None else order['price']
+        trade_base_price = base_price if base_price is not None else order.price
 
         trade = TradeRecord(
             timestamp=timestamp,
             pair=self.pair,
-            side=order['type'],
-            price=order['price'],
+            side=order.type,
+            price=order.price,
             base_price=trade_base_price,
             base_amount=base_amount,
             quote_amount=quote_amount,
-            order_id=order.get('id', 'sim')
+            order_id=order.id if order.id is not None else 'sim'
         )
 
         self.trades.append(trade)
@@ -535,38 +536,32 @@ class FillSimulator:
         else:
             return self._get_close_fills(orders, market_data)
 
-    def _get_ohlc_fills(self, orders: List[Dict[str, Any]], data: Dict[str, float]) -> List[Dict[str, Any]]:
+    def _get_ohlc_fills(self, orders: List[GridOrder], data: Dict[str, float]) -> List[GridOrder]:
         """Simulate fills using only high and low prices from historical data."""
         filled = []
         low, high = data['low'], data['high']
 
         for order in orders:
-            if order.get('status') == 'filled':
+            if order.status == 'filled':
                 continue
 
             # For buy orders: fill if the low price is <= our order price
             # This means the price reached our buy limit or below during this period
-            if order['type'] == 'buy' and low <= order['price']:
+            if order.type == 'buy' and low <= order.price:
                 # Fill at our limit price (since we're placing limit orders)
                 # This is more realistic - we get filled at our specified price, not better
-                fill_price = order['price']
-                filled_order = order.copy()
-                filled_order['price'] = fill_price
-                filled_order['status'] = 'filled'
-                filled.append(filled_order)
+                fill_price = order.price
+                filled.append(replace(order, price=fill_price, status='filled'))
             # For sell orders: fill if the high price is >= our order price
             # This means the price reached our sell limit or above during this period
-            elif order['type'] == 'sell' and high >= order['price']:
+            elif order.type == 'sell' and high >= order.price:
                 # Fill at our limit price
-                fill_price = order['price']
-                filled_order = order.copy()
-                filled_order['price'] = fill_price
-                filled_order['status'] = 'filled'
-                filled.append(filled_order)
+                fill_price = order.price
+                filled.append(replace(order, price=fill_price, status='filled'))
 
         return filled
 
-    def _get_close_fills(self, orders: List[Dict[str, Any]], data: Dict[str, float]) -> List[Dict[str, Any]]:
+    def _get_close_fills(self, orders: List[GridOrder], data: Dict[str, float]) -> List[GridOrder]:
         """Simulate fills using only high and low prices (not close)."""
         # Since we're only using high and low, delegate to ohlc method
         # This ensures consistency in fill logic
@@ -813,24 +808,24 @@ class AnimationGenerator:
         buy_base_sizes = []
         buy_quote_sizes = []
         for order in frame_data['buy_orders'].values():
-            buy_prices.append(order['price'])
-            buy_base_sizes.append(order['taker_size'])
-            buy_quote_sizes.append(order['maker_size'])
-            self.logger.debug(f"BUY ORDER: Price={order['price']:.6f}, "
-                             f"Base (taker)={order['taker_size']:.6f} {self.base_token}, "
-                             f"Quote (maker)={order['maker_size']:.6f} {self.quote_token}")
+            buy_prices.append(order.price)
+            buy_base_sizes.append(order.taker_size)
+            buy_quote_sizes.append(order.maker_size)
+            self.logger.debug(f"BUY ORDER: Price={order.price:.6f}, "
+                             f"Base (taker)={order.taker_size:.6f} {self.base_token}, "
+                             f"Quote (maker)={order.maker_size:.6f} {self.quote_token}")
 
         # Plot sell orders with debug logging
         sell_prices = []
         sell_base_sizes = []
         sell_quote_sizes = []
         for order in frame_data['sell_orders'].values():
-            sell_prices.append(order['price'])
-            sell_base_sizes.append(order['maker_size'])
-            sell_quote_sizes.append(order['taker_size'])
-            self.logger.debug(f"SELL ORDER: Price={order['price']:.6f}, "
-                             f"Base (maker)={order['maker_size']:.6f} {self.base_token}, "
-                             f"Quote (taker)={order['taker_size']:.6f} {self.quote_token}")
+            sell_prices.append(order.price)
+            sell_base_sizes.append(order.maker_size)
+            sell_quote_sizes.append(order.taker_size)
+            self.logger.debug(f"SELL ORDER: Price={order.price:.6f}, "
+                             f"Base (maker)={order.maker_size:.6f} {self.base_token}, "
+                             f"Quote (taker)={order.taker_size:.6f} {self.quote_token}")
 
         # Log order summary
         if buy_prices:
@@ -1124,15 +1119,15 @@ class RangeMakerBacktester:
 
             # Process each filled order sequentially
             for order_idx, order in enumerate(filled_orders):
-                # Execute the trade and get TradeRecord with base_price added
-                trade = self.portfolio.execute_trade(order, timestamp, base_price=order.get('base_price'))
+                # Execute the trade and get TradeRecord (grid orders carry no separate base price)
+                trade = self.portfolio.execute_trade(order, timestamp)
                 if trade:
                     self.logger.info(
                         f"Trade #{order_idx + 1}: {trade.side.upper()} {trade.base_amount:.6f} @ {trade.price:.6f} (Base: {trade.base_price:.6f})")
 
                     # Record filled order in history
                     filled_record = {
-                        **order,
+                        **order.to_dict(),
                         'filled_at': timestamp
                     }
                     # Get the grid from the strategy's order grids
@@ -1141,10 +1136,10 @@ class RangeMakerBacktester:
                         grid.filled_orders_history.append(filled_record)
 
                     self.logger.info(
-                        f"Trade executed: {order['type']} {order['taker_size']:.6f} @ {order['price']:.6f}")
+                        f"Trade executed: {order.type} {order.taker_size:.6f} @ {order.price:.6f}")
 
                 # Mark order as filled
-                order['status'] = 'filled'
+                order.status = 'filled'
 
                 # Update mock balances
                 self._update_mock_balances(pair_instance)
@@ -1152,8 +1147,8 @@ class RangeMakerBacktester:
 
                 # Update strategy's mid price to this fill price
                 old_price = config.current_mid_price
-                self.strategy.update_mid_price(pair, order['price'])
-                self.logger.info(f"Updated mid price to fill price: {old_price:.6f} -> {order['price']:.6f}")
+                self.strategy.update_mid_price(pair, order.price)
+                self.logger.info(f"Updated mid price to fill price: {old_price:.6f} -> {order.price:.6f}")
 
                 # Regrid after each fill - this will use the updated mid price
                 self.logger.debug("Regridding after fill...")
@@ -9,8 +9,11 @@ import pytest
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from definitions.state_store import SqliteStateStore
 from definitions.trade_state import TradeState
 
+TEST_ROOT = '/tmp/test_trade_state_root'
+
 
 # Mock strategy and config_manager for tests
 @pytest.fixture
@@ -19,7 +22,8 @@ def mock_strategy():
     strategy = MagicMock()
     strategy.config_manager = MagicMock()
     # Use a temporary directory for test state files
-    strategy.config_manager.ROOT_DIR = '/tmp/test_trade_state_root'
+    strategy.config_manager.ROOT_DIR = TEST_ROOT
+    strategy.config_manager.state_store = SqliteStateStore(os.path.join(TEST_ROOT, "data", "state.sqlite3"))
     strategy.config_manager.general_log = MagicMock()
     strategy.test_mode = True
     return strategy
@@ -30,7 +34,8 @@ def mock_strategy_prod_mode():
     """Creates a mock strategy object with test_mode=False."""
     strategy = MagicMock()
     strategy.config_manager = MagicMock()
-    strategy.config_manager.ROOT_DIR = '/tmp/test_trade_state_root'
+    strategy.config_manager.ROOT_DIR = TEST_ROOT
+    strategy.config_manager.state_store = SqliteStateStore(os.path.join(TEST_ROOT, "data", "state.sqlite3"))
     strategy.config_manager.general_log = MagicMock()
     strategy.test_mode = False
     return strategy
@@ -43,9 +48,9 @@ def trade_state_manager(mock_strategy):
     of the test directory.
     """
     # Setup: ensure the test directory is clean before each test
+    if os.path.exists(TEST_ROOT):
+        shutil.rmtree(TEST_ROOT)
     state_dir = TradeState._get_state_dir(mock_strategy)
-    if os.path.exists(state_dir):
-        shutil.rmtree(state_dir)
     os.makedirs(state_dir)
 
     ts = TradeState(mock_strategy, 'test_check_id_123')
@@ -53,8 +58,9 @@ def trade_state_manager(mock_strategy):
     yield ts
 
     # Teardown: clean up the directory after each test
-    if os.path.exists(state_dir):
-        shutil.rmtree(state_dir)
+    mock_strategy.config_manager.state_store.close()
+    if os.path.exists(TEST_ROOT):
+        shutil.rmtree(TEST_ROOT)
 
 
 def test_trade_state_initialization(trade_state_manager, mock_strategy):
@@ -63,21 +69,20 @@ def test_trade_state_initialization(trade_state_manager, mock_strategy):
     assert trade_state_manager.strategy == mock_strategy
     state_dir = TradeState._get_state_dir(mock_strategy)
     assert trade_state_manager.state_dir == state_dir
-    assert os.path.exists(state_dir)
+    assert trade_state_manager.namespace == 'arbitrage_states_test'
     assert trade_state_manager.state_file_path == os.path.join(state_dir, 'test_check_id_123.json')
     assert trade_state_manager.state_data == {'check_id': 'test_check_id_123'}
 
 
-def test_save_state(trade_state_manager):
-    """Tests saving the trade state to a file."""
+def test_save_state(trade_state_manager, mock_strategy):
+    """Tests saving the trade state to the journal, surviving a reopen."""
     status = 'test_status'
     data = {'key': 'value', 'num': 123}
 
     trade_state_manager.save(status, data)
+    mock_strategy.config_manager.state_store.close()
 
-    assert os.path.exists(trade_state_manager.state_file_path)
-    with open(trade_state_manager.state_file_path, 'r') as f:
-        saved_data = json.load(f)
+    saved_data = trade_state_manager.load()
 
     assert saved_data['check_id'] == 'test_check_id_123'
     assert saved_data['status'] == status
@@ -88,32 +93,45 @@ def test_save_state(trade_state_manager):
 
 
 def test_delete_state(trade_state_manager):
-    """Tests deleting a state file."""
-    # First save a file to be deleted
+    """Tests deleting a state."""
+    # First save a state to be deleted
     trade_state_manager.save('deleting', {})
-    assert os.path.exists(trade_state_manager.state_file_path)
+    assert trade_state_manager.load() is not None
 
     trade_state_manager.delete()
 
-    assert not os.path.exists(trade_state_manager.state_file_path)
+    assert trade_state_manager.load() is None
 
 
-def test_archive_state(trade_state_manager):
-    """Tests archiving a state file."""
+def test_archive_state(trade_state_manager, mock_strategy):
+    """Tests archiving a state."""
     trade_state_manager.save('archiving', {'some_data': 'foo'})
-    assert os.path.exists(trade_state_manager.state_file_path)
 
     reason = 'test_reason'
     trade_state_manager.archive(reason)
 
-    assert not os.path.exists(trade_state_manager.state_file_path)
-    archive_dir = os.path.join(trade_state_manager.state_dir, 'archive')
-    assert os.path.exists(archive_dir)
+    assert trade_state_manager.load() is None
+    archived = TradeState.get_archived_trades(mock_strategy)
+    assert len(archived) == 1
+    archive_key, archived_state = next(iter(archived.items()))
+    assert reason in archive_key
+    assert 'test_check_id_123' in archive_key
+    assert archived_state['some_data'] == 'foo'
+    assert archived_state['archive_reason'] == reason
 
-    archived_files = os.listdir(archive_dir)
-    assert len(archived_files) == 1
-    assert reason in archived_files[0]
-    assert 'test_check_id_123' in archived_files[0]
+
+def test_legacy_state_file_resumed_and_archived(trade_state_manager, mock_strategy):
+    """Tests that a state file written by earlier versions is resumed, then moved to the archive."""
+    with open(trade_state_manager.state_file_path, 'w') as f:
+        json.dump({'check_id': 'test_check_id_123', 'status': 'XBRIDGE_INITIATED'}, f)
+
+    unfinished = TradeState.get_unfinished_trades(mock_strategy)
+    assert [u['status'] for u in unfinished] == ['XBRIDGE_INITIATED']
+
+    trade_state_manager.archive('resumed-xb-failed')
+    assert not os.path.exists(trade_state_manager.state_file_path)
+    assert trade_state_manager.load() is None
+    assert len(os.listdir(os.path.join(trade_state_manager.state_dir, 'archive'))) == 1
 
 
 def test_get_unfinished_trades(mock_strategy, trade_state_manager):
@@ -139,7 +157,8 @@ def test_get_unfinished_trades(mock_strategy, trade_state_manager):
 
 
 def test_cleanup_all_states(mock_strategy):
-    """Tests the cleanup of all state files and directories."""
+    """Tests the cleanup of all states, journaled and legacy files."""
+    TradeState(mock_strategy, 'journaled').save('pending', {})
     state_dir = TradeState._get_state_dir(mock_strategy)
     archive_dir = os.path.join(state_dir, 'archive')
 
@@ -158,6 +177,7 @@ def test_cleanup_all_states(mock_strategy):
     # The directory itself should exist but be empty
     assert os.path.exists(state_dir)
     assert not os.listdir(state_dir)
+    assert TradeState.get_unfinished_trades(mock_strategy) == []
 
 
 def test_get_state_dir_prod_mode(mock_strategy_prod_mode):
@@ -168,10 +188,9 @@ def test_get_state_dir_prod_mode(mock_strategy_prod_mode):
 
 
 def test_get_unfinished_trades_no_dir(mock_strategy):
-    """Tests that get_unfinished_trades returns empty list if state dir does not exist."""
-    state_dir = TradeState._get_state_dir(mock_strategy)
-    if os.path.exists(state_dir):
-        shutil.rmtree(state_dir)
+    """Tests that get_unfinished_trades returns empty list if nothing was stored."""
+    if os.path.exists(TEST_ROOT):
+        shutil.rmtree(TEST_ROOT)
     unfinished = TradeState.get_unfinished_trades(mock_strategy)
     assert unfinished == []
 
@@ -199,7 +218,7 @@ def test_get_unfinished_trades_malformed_json(trade_state_manager):
 
 
 def test_delete_non_existent_state(trade_state_manager):
-    """Tests that deleting a non-existent state file does not raise an error."""
+    """Tests that deleting a non-existent state does not raise an error."""
     assert not os.path.exists(trade_state_manager.state_file_path)
     try:
         trade_state_manager.delete()
@@ -208,7 +227,7 @@ def test_delete_non_existent_state(trade_state_manager):
 
 
 def test_archive_non_existent_state(trade_state_manager):
-    """Tests that archiving a non-existent state file does not raise an error."""
+    """Tests that archiving a non-existent state does not raise an error."""
     assert not os.path.exists(trade_state_manager.state_file_path)
     try:
         trade_state_manager.archive("test_reason")
@@ -32,7 +32,16 @@ if __name__ == '__main__':
     general_log.info("Initializing to cancel all orders...")
     xbridge_manager = XBridgeManager(MinimalConfig(general_log))
     general_log.info("Sending cancel all orders command...")
-    successful = asyncio.run(xbridge_manager.cancelallorders())
+
+
+    async def cancel_and_close():
+        try:
+            return await xbridge_manager.cancelallorders()
+        finally:
+            await xbridge_manager.close_session()
+
+
+    successful = asyncio.run(cancel_and_close())
     if successful:
         general_log.info(f"Successfully cancelled {len(successful)} order(s).")
     else:
@@ -1,17 +1,43 @@
 import asyncio
 import json
 import logging
+import os
 import threading
 import time
+import uuid
+import weakref
 
-import ccxt
+import ccxt.async_support as ccxt
 
 from definitions.error_handler import ErrorHandler
 from definitions.errors import RPCConfigError, CriticalError
-from definitions.rpc import rpc_call, is_port_open
+from definitions.markets_cache import MarketsCache
+from definitions.proxy_health import ProxyHealth
+from definitions.rpc import rpc_call
 from proxy_ccxt import AsyncPriceService
 
 
+class _SharedThrottle:
+    """
+    Leaky-bucket rate limiter shared by every loop's clone of one exchange. Replaces the
+    per-instance ccxt throttler, so bots running on different threads still respect a single
+    ``rateLimit`` (ms per unit of request cost).
+    """
+
+    def __init__(self, rate_limit_ms):
+        self.interval = rate_limit_ms / 1000.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    async def __call__(self, cost=None):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self.interval * (cost if cost is not None else 1)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
 class CCXTManager:
     # Class-level variables for shared proxy state
     _proxy_service_instance = None
@@ -19,10 +45,27 @@ class CCXTManager:
     _proxy_port = 2233
     _proxy_lock = threading.Lock()
     _proxy_ref_count = 0  # Track active strategies using proxy
+    # Cached proxy liveness read by ccxt_call_fetch_tickers instead of a blocking port check
+    _proxy_health = ProxyHealth("127.0.0.1", _proxy_port)
+    # Sent with every proxy request so the proxy counts this process as one requester of its
+    # symbols, however many connections the requests arrive on
+    PROXY_CLIENT_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
 
     # Class-level logger for proxy events
     _proxy_logger = logging.getLogger('ccxt_manager.proxy')
 
+    # Exchanges built by init_ccxt_instance: id(instance) -> {"instance", "exchange", "config",
+    # "key", "refs", "throttle", "clones"}. The instance itself only holds metadata (id, markets,
+    # symbols); requests go through one async clone per event loop, since an async ccxt instance
+    # is bound to the loop that opened it. Every ConfigManager in the process asking for the same
+    # exchange/hostname/API key gets the same instance (ref-counted in _exchange_keys), so the
+    # markets table and the rate limit are shared by all bots and GUI tabs.
+    _exchanges = {}
+    _exchange_keys = {}  # (exchange, hostname, api_key) -> id(instance)
+    _exchanges_lock = threading.Lock()
+    MARKETS_RETRY_DELAY = 1.0
+    MARKETS_RETRY_MAX_DELAY = 60.0
+
     @classmethod
     def register_strategy(cls):
         """Call whenever a strategy starts"""
@@ -58,6 +101,13 @@ class CCXTManager:
                     cls._proxy_service_thread = None
                     cls._proxy_service_instance = None
 
+    @classmethod
+    def proxy_stream_url(cls):
+        """URL of the proxy's ticker subscription feed, or None while the proxy is not known to be up."""
+        if not cls._proxy_health.is_up():
+            return None
+        return f"http://127.0.0.1:{cls._proxy_port}/ws"
+
     def __init__(self, config_manager):
         self.cex_orderbook = None
         self.cex_orderbook_timer = None
@@ -65,6 +115,8 @@ class CCXTManager:
         # Instance doesn't need its own proxy_process reference
         self.error_handler = ErrorHandler(config_manager, logger=self.config_manager.ccxt_log)
         self.logger = self.config_manager.ccxt_log
+        self.markets_cache = MarketsCache.for_root(config_manager.ROOT_DIR, logger=self.logger)
+        self._markets_refresh_task = None
 
     @classmethod
     def _cleanup_proxy(cls):
@@ -122,49 +174,170 @@ class CCXTManager:
                 return None
 
         if exchange in ccxt.exchanges:
-            exchange_class = getattr(ccxt, exchange)
-            if hostname:
-                instance = exchange_class({
+            key = (exchange, hostname or None, api_key)
+            with CCXTManager._exchanges_lock:
+                entry = CCXTManager._exchanges.get(CCXTManager._exchange_keys.get(key))
+                if entry is not None:
+                    entry["refs"] += 1
+                    self.logger.debug(f"Reusing shared {exchange} instance, refcount: {entry['refs']}")
+                    return entry["instance"]
+                config = {
                     'apiKey': api_key,
                     'secret': api_secret,
                     'enableRateLimit': True,
                     'rateLimit': 1000,
-                    'hostname': hostname,  # 'global.bittrex.com',
-                })
-            else:
-                instance = exchange_class({
-                    'apiKey': api_key,
-                    'secret': api_secret,
-                    'enableRateLimit': True,
-                    'rateLimit': 1000,
-                })
-            done = False
-            while not done:
-                try:
-                    # Run blocking load_markets in a thread pool executor
-                    instance.load_markets()  # Directly call the blocking method
-                except Exception as e:
-                    self.error_handler.handle(
-                        e,
-                        context={"method": "init_ccxt_instance", "exchange": exchange}
-                    )
-                    # Continue retrying unless it's a critical error
-                    if isinstance(e, CriticalError):
-                        raise RPCConfigError("No valid Blocknet Core Config path found.", context={"context": str(e)})
-                else:
-                    done = True
+                }
+                if hostname:
+                    config['hostname'] = hostname  # 'global.bittrex.com',
+                instance = getattr(ccxt, exchange)(config)
+                CCXTManager._exchanges[id(instance)] = {
+                    "instance": instance,
+                    "exchange": exchange,
+                    "config": config,
+                    "key": key,
+                    "refs": 1,
+                    "throttle": _SharedThrottle(config['rateLimit']),
+                    "clones": weakref.WeakKeyDictionary(),
+                }
+                CCXTManager._exchange_keys[key] = id(instance)
+            # Markets are loaded without blocking by ensure_markets() once a bot loop runs
             return instance
         else:
             self.logger.error(f"Unsupported exchange: {exchange}")
             return None
 
-    async def _ccxt_blocking_call_with_retry(self, func, context, *args):
-        """Helper method to run a blocking CCXT function with retry and error handling.
+    def exchange_for_loop(self, ccxt_o):
+        """
+        Async exchange to issue requests with on the running loop: this loop's clone of an
+        instance built by init_ccxt_instance (created on first use, sharing its markets), or
+        ``ccxt_o`` itself for any other instance.
+        """
+        entry = CCXTManager._exchanges.get(id(ccxt_o))
+        if entry is None:
+            return ccxt_o
+        loop = asyncio.get_running_loop()
+        with CCXTManager._exchanges_lock:
+            clone = entry["clones"].get(loop)
+            if clone is None:
+                clone = getattr(ccxt, entry["exchange"])(dict(entry["config"]))
+                clone.throttle = entry["throttle"]
+                if ccxt_o.markets:
+                    clone.set_markets(ccxt_o.markets, ccxt_o.currencies)
+                entry["clones"][loop] = clone
+        return clone
+
+    async def ensure_markets(self, ccxt_o):
+        """
+        Make markets available for ``ccxt_o``: from the on-disk cache when present (refreshed
+        in the background once older than its TTL), else loaded on the running loop with
+        exponential backoff. Returns False if the error handler gives up.
+        """
+        if ccxt_o is None:
+            return False
+        if ccxt_o.markets:
+            return True
+        hostname = self._exchange_hostname(ccxt_o)
+        cache = self.markets_cache
+        cached = cache.load(ccxt_o.id, hostname) if cache else None
+        if cached is None:
+            return await self._load_markets(ccxt_o, hostname)
+
+        markets, currencies, age = cached
+        try:
+            self._share_markets(ccxt_o, markets, currencies)
+        except Exception as e:
+            self.logger.warning(f"Discarding unusable cached markets for {ccxt_o.id}: {e}")
+            return await self._load_markets(ccxt_o, hostname)
+        self.logger.info(f"Markets for {ccxt_o.id} loaded from cache: {len(ccxt_o.markets)} markets, {age:.0f}s old")
+        if cache.is_stale(age):
+            self._markets_refresh_task = asyncio.ensure_future(self._refresh_markets(ccxt_o, hostname))
+        return True
+
+    async def _load_markets(self, ccxt_o, hostname, reload=False):
+        exchange = self.exchange_for_loop(ccxt_o)
+        delay = self.MARKETS_RETRY_DELAY
+        err_count = 0
+        while True:
+            try:
+                await exchange.load_markets(reload)
+                break
+            except Exception as e:
+                if isinstance(e, CriticalError):
+                    raise RPCConfigError("No valid Blocknet Core Config path found.", context={"context": str(e)})
+                err_count += 1
+                if not await self.error_handler.handle_async(
+                        e,
+                        context={"method": "ensure_markets", "exchange": exchange.id, "err_count": err_count}
+                ):
+                    return False
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MARKETS_RETRY_MAX_DELAY)
+        self._share_markets(ccxt_o, exchange.markets, exchange.currencies, source=exchange)
+        if self.markets_cache:
+            self.markets_cache.save_in_background(ccxt_o.id, hostname, exchange.markets, exchange.currencies)
+        self.logger.info(f"Markets loaded for {exchange.id}: {len(ccxt_o.markets)} markets")
+        return True
+
+    async def _refresh_markets(self, ccxt_o, hostname):
+        try:
+            await self._load_markets(ccxt_o, hostname, reload=True)
+        except Exception as e:
+            self.logger.warning(f"Background markets refresh failed for {ccxt_o.id}, keeping cached markets: {e}")
+
+    @staticmethod
+    def _exchange_hostname(ccxt_o):
+        entry = CCXTManager._exchanges.get(id(ccxt_o))
+        return entry["config"].get("hostname") if entry else None
+
+    @staticmethod
+    def _share_markets(ccxt_o, markets, currencies, source=None):
+        """Set the markets table on the metadata instance and every loop's clone of it."""
+        entry = CCXTManager._exchanges.get(id(ccxt_o))
+        with CCXTManager._exchanges_lock:
+            targets = [ccxt_o] + (list(entry["clones"].values()) if entry else [])
+        for target in targets:
+            if target is not source:
+                target.set_markets(markets, currencies)
+
+    @classmethod
+    def release_ccxt_instance(cls, ccxt_o):
+        """
+        Drop one reference to an instance returned by init_ccxt_instance. The last release
+        unregisters it, so the next init_ccxt_instance builds a new one; clones still open
+        on a loop are dropped by that loop's close_loop_exchanges().
+        """
+        with cls._exchanges_lock:
+            entry = cls._exchanges.get(id(ccxt_o))
+            if entry is None or entry["instance"] is not ccxt_o:
+                return
+            entry["refs"] -= 1
+            if entry["refs"] > 0:
+                return
+            if cls._exchange_keys.get(entry["key"]) == id(ccxt_o):
+                del cls._exchange_keys[entry["key"]]
+            if not len(entry["clones"]):
+                del cls._exchanges[id(ccxt_o)]
+
+    async def close_loop_exchanges(self):
+        """Close the running loop's exchange clones. Call before the loop stops."""
+        loop = asyncio.get_running_loop()
+        with CCXTManager._exchanges_lock:
+            clones = [entry["clones"].pop(loop, None) for entry in CCXTManager._exchanges.values()]
+            for key, entry in list(CCXTManager._exchanges.items()):
+                if entry["refs"] <= 0 and not len(entry["clones"]):
+                    del CCXTManager._exchanges[key]
+        for clone in clones:
+            if clone is not None:
+                await clone.close()
+
+    async def _ccxt_call_with_retry(self, ccxt_o, method, context, *args):
+        """Helper method to await an async CCXT method with retry and error handling.
 
         Args:
-            func: The blocking function to call in a thread pool.
+            ccxt_o: Exchange instance; the call goes to its clone for the running loop.
+            method: Name of the exchange method to call.
             context: The context for the error handler (dict). Will be updated with err_count.
-            *args: Arguments to pass to the function.
+            *args: Arguments to pass to the method.
 
         Returns:
             The result of the function, or None on unrecoverable failure.
@@ -173,11 +346,9 @@ class CCXTManager:
         the error handler returns False.
         """
         err_count = 0
-        loop = asyncio.get_running_loop()
         while True:
             try:
-                # Run the blocking function in a thread pool and return the result
-                return await loop.run_in_executor(None, func, *args)
+                return await getattr(self.exchange_for_loop(ccxt_o), method)(*args)
             except Exception as error:
                 err_count += 1
                 context_with_err_count = {**context, "err_count": err_count}
@@ -201,8 +372,9 @@ class CCXTManager:
             "symbol": symbol,
             "limit": limit
         }
-        result = await self._ccxt_blocking_call_with_retry(
-            ccxt_o.fetch_order_book,
+        result = await self._ccxt_call_with_retry(
+            ccxt_o,
+            "fetch_order_book",
             context,
             symbol, limit
         )
@@ -214,8 +386,9 @@ class CCXTManager:
         context = {
             "method": "ccxt_call_fetch_free_balance"
         }
-        result = await self._ccxt_blocking_call_with_retry(
-            ccxt_o.fetch_free_balance,
+        result = await self._ccxt_call_with_retry(
+            ccxt_o,
+            "fetch_free_balance",
             context
         )
         if result is not None:
@@ -225,23 +398,29 @@ class CCXTManager:
     async def ccxt_call_fetch_tickers(self, ccxt_o, symbols_list, proxy=True):
         start = time.time()
         err_count = 0
+        health = CCXTManager._proxy_health
 
-        # Start proxy if needed before first attempt
-        if proxy and not is_port_open("127.0.0.1", 2233):
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, self._start_proxy)
+        if proxy:
+            await self._ensure_proxy(health)
 
         while True:
             try:
                 used_proxy = False
-                if is_port_open("127.0.0.1", 2233) and proxy:  # CCXT PROXY
-                    result = await rpc_call("ccxt_call_fetch_tickers", tuple(symbols_list), rpc_port=2233,
-                                            debug=self.config_manager.config_ccxt.debug_level,
-                                            logger=self.config_manager.general_log, timeout=60)
+                if proxy and health.is_up():  # CCXT PROXY
+                    try:
+                        result = await rpc_call("ccxt_call_fetch_tickers",
+                                                {"symbols": list(symbols_list), "client": CCXTManager.PROXY_CLIENT_ID},
+                                                rpc_port=CCXTManager._proxy_port,
+                                                debug=self.config_manager.config_ccxt.debug_level,
+                                                logger=self.config_manager.general_log, timeout=60)
+                    except Exception:
+                        health.record_failure()
+                        raise
+                    if result is not None:
+                        health.record_success()
                     used_proxy = True
                 else:
-                    loop = asyncio.get_running_loop()
-                    result = await loop.run_in_executor(None, ccxt_o.fetchTickers, symbols_list)
+                    result = await self.exchange_for_loop(ccxt_o).fetch_tickers(symbols_list)
 
                 if result is not None:
                     stop = time.time()
@@ -263,13 +442,32 @@ class CCXTManager:
                 ):
                     return None
 
+    async def _ensure_proxy(self, health):
+        """Make sure the proxy state is known, starting the proxy when it is down.
+
+        Only the first call awaits a (bounded, async) probe; afterwards the cached
+        state is used and refreshed in the background when stale. Restarts are
+        attempted at most once per ProxyHealth.restart_interval.
+        """
+        if health.state is None:
+            await health.probe()
+        if health.is_up():
+            health.refresh_in_background()
+            return
+        if health.should_restart():
+            await self._start_proxy()
+            await health.probe()
+        else:
+            health.refresh_in_background()
+
     async def ccxt_call_fetch_ticker(self, ccxt_o, symbol):
         context = {
             "method": "ccxt_call_fetch_ticker",
             "symbol": symbol
         }
-        result = await self._ccxt_blocking_call_with_retry(
-            ccxt_o.fetch_ticker,
+        result = await self._ccxt_call_with_retry(
+            ccxt_o,
+            "fetch_ticker",
             context,
             symbol
         )
@@ -277,19 +475,29 @@ class CCXTManager:
             self._debug_display('ccxt_call_fetch_ticker', [symbol], result)
         return result
 
-    def _start_proxy(self):
-        """Start shared CCXT proxy service in a thread. This is a blocking call."""
+    async def _start_proxy(self):
+        """Start the shared CCXT proxy service in its own thread and wait for its port to open.
+
+        The port is checked with async connects and polled with asyncio.sleep, so the
+        calling event loop keeps running while the proxy starts.
+        """
+        health = CCXTManager._proxy_health
+        if self._proxy_thread_alive():
+            CCXTManager._proxy_logger.info("[PROXY.STARTUP] Proxy service thread is already running.")
+            return
+
+        if await health.probe():
+            CCXTManager._proxy_logger.warning(
+                f"[PROXY.STARTUP] Proxy port {CCXTManager._proxy_port} already in use. Aborting start."
+            )
+            return
+
         with CCXTManager._proxy_lock:
-            if CCXTManager._proxy_service_thread and CCXTManager._proxy_service_thread.is_alive():
+            # Another bot may have started it while we probed
+            if self._proxy_thread_alive():
                 CCXTManager._proxy_logger.info("[PROXY.STARTUP] Proxy service thread is already running.")
                 return
 
-            if is_port_open("127.0.0.1", CCXTManager._proxy_port):
-                CCXTManager._proxy_logger.warning(
-                    f"[PROXY.STARTUP] Proxy port {CCXTManager._proxy_port} already in use. Aborting start."
-                )
-                return
-
             CCXTManager._proxy_logger.info(
                 f"[PROXY.STARTUP] Initializing proxy service on port {CCXTManager._proxy_port}")
 
@@ -309,26 +517,6 @@ class CCXTManager:
                 CCXTManager._proxy_service_thread = threading.Thread(target=service_runner, name="CCXTProxyService")
                 CCXTManager._proxy_service_thread.daemon = True
                 CCXTManager._proxy_service_thread.start()
-
-                CCXTManager._proxy_logger.info("[PROXY.STARTUP] Proxy service thread started.")
-
-                # Verify proxy started properly
-                proxy_started = False
-                for attempt in range(10):  # Wait up to 10 seconds
-                    time.sleep(1)
-                    if is_port_open("127.0.0.1", CCXTManager._proxy_port):
-                        ready_msg = f"Proxy operational (Thread: {CCXTManager._proxy_service_thread.name})"
-                        CCXTManager._proxy_logger.info(ready_msg)
-                        proxy_started = True
-                        break
-
-                if not proxy_started:
-                    failure_msg = "Proxy failed to start and open port after 10 seconds."
-                    CCXTManager._proxy_logger.error(failure_msg)
-                    if CCXTManager._proxy_service_instance:
-                        CCXTManager._proxy_service_instance.stop()
-                    CCXTManager._proxy_service_instance = None
-                    CCXTManager._proxy_service_thread = None
             except Exception as e:
                 error_detail = f"Startup error: {str(e)}"
                 CCXTManager._proxy_logger.error(error_detail, exc_info=True)
@@ -338,6 +526,30 @@ class CCXTManager:
                     e,
                     context={"stage": "proxy_startup"}
                 )
+                return
+
+        CCXTManager._proxy_logger.info("[PROXY.STARTUP] Proxy service thread started.")
+
+        # Verify proxy started properly
+        for attempt in range(10):  # Wait up to 10 seconds
+            await asyncio.sleep(1)
+            if await health.probe():
+                ready_msg = f"Proxy operational (Thread: {CCXTManager._proxy_service_thread.name})"
+                CCXTManager._proxy_logger.info(ready_msg)
+                return
+
+        failure_msg = "Proxy failed to start and open port after 10 seconds."
+        CCXTManager._proxy_logger.error(failure_msg)
+        with CCXTManager._proxy_lock:
+            if CCXTManager._proxy_service_instance:
+                CCXTManager._proxy_service_instance.stop()
+            CCXTManager._proxy_service_instance = None
+            CCXTManager._proxy_service_thread = None
+
+    @staticmethod
+    def _proxy_thread_alive() -> bool:
+        thread = CCXTManager._proxy_service_thread
+        return thread is not None and thread.is_alive()
 
     def _debug_display(self, func, params, result, timer=None):
         debug_level = self.config_manager.config_ccxt.debug_level
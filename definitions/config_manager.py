@@ -10,6 +10,8 @@ from definitions.ccxt_manager import CCXTManager
 from definitions.error_handler import ErrorHandler
 from definitions.errors import ConfigurationError
 from definitions.logger import setup_logger, setup_logging
+from definitions.price_resolver import PriceResolver
+from definitions.state_store import open_state_store
 from definitions.xbridge_manager import XBridgeManager
 from definitions.yaml_mix import YamlToObject
 from strategies.arbitrage_strategy import ArbitrageStrategy
@@ -29,6 +31,8 @@ class ConfigManager:
                                     level=logging.DEBUG, console=True)
         self.error_handler = ErrorHandler(self)
         self.current_module = None
+        # Order history and trade states of every strategy in the process
+        self.state_store = open_state_store(self.ROOT_DIR)
 
         if master_manager:
             # In GUI slave mode, get references to strategy-specific loggers
@@ -85,10 +89,11 @@ class ConfigManager:
             self.xbridge_manager = XBridgeManager(self)
 
             self.ccxt_manager = CCXTManager(self)
-            # Share the underlying CCXT connection object from the master to avoid
-            # re-initializing it (e.g., re-loading markets).
-            if master_manager.ccxt_manager:
-                self.ccxt_manager.my_ccxt = getattr(master_manager.ccxt_manager, 'my_ccxt', None)
+            self.price_resolver = PriceResolver(self)
+            # Take a reference on the master's exchange instance from the process-wide
+            # registry rather than building another one (e.g., re-loading markets).
+            if getattr(master_manager, 'my_ccxt', None) is not None:
+                self._init_ccxt()
         else:
             # Standalone or Master GUI Mode: Create all resources from scratch
             try:
@@ -101,6 +106,7 @@ class ConfigManager:
                 raise
             self.xbridge_manager = XBridgeManager(self)
             self.ccxt_manager = CCXTManager(self)
+            self.price_resolver = PriceResolver(self)
             # If this is the master GUI manager, initialize shared components now.
             if self.strategy == "gui":
                 self._init_ccxt()
@@ -264,6 +270,13 @@ class ConfigManager:
             )
             raise
 
+    def release_ccxt(self):
+        """Release this manager's reference on the shared exchange instance."""
+        my_ccxt = self.my_ccxt
+        if my_ccxt is not None:
+            CCXTManager.release_ccxt_instance(my_ccxt)
+            self.ccxt_manager.my_ccxt = None
+
     def _init_xbridge(self):
         """Initialize XBridge configuration"""
         self.xbridge_manager.dxloadxbridgeconf()
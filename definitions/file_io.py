@@ -0,0 +1,137 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import yaml
+
+# One thread: file operations of the bots run in submission order (appends, write-then-remove)
+_file_io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="file-io")
+
+
+async def run_file_io(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking file operation on the shared file I/O thread and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_file_io_executor, functools.partial(func, *args, **kwargs))
+
+
+def submit_file_io(func: Callable, *args, **kwargs) -> Future:
+    """Queue a blocking file operation without waiting for it (e.g. log appends)."""
+    return _file_io_executor.submit(func, *args, **kwargs)
+
+
+class ControlFile:
+    """In-memory view of a small YAML/JSON control file, such as the trading pause file.
+
+    Watched files are polled (``stat`` every ``POLL_INTERVAL`` seconds) by one daemon
+    thread for the whole process and only re-read when their inode, mtime or size changed,
+    so ``exists``/``data`` are plain attribute reads: checking a pause flag on every
+    pair costs no syscall. Writes through ``write``/``remove`` publish immediately.
+    """
+
+    POLL_INTERVAL = 1.0
+
+    _instances: Dict[str, 'ControlFile'] = {}
+    _instances_lock = threading.Lock()
+    _poller: Optional[threading.Thread] = None
+
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int, int]] = None
+        # (exists, data, error) replaced as a whole so readers never see a mix of two versions
+        self._state: Tuple[bool, Optional[Dict], Optional[str]] = (False, None, None)
+        self.refresh()
+
+    @classmethod
+    def watch(cls, path: str) -> 'ControlFile':
+        """The shared view of ``path``; the first call reads it and starts the poller."""
+        control = cls._instances.get(path)
+        if control is not None:
+            return control
+        with cls._instances_lock:
+            control = cls._instances.get(path)
+            if control is None:
+                control = cls._instances[path] = cls(path)
+            if cls._poller is None or not cls._poller.is_alive():
+                cls._poller = threading.Thread(target=cls._poll_forever, daemon=True, name="ControlFilePoller")
+                cls._poller.start()
+        return control
+
+    @property
+    def exists(self) -> bool:
+        return self._state[0]
+
+    @property
+    def data(self) -> Optional[Dict]:
+        """Parsed content, or None if the file is missing or unreadable (see ``error``)."""
+        return self._state[1]
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._state[2]
+
+    def refresh(self) -> bool:
+        """Re-read the file if it changed since the last look. Returns True if it did."""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                changed = self._signature is not None
+                self._signature = None
+                self._state = (False, None, None)
+                return changed
+            except OSError as e:
+                self._state = (True, None, str(e))
+                return True
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return False
+            try:
+                with open(self.path, 'r') as fp:
+                    data = yaml.safe_load(fp)  # Also parses JSON
+                if data is not None and not isinstance(data, dict):
+                    raise ValueError(f"expected a mapping, got {type(data).__name__}")
+                self._state = (True, data or {}, None)
+            except FileNotFoundError:
+                signature = None
+                self._state = (False, None, None)
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                self._state = (True, None, str(e))
+            self._signature = signature
+            return True
+
+    def write(self, content: str) -> None:
+        """Replace the file atomically with ``content`` (blocking: run through ``run_file_io``)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as fp:
+            fp.write(content)
+        os.replace(tmp_path, self.path)
+        self.refresh()
+
+    def remove(self) -> bool:
+        """Delete the file if present (blocking: run through ``run_file_io``). Returns True if it existed."""
+        try:
+            os.remove(self.path)
+            existed = True
+        except FileNotFoundError:
+            existed = False
+        self.refresh()
+        return existed
+
+    @classmethod
+    def _poll_forever(cls) -> None:
+        event = threading.Event()
+        while not event.wait(cls.POLL_INTERVAL):
+            with cls._instances_lock:
+                controls = list(cls._instances.values())
+            for control in controls:
+                try:
+                    control.refresh()
+                except Exception as e:
+                    control.logger.warning(f"Could not check control file {control.path}: {e}")
@@ -0,0 +1,87 @@
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+CACHE_VERSION = 1
+
+
+class MarketsCache:
+    """On-disk cache of ccxt ``markets``/``currencies`` tables, one file per exchange and hostname.
+
+    Files are compact gzip-compressed JSON under ``data/markets_cache``. Startup
+    loads the table from disk instead of downloading it, and only refreshes it
+    from the exchange (in the background) once it is older than ``ttl``.
+    """
+
+    TTL = 6 * 3600.0
+
+    def __init__(self, cache_dir: str, ttl: float = TTL, logger: Optional[logging.Logger] = None):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.logger = logger or logging.getLogger(__name__)
+
+    @classmethod
+    def for_root(cls, root_dir: str, **kwargs) -> 'MarketsCache':
+        return cls(os.path.join(root_dir, "data", "markets_cache"), **kwargs)
+
+    def path(self, exchange_id: str, hostname: Optional[str] = None) -> str:
+        name = exchange_id if not hostname else f"{exchange_id}@{hostname}"
+        return os.path.join(self.cache_dir, re.sub(r"[^A-Za-z0-9_.@-]", "_", name) + ".json.gz")
+
+    def load(self, exchange_id: str, hostname: Optional[str] = None) -> Optional[Tuple[Dict, Dict, float]]:
+        """``(markets, currencies, age_seconds)``, or None if there is no usable cache file."""
+        path = self.path(exchange_id, hostname)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as fp:
+                data = json.load(fp)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable markets cache {path}: {e}")
+            return None
+        if (not isinstance(data, dict) or data.get("version") != CACHE_VERSION
+                or data.get("exchange") != exchange_id or not data.get("markets")):
+            return None
+        return data["markets"], data.get("currencies") or {}, max(0.0, time.time() - data.get("saved_at", 0))
+
+    def is_stale(self, age: float) -> bool:
+        return age > self.ttl
+
+    def save(self, exchange_id: str, hostname: Optional[str], markets: Dict, currencies: Optional[Dict]) -> bool:
+        """Write the tables atomically (temp file then rename). Returns False on failure."""
+        path = self.path(exchange_id, hostname)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = {
+            "version": CACHE_VERSION,
+            "exchange": exchange_id,
+            "hostname": hostname,
+            "saved_at": time.time(),
+            "markets": markets,
+            "currencies": currencies or {},
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as fp:
+                json.dump(data, fp, separators=(",", ":"), default=str)
+            os.replace(tmp_path, path)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning(f"Could not write markets cache {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+    def save_in_background(self, exchange_id: str, hostname: Optional[str], markets: Dict,
+                           currencies: Optional[Dict]) -> threading.Thread:
+        """Serialize and write from a daemon thread so the event loop is not blocked."""
+        thread = threading.Thread(target=self.save, args=(exchange_id, hostname, markets, currencies),
+                                  daemon=True, name=f"MarketsCache-{exchange_id}")
+        thread.start()
+        return thread
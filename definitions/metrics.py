@@ -0,0 +1,206 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in seconds.
+
+    Observations only increment a bucket counter, so it is cheap enough to
+    update on every pair step or RPC call. Percentiles are estimated as the
+    upper bound of the bucket holding the requested rank.
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Estimated q-th percentile (0-100); 0.0 when empty."""
+        with self._lock:
+            return self._percentile_locked(q)
+
+    def _percentile_locked(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": self.sum,
+                "avg": self.sum / self.count if self.count else 0.0,
+                "max": self.max,
+                "p50": self._percentile_locked(50),
+                "p90": self._percentile_locked(90),
+                "p99": self._percentile_locked(99),
+                "buckets": dict(zip(self.buckets + (float("inf"),), self.counts)),
+            }
+
+
+class MetricsRegistry:
+    """Process-wide set of latency histograms keyed by metric name and labels.
+
+    Shared by every bot running in the process (CLI or GUI) so one endpoint
+    reports all of them. Metric names follow Prometheus conventions.
+    """
+
+    def __init__(self, prefix: str = "xbridge_bot") -> None:
+        self.prefix = prefix
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        self.histogram(name, **labels).observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Context manager observing the elapsed wall time of its block."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def _items(self):
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def to_dict(self) -> Dict:
+        """``{metric: [{"labels": {...}, count, avg, p50, p99, ...}, ...]}``"""
+        result: Dict[str, list] = {}
+        for (name, labels), histogram in self._items():
+            entry = {"labels": dict(labels)}
+            entry.update(histogram.snapshot())
+            entry["buckets"] = {("+Inf" if bound == float("inf") else bound): count
+                                for bound, count in entry["buckets"].items()}
+            result.setdefault(f"{self.prefix}_{name}_seconds", []).append(entry)
+        return result
+
+    def render_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format."""
+        lines = []
+        declared = set()
+        for (name, labels), histogram in self._items():
+            metric = f"{self.prefix}_{name}_seconds"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            snapshot = histogram.snapshot()
+            label_text = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels)
+            cumulative = 0
+            for bound, count in snapshot["buckets"].items():
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                bucket_labels = f'{label_text},le="{le}"' if label_text else f'le="{le}"'
+                lines.append(f"{metric}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{metric}_sum{suffix} {snapshot['sum']}")
+            lines.append(f"{metric}_count{suffix} {snapshot['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """Serves the registry over HTTP from a daemon thread.
+
+    ``/metrics`` returns the Prometheus text format and ``/metrics.json`` the
+    same data as JSON. Started at most once per process, so GUI bots running in
+    separate event loops share it and stopping one bot does not take it down.
+    """
+
+    _server: Optional[ThreadingHTTPServer] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, port: int, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None,
+              logger=None) -> Optional[ThreadingHTTPServer]:
+        registry = registry or metrics
+        with cls._lock:
+            if cls._server is not None:
+                return cls._server
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    path = self.path.split("?", 1)[0]
+                    if path == "/metrics":
+                        body, content_type = registry.render_prometheus(), "text/plain; version=0.0.4"
+                    elif path == "/metrics.json":
+                        body, content_type = json.dumps(registry.to_dict()), "application/json"
+                    else:
+                        self.send_error(404)
+                        return
+                    data = body.encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", content_type)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+
+                def log_message(self, format, *args):
+                    pass
+
+            try:
+                server = ThreadingHTTPServer((host, port), Handler)
+            except OSError as e:
+                if logger:
+                    logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+                return None
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True, name="MetricsServer").start()
+            cls._server = server
+            if logger:
+                logger.info(f"Metrics available at http://{host}:{server.server_address[1]}/metrics")
+            return server
+
+    @classmethod
+    def stop(cls) -> None:
+        with cls._lock:
+            if cls._server is not None:
+                cls._server.shutdown()
+                cls._server.server_close()
+                cls._server = None
+
+
+# Process-wide registry used by the controller, the pair processor and XBridgeManager
+metrics = MetricsRegistry()
@@ -0,0 +1,239 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+JOURNAL_FILE = "order_journal.jsonl"
+
+
+class OrderJournal:
+    """Append-only journal of bot state records, shared by every pair and strategy of a process.
+
+    Records are JSON lines (``put``, ``del`` or ``clear`` of a ``namespace``/``key``). The file
+    is replayed in one sequential read on first use to build the in-memory index serving all
+    reads; writes only append one line. Each append is flushed to the OS, and fsync is batched
+    (every ``sync_every`` records or ``sync_interval`` seconds, and on ``sync()``/``close()``).
+    A torn last line left by a crash is dropped on load, and the file is rewritten with only
+    its live records once it holds ``compact_ratio`` times more records than that.
+    """
+
+    SYNC_EVERY = 32
+    SYNC_INTERVAL = 1.0
+    COMPACT_MIN_RECORDS = 1000
+    COMPACT_RATIO = 4.0
+
+    # Shared instances by path: one writer per journal file in the process
+    _instances: Dict[str, 'OrderJournal'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str, sync_every: int = SYNC_EVERY, sync_interval: float = SYNC_INTERVAL,
+                 compact_min_records: int = COMPACT_MIN_RECORDS, compact_ratio: float = COMPACT_RATIO,
+                 logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_min_records = compact_min_records
+        self.compact_ratio = compact_ratio
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None  # namespace -> key -> value
+        self._fp = None
+        self._records = 0
+        self._unsynced = 0
+        self._synced_at = 0.0
+
+    @classmethod
+    def for_root(cls, root_dir: str, **kwargs) -> 'OrderJournal':
+        """The process-wide journal under ``<root_dir>/data``. Opened lazily on first use."""
+        path = os.path.join(root_dir, "data", JOURNAL_FILE)
+        with cls._instances_lock:
+            journal = cls._instances.get(path)
+            if journal is None:
+                journal = cls._instances[path] = cls(path, **kwargs)
+        return journal
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._instances_lock:
+            journals = list(cls._instances.values())
+        for journal in journals:
+            journal.close()
+
+    # --- Reads ---
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            value = self._open().get(namespace, {}).get(key, default)
+            return copy.deepcopy(value)
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        with self._lock:
+            return copy.deepcopy(self._open().get(namespace, {}))
+
+    def find(self, namespace: str, status: Optional[str] = None, since: Optional[float] = None,
+             until: Optional[float] = None) -> Dict[str, Any]:
+        """Records of ``namespace`` with this ``status`` and/or ``timestamp`` range (scan of the index)."""
+        found = {}
+        for key, value in self.items(namespace).items():
+            fields = value if isinstance(value, dict) else {}
+            timestamp = fields.get('timestamp')
+            if status is not None and fields.get('status') != status:
+                continue
+            if since is not None and not (isinstance(timestamp, (int, float)) and timestamp >= since):
+                continue
+            if until is not None and not (isinstance(timestamp, (int, float)) and timestamp < until):
+                continue
+            found[key] = value
+        return found
+
+    def namespaces(self) -> List[str]:
+        with self._lock:
+            return [namespace for namespace, records in self._open().items() if records]
+
+    # --- Writes ---
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        encoded = json.dumps(value, separators=(",", ":"), default=str)
+        with self._lock:
+            index = self._open()
+            self._append({"op": "put", "ns": namespace, "key": key, "ts": time.time()}, encoded)
+            # Index what a replay would see, detached from the caller's object
+            index.setdefault(namespace, {})[key] = json.loads(encoded)
+            self._maybe_compact()
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            records = self._open().get(namespace)
+            if not records or key not in records:
+                return
+            self._append({"op": "del", "ns": namespace, "key": key, "ts": time.time()})
+            del records[key]
+            self._maybe_compact()
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            if not self._open().get(namespace):
+                return
+            self._append({"op": "clear", "ns": namespace, "ts": time.time()})
+            del self._index[namespace]
+            self._maybe_compact()
+
+    def sync(self) -> None:
+        """Flush and fsync everything appended so far."""
+        with self._lock:
+            if self._fp is not None:
+                self._sync()
+
+    def compact(self) -> None:
+        """Rewrite the file with one ``put`` per live record (atomic rename)."""
+        with self._lock:
+            index = self._open()
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            count = 0
+            with open(tmp_path, "w", encoding="utf-8") as fp:
+                for namespace, records in index.items():
+                    for key, value in records.items():
+                        fp.write(self._line({"op": "put", "ns": namespace, "key": key, "ts": time.time()},
+                                            json.dumps(value, separators=(",", ":"))))
+                        count += 1
+                fp.flush()
+                os.fsync(fp.fileno())
+            self._fp.close()
+            os.replace(tmp_path, self.path)
+            self._fp = open(self.path, "a", encoding="utf-8")
+            self._records = count
+            self._unsynced = 0
+            self.logger.debug(f"Compacted {self.path} to {count} records")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fp is None:
+                return
+            try:
+                self._sync()
+            finally:
+                self._fp.close()
+                self._fp = None
+                self._index = None
+
+    # --- Internals ---
+
+    def _open(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is not None:
+            return self._index
+        index: Dict[str, Dict[str, Any]] = {}
+        records = 0
+        valid_size = 0
+        try:
+            with open(self.path, "rb") as fp:
+                for line in fp:
+                    if not line.endswith(b"\n"):
+                        break  # Torn write: dropped below
+                    valid_size += len(line)
+                    try:
+                        self._apply(index, json.loads(line))
+                        records += 1
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        self.logger.warning(f"Skipping corrupt record in {self.path} before offset {valid_size}")
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fp = open(self.path, "a", encoding="utf-8")
+        if fp.tell() > valid_size:
+            self.logger.warning(f"Dropping incomplete last record of {self.path}")
+            fp.truncate(valid_size)
+        self._fp = fp
+        self._records = records
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self._index = index
+        return index
+
+    @staticmethod
+    def _apply(index: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+        op = record["op"]
+        namespace = record["ns"]
+        if op == "put":
+            index.setdefault(namespace, {})[record["key"]] = record["value"]
+        elif op == "del":
+            index.get(namespace, {}).pop(record["key"], None)
+        elif op == "clear":
+            index.pop(namespace, None)
+        else:
+            raise ValueError(f"Unknown journal op {op!r}")
+
+    @staticmethod
+    def _line(record: Dict[str, Any], encoded_value: Optional[str] = None) -> str:
+        line = json.dumps(record, separators=(",", ":"))
+        if encoded_value is not None:
+            line = f'{line[:-1]},"value":{encoded_value}}}'
+        return line + "\n"
+
+    def _append(self, record: Dict[str, Any], encoded_value: Optional[str] = None) -> None:
+        self._fp.write(self._line(record, encoded_value))
+        self._fp.flush()
+        self._records += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or time.monotonic() - self._synced_at >= self.sync_interval:
+            self._sync()
+
+    def _sync(self) -> None:
+        self._fp.flush()
+        if self._unsynced:
+            os.fsync(self._fp.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def _maybe_compact(self) -> None:
+        if self._records < self.compact_min_records:
+            return
+        live = sum(len(records) for records in self._index.values())
+        if self._records > self.compact_ratio * max(live, 1):
+            self.compact()
+
+
+atexit.register(OrderJournal.close_all)
@@ -0,0 +1,102 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+
+def _as_float(value: Any) -> Any:
+    # Typed sizes and prices; non-numbers (None, placeholders) are kept as is
+    if value is None or value.__class__ is float:
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)  # Also unboxes numpy scalars
+    return value
+
+
+class _OrderRecord:
+    """Dict conversion shared by the slotted order types, for the RPC and persistence boundaries."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> '_OrderRecord':
+        """Build from a dict; keys that are not fields are ignored."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{name: value for name, value in data.items() if name in names})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields that are set (not None)."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name) is not None}
+
+
+@dataclass(slots=True)
+class VirtualOrder(_OrderRecord):
+    """Virtual order of a DexPair: what the bot will place on XBridge next.
+
+    Sizes and prices are converted to float once, on construction.
+    """
+
+    symbol: Optional[str] = None
+    side: Optional[str] = None
+    maker: Optional[str] = None
+    maker_address: Optional[str] = None
+    taker: Optional[str] = None
+    taker_address: Optional[str] = None
+    type: Optional[str] = None
+    maker_size: Optional[float] = None
+    taker_size: Optional[float] = None
+    dex_price: Optional[float] = None
+    org_pprice: Optional[float] = None
+    org_t1price: Optional[float] = None
+    org_t2price: Optional[float] = None
+    minimum_size: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        self.maker_size = _as_float(self.maker_size)
+        self.taker_size = _as_float(self.taker_size)
+        self.dex_price = _as_float(self.dex_price)
+        self.org_pprice = _as_float(self.org_pprice)
+        self.org_t1price = _as_float(self.org_t1price)
+        self.org_t2price = _as_float(self.org_t2price)
+        self.minimum_size = _as_float(self.minimum_size)
+
+
+@dataclass(slots=True)
+class GridOrder(_OrderRecord):
+    """One order of a range maker grid (``type`` is 'buy' or 'sell')."""
+
+    maker: Optional[str] = None
+    maker_size: Optional[float] = None
+    taker: Optional[str] = None
+    taker_size: Optional[float] = None
+    price: Optional[float] = None
+    type: Optional[str] = None
+    original_price: Optional[float] = None
+    status: Optional[str] = None
+    id: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        self.maker_size = _as_float(self.maker_size)
+        self.taker_size = _as_float(self.taker_size)
+        self.price = _as_float(self.price)
+        self.original_price = _as_float(self.original_price)
+
+
+@dataclass(slots=True)
+class OrderRow:
+    """One row of the GUI orders table (display values, 'None' when there is nothing to show)."""
+
+    name: str
+    symbol: str
+    status: Any = 'None'
+    side: Any = 'None'
+    flag: str = 'X'
+    variation: str = 'None'
+    maker_size: Any = 'None'
+    maker: Any = 'None'
+    taker_size: Any = 'None'
+    taker: Any = 'None'
+    dex_price: Any = 'None'
+    order_id: Any = 'None'
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Column lookup for the TreeManager, which sorts order rows and balance dicts alike."""
+        return getattr(self, key, default)
@@ -1,9 +1,11 @@
 import math
+import os
 import time
 
 import yaml
 
 from definitions.errors import OperationalError
+from definitions.orders import VirtualOrder
 from definitions.token import Token
 
 
@@ -89,6 +91,7 @@ class DexPair:
     STATUS_CANCELLED_WITHOUT_CALL = -2
 
     PRICE_VARIATION_TOLERANCE_DEFAULT = 0.01
+    HISTORY_NAMESPACE = "dex_history"
 
     def __init__(self, pair: Pair, partial_percent: float):
         self.pair = pair
@@ -106,9 +109,10 @@ class DexPair:
         self.read_last_order_history()
 
     async def update_dex_orderbook(self):
-        self.orderbook = await self.pair.config_manager.xbridge_manager.dxgetorderbook(detail=3, maker=self.t1.symbol,
-                                                                                       taker=self.t2.symbol)
-        self.orderbook.pop('detail', None)
+        orderbook = await self.pair.config_manager.xbridge_manager.dxgetorderbook(detail=3, maker=self.t1.symbol,
+                                                                                  taker=self.t2.symbol)
+        # Orderbook results may be shared through the XBridge read cache, so copy rather than mutate.
+        self.orderbook = {key: value for key, value in orderbook.items() if key != 'detail'}
 
     def _get_history_file_path(self):
         return self.pair.config_manager.strategy_instance.get_dex_history_file_path(self.pair.name)
@@ -120,6 +124,19 @@ class DexPair:
         if not self.pair.config_manager.strategy_instance:
             return
         file_path = self._get_history_file_path()
+        key = os.path.basename(file_path)
+        try:
+            history = self.pair.config_manager.state_store.get(self.HISTORY_NAMESPACE, key)
+        except Exception as e:
+            self.pair.config_manager.error_handler.handle(
+                e,
+                context={"pair": self.pair.name, "stage": "read_last_order_history", "record": key}
+            )
+            history = None
+        if history is not None:
+            self.order_history = history
+            return
+        # Not journaled yet: fall back to the history file written by earlier versions
         try:
             with open(file_path, 'r') as fp:
                 self.order_history = yaml.safe_load(fp)
@@ -133,16 +150,13 @@ class DexPair:
             self.order_history = None
 
     def write_last_order_history(self):
-        # Get exact USD amount from our specific config entry # TODO: This comment seems misplaced.
-
-        file_path = self._get_history_file_path()
+        key = os.path.basename(self._get_history_file_path())
         try:
-            with open(file_path, 'w') as fp:
-                yaml.safe_dump(self.order_history, fp)
+            self.pair.config_manager.state_store.put(self.HISTORY_NAMESPACE, key, self.order_history)
         except Exception as e:
             self.pair.config_manager.error_handler.handle(
                 e,
-                context={"pair": self.pair.name, "stage": "write_last_order_history", "file_path": file_path}
+                context={"pair": self.pair.name, "stage": "write_last_order_history", "record": key}
             )
 
     def _log_virtual_order(self, side: str, maker_symbol: str, taker_symbol: str):
@@ -151,9 +165,9 @@ class DexPair:
             f"Symbol: {self.symbol} | "
             f"Maker: {maker_symbol} | "
             f"Taker: {taker_symbol} | "
-            f"Maker size: {self.current_order['maker_size']:.6f} | "
-            f"Taker size: {self.current_order['taker_size']:.6f} | "
-            f"Price: {self.current_order['dex_price']:.8f}"
+            f"Maker size: {self.current_order.maker_size:.6f} | "
+            f"Taker size: {self.current_order.taker_size:.6f} | "
+            f"Price: {self.current_order.dex_price:.8f}"
         )
 
     def create_virtual_sell_order(self):
@@ -180,32 +194,32 @@ class DexPair:
         stepper = 10.0 ** digits
         return math.trunc(stepper * value) / stepper
 
-    def _construct_order_dict(self, side, maker_token, taker_token, maker_size, taker_size, original_price,
-                              final_price):
-        """A helper to construct the common order dictionary structure."""
+    def _construct_order(self, side, maker_token, taker_token, maker_size, taker_size, original_price,
+                         final_price) -> VirtualOrder:
+        """A helper to construct the common virtual order structure."""
         # Determine order type
         order_type = 'exact'
         if side == 'SELL' and self.partial_percent is not None:
             if isinstance(self.partial_percent, (int, float)):
                 if 0 < self.partial_percent < 1:
                     order_type = 'partial'
-        order = {
-            'symbol': self.symbol,
-            'side': side,
-            'maker': maker_token.symbol,
-            'maker_address': maker_token.dex.address,
-            'taker': taker_token.symbol,
-            'taker_address': taker_token.dex.address,
-            'type': order_type,
-            'maker_size': DexPair.truncate(maker_size),
-            'taker_size': DexPair.truncate(taker_size),
-            'dex_price': DexPair.truncate(final_price),  # The effective price of the order
-            'org_pprice': DexPair.truncate(original_price),
-            'org_t1price': DexPair.truncate(self.t1.cex.cex_price),
-            'org_t2price': DexPair.truncate(self.t2.cex.cex_price),
-        }
+        order = VirtualOrder(
+            symbol=self.symbol,
+            side=side,
+            maker=maker_token.symbol,
+            maker_address=maker_token.dex.address,
+            taker=taker_token.symbol,
+            taker_address=taker_token.dex.address,
+            type=order_type,
+            maker_size=DexPair.truncate(maker_size),
+            taker_size=DexPair.truncate(taker_size),
+            dex_price=DexPair.truncate(final_price),  # The effective price of the order
+            org_pprice=DexPair.truncate(original_price),
+            org_t1price=DexPair.truncate(self.t1.cex.cex_price),
+            org_t2price=DexPair.truncate(self.t2.cex.cex_price),
+        )
         if self.partial_percent and side == 'SELL':
-            order['minimum_size'] = maker_size * self.partial_percent
+            order.minimum_size = float(maker_size * self.partial_percent)
         return order
 
     def _build_sell_order(self):
@@ -215,7 +229,7 @@ class DexPair:
         final_price = original_price * (1 + offset)
         taker_size = maker_size * final_price
 
-        return self._construct_order_dict(
+        return self._construct_order(
             side='SELL', maker_token=self.t1, taker_token=self.t2,
             maker_size=maker_size, taker_size=taker_size,
             original_price=original_price, final_price=final_price
@@ -228,7 +242,7 @@ class DexPair:
         final_price = original_price * (1 - spread)
         maker_size = taker_size * final_price
 
-        return self._construct_order_dict(
+        return self._construct_order(
             side='BUY', maker_token=self.t2, taker_token=self.t1,
             maker_size=maker_size, taker_size=taker_size,
             original_price=original_price, final_price=final_price
@@ -240,9 +254,9 @@ class DexPair:
         # The strategy now returns a tuple: (variation, is_locked)
         var_result = self.pair.config_manager.strategy_instance.calculate_variation_based_on_side(
             self,
-            self.current_order.get('side'),
+            self.current_order.side,
             self.pair.cex.price,
-            self.current_order['org_pprice']
+            self.current_order.org_pprice
         )
 
         # Handle different return types for backward compatibility and new explicit style
@@ -271,8 +285,8 @@ class DexPair:
         self.pair.config_manager.general_log.info(
             f"Price variation check for {self.symbol}: "
             f"Variation: {var:.4f}, Stored variation: {self.variation:.4f}, "
-            f"Live price: {self.pair.cex.price:.8f}, Original price: {self.current_order['org_pprice']:.8f}, "
-            f"Price ratio: {self.pair.cex.price / self.current_order['org_pprice']:.4f}"
+            f"Live price: {self.pair.cex.price:.8f}, Original price: {self.current_order.org_pprice:.8f}, "
+            f"Price ratio: {self.pair.cex.price / self.current_order.org_pprice:.4f}"
         )
 
     def _is_price_in_range(self, var, price_variation_tolerance):
@@ -298,7 +312,9 @@ class DexPair:
             f"{self.t1.symbol}/USD: {DexPair.truncate(self.t1.cex.usd_price, 3)} | "
             f"{self.t2.symbol}/USD: {DexPair.truncate(self.t2.cex.usd_price, 3)}"
         )
-        self.pair.config_manager.general_log.info(f"Current virtual order details: {self.current_order}")
+        # Logged as a dict, the form the log parsers read
+        details = self.current_order.to_dict() if self.current_order else None
+        self.pair.config_manager.general_log.info(f"Current virtual order details: {details}")
 
     async def cancel_myorder_async(self):
         if self.order and 'id' in self.order and self.order['id'] is not None:
@@ -319,17 +335,17 @@ class DexPair:
 
         self.order = None
 
-        maker_size = f"{self.current_order['maker_size']:.6f}"
+        maker_size = f"{self.current_order.maker_size:.6f}"
         bal = self._get_balance()
 
         if self._is_balance_valid(bal, maker_size) and float(bal) >= float(maker_size):
             await self._create_order(dry_mode, maker_size)
         else:
             self.pair.config_manager.general_log.error(
-                f"dex_create_order, balance too low: {bal}, need: {maker_size} {self.current_order['maker']}")
+                f"dex_create_order, balance too low: {bal}, need: {maker_size} {self.current_order.maker}")
 
     def _get_balance(self):
-        return self.t2.dex.free_balance if self.current_order['side'] == "BUY" else self.t1.dex.free_balance
+        return self.t2.dex.free_balance if self.current_order.side == "BUY" else self.t1.dex.free_balance
 
     def _is_balance_valid(self, bal, maker_size):
         return bal is not None and maker_size.replace('.', '').isdigit()
@@ -361,15 +377,15 @@ class DexPair:
 
     async def _generate_order(self, dry_mode):
         try:
-            maker = self.current_order['maker']
-            maker_size = f"{self.current_order['maker_size']:.6f}"
-            maker_address = self.current_order['maker_address']
-            taker = self.current_order['taker']
-            taker_size = f"{self.current_order['taker_size']:.6f}"
-            taker_address = self.current_order['taker_address']
+            maker = self.current_order.maker
+            maker_size = f"{self.current_order.maker_size:.6f}"
+            maker_address = self.current_order.maker_address
+            taker = self.current_order.taker
+            taker_size = f"{self.current_order.taker_size:.6f}"
+            taker_address = self.current_order.taker_address
 
             if self.partial_percent:
-                minimum_size = f"{self.current_order['minimum_size']:.6f}"
+                minimum_size = f"{self.current_order.minimum_size:.6f}"
                 return await self.pair.config_manager.xbridge_manager.makepartialorder(
                     maker, maker_size, maker_address, taker, taker_size, taker_address, minimum_size
                 )
@@ -409,14 +425,25 @@ class DexPair:
             f"Details: {original_order_error}")
 
     def _log_dry_mode_order(self, order):
-        msg = (f"xb.makeorder({self.current_order['maker']}, {self.current_order['maker_size']:.6f}, "
-               f"{self.current_order['maker_address']}, {self.current_order['taker']}, "
-               f"{self.current_order['taker_size']:.6f}, {self.current_order['taker_address']})")
+        msg = (f"xb.makeorder({self.current_order.maker}, {self.current_order.maker_size:.6f}, "
+               f"{self.current_order.maker_address}, {self.current_order.taker}, "
+               f"{self.current_order.taker_size:.6f}, {self.current_order.taker_address})")
         self.pair.config_manager.general_log.info(f"dex_create_order, Dry mode enabled. {msg}")
 
+    def _pop_snapshot_order(self, order_id):
+        """Take this order from the controller's per-cycle dxGetMyOrders snapshot, if present."""
+        controller = getattr(self.pair.config_manager, 'controller', None)
+        snapshot = getattr(controller, 'order_snapshot', None)
+        if not isinstance(snapshot, dict):
+            return None
+        # Popped so a second check in the same cycle (after a cancel or new order) queries the daemon.
+        return snapshot.pop(order_id, None)
+
     async def check_order_status(self) -> int:
         try:
-            local_dex_order = await self.pair.config_manager.xbridge_manager.getorderstatus(self.order['id'])
+            local_dex_order = self._pop_snapshot_order(self.order['id'])
+            if not local_dex_order:
+                local_dex_order = await self.pair.config_manager.xbridge_manager.getorderstatus(self.order['id'])
             # The rpc_wrapper will return None if it fails after all retries
             if local_dex_order and 'status' in local_dex_order:
                 self.order = local_dex_order
@@ -463,7 +490,7 @@ class DexPair:
             self.order = None
 
     async def check_price_variation(self, disabled_coins, display=False):
-        if 'side' in self.current_order and not self.check_price_in_range(display=display):
+        if self.current_order.side is not None and not self.check_price_in_range(display=display):
             self._log_price_variation()
             if self.order:
                 await self.cancel_myorder_async()
@@ -472,7 +499,7 @@ class DexPair:
     def _log_price_variation(self):
         msg = (f"check_price_variation, {self.symbol}, variation: {self.variation}, "
                f"{self.order['status']}, live_price: {self.pair.cex.price:.8f}, "
-               f"order_price: {self.current_order['dex_price']:.8f}")
+               f"order_price: {self.current_order.dex_price:.8f}")
         self.pair.config_manager.general_log.warning(msg)
         if self.order and 'id' in self.order and self.order['id'] is not None:
             msg = f"check_price_variation, dex cancel: {self.order['id']}"
@@ -548,7 +575,7 @@ class DexPair:
         self._log_finished_order_details(side)
 
         # Write final trade history for recovery/display
-        self.order_history = self.current_order
+        self.order_history = self.current_order.to_dict()
         self.write_last_order_history()
         # Update critical addresses
         await self._update_taker_address()
@@ -556,7 +583,7 @@ class DexPair:
 
     def _determine_order_side(self) -> str:
         """Determine order side based on maker token."""
-        if self.current_order['maker'] == self.pair.t1.symbol:
+        if self.current_order.maker == self.pair.t1.symbol:
             return 'SELL'
         return 'BUY'
 
@@ -575,7 +602,7 @@ class DexPair:
 
         self.pair.config_manager.general_log.info(f"order FINISHED: {order_summary}")
         self.pair.config_manager.trade_log.info(f"order FINISHED: {order_summary}")
-        self.pair.config_manager.trade_log.info(f"virtual order: {self.current_order}")
+        self.pair.config_manager.trade_log.info(f"virtual order: {self.current_order.to_dict()}")
         self.pair.config_manager.trade_log.info(f"xbridge order: {self.order}")
 
     async def _update_taker_address(self):
@@ -0,0 +1,70 @@
+import heapq
+import itertools
+from time import monotonic
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class PairScheduler:
+    """Priority queue of pair names keyed by their next due time.
+
+    Each pair is rescheduled with its own cadence after it runs. Events (price
+    moved, order status changed, balance changed) call :meth:`wake` to move a
+    pair's due time forward so it runs on the next controller tick instead of
+    waiting out its full interval. Superseded heap entries are skipped lazily.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._due
+
+    def schedule(self, name: str, delay: float) -> None:
+        """(Re)schedule ``name`` to run ``delay`` seconds from now."""
+        due = monotonic() + max(0.0, delay)
+        self._due[name] = due
+        heapq.heappush(self._heap, (due, next(self._seq), name))
+
+    def schedule_many(self, delays: Iterable[Tuple[str, float]]) -> None:
+        for name, delay in delays:
+            self.schedule(name, delay)
+
+    def wake(self, name: str) -> bool:
+        """Make ``name`` due now. Returns False if it was already due or is not scheduled."""
+        due = self._due.get(name)
+        if due is None or due <= monotonic():
+            return False
+        self.schedule(name, 0)
+        return True
+
+    def remove(self, name: str) -> None:
+        self._due.pop(name, None)
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest pair is due (<= 0 if overdue), or None if nothing is scheduled."""
+        self._drop_stale()
+        if not self._heap:
+            return None
+        return self._heap[0][0] - monotonic()
+
+    def pop_due(self) -> List[str]:
+        """Remove and return all pairs whose due time has passed, earliest first."""
+        now = monotonic()
+        due_names = []
+        while self._heap:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, name = heapq.heappop(self._heap)
+            del self._due[name]
+            due_names.append(name)
+        return due_names
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
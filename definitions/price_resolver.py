@@ -0,0 +1,90 @@
+import asyncio
+from typing import Dict, Iterable, Optional
+
+# Exchange-specific field of ``ticker['info']`` holding the last trade price
+LAST_PRICE_KEYS = {
+    'kucoin': 'last',
+    'binance': 'lastPrice',
+}
+DEFAULT_LAST_PRICE_KEY = 'lastTradeRate'
+
+
+def last_price_key(exchange_id: str) -> str:
+    return LAST_PRICE_KEYS.get(exchange_id, DEFAULT_LAST_PRICE_KEY)
+
+
+def ticker_last_price(ticker: Dict, price_key: str) -> float:
+    """Last price of a ticker: the proxy's multi-exchange consolidated price if present, else the exchange field."""
+    consolidated = ticker.get('consolidated')
+    if consolidated:
+        return float(consolidated['last'])
+    return float(ticker['info'][price_key])
+
+
+class PriceResolver:
+    """Single entry point for CEX ticker lookups of one bot.
+
+    Requests arriving within ``batch_window`` seconds are merged into one
+    ``fetchTickers`` call (through the CCXT proxy when it is up), and a symbol
+    already waiting or in flight is shared rather than requested again. On
+    startup, or after errors, every pair asking for its missing prices thus
+    costs a single REST call instead of one per token.
+    """
+
+    BATCH_WINDOW = 0.05
+
+    def __init__(self, config_manager, batch_window: float = BATCH_WINDOW):
+        self.config_manager = config_manager
+        self.batch_window = batch_window
+        self._pending: Dict[str, asyncio.Future] = {}  # Waiting for the next batch
+        self._inflight: Dict[str, asyncio.Future] = {}  # Part of the batch being fetched
+        self._flush_task: Optional[asyncio.Task] = None
+        self.batch_count = 0
+
+    async def fetch_tickers(self, symbols: Iterable[str]) -> Dict[str, Dict]:
+        """Tickers for ``symbols``; symbols that could not be fetched are left out."""
+        loop = asyncio.get_running_loop()
+        futures: Dict[str, asyncio.Future] = {}
+        for symbol in dict.fromkeys(symbols):
+            future = self._inflight.get(symbol) or self._pending.get(symbol)
+            if future is None:
+                future = self._pending[symbol] = loop.create_future()
+            futures[symbol] = future
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.ensure_future(self._flush())
+        # Shielded: a cancelled caller must not cancel a result other callers wait for
+        results = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        return {symbol: ticker for symbol, ticker in zip(futures, results) if ticker}
+
+    async def fetch_ticker(self, symbol: str) -> Optional[Dict]:
+        return (await self.fetch_tickers([symbol])).get(symbol)
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        batch, self._pending = self._pending, {}
+        self._flush_task = None
+        if not batch:
+            return
+        self._inflight.update(batch)
+        tickers = None
+        try:
+            self.batch_count += 1
+            tickers = await self.config_manager.ccxt_manager.ccxt_call_fetch_tickers(
+                self.config_manager.my_ccxt, list(batch)
+            )
+        except Exception as e:
+            await self.config_manager.error_handler.handle_async(
+                e,
+                context={"stage": "resolve_cex_prices", "symbols": list(batch)}
+            )
+        finally:
+            if not isinstance(tickers, dict):
+                tickers = {}
+            for symbol, future in batch.items():
+                self._inflight.pop(symbol, None)
+                if not future.done():
+                    ticker = tickers.get(symbol)
+                    # The proxy reports per-symbol failures as {'error': ...}
+                    future.set_result(ticker if isinstance(ticker, dict) and 'error' not in ticker else None)
+            if self._pending and (self._flush_task is None or self._flush_task.done()):
+                self._flush_task = asyncio.ensure_future(self._flush())
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from time import monotonic
+from typing import Optional
+
+
+class ProxyHealth:
+    """Cached liveness of the local CCXT proxy, shared by every bot in the process.
+
+    The state is updated from the outcome of real proxy requests and, when it
+    has not been confirmed for ``probe_interval`` seconds, by a non-blocking
+    background connect. Hot paths only read the cached state, so a dead proxy
+    never stalls an event loop on a blocking socket connect.
+    """
+
+    PROBE_INTERVAL = 5.0
+    PROBE_TIMEOUT = 0.5
+    RESTART_INTERVAL = 60.0
+
+    def __init__(self, host: str, port: int, probe_interval: float = PROBE_INTERVAL,
+                 probe_timeout: float = PROBE_TIMEOUT, restart_interval: float = RESTART_INTERVAL):
+        self.host = host
+        self.port = port
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.restart_interval = restart_interval
+        self._lock = threading.Lock()
+        self._up: Optional[bool] = None  # None until first checked
+        self._checked_at: Optional[float] = None
+        self._restart_at: Optional[float] = None
+        self._probing = False
+        self.consecutive_failures = 0
+
+    @property
+    def state(self) -> Optional[bool]:
+        return self._up
+
+    def is_up(self) -> bool:
+        return self._up is True
+
+    def is_stale(self) -> bool:
+        checked_at = self._checked_at
+        return checked_at is None or monotonic() - checked_at > self.probe_interval
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._up = True
+            self._checked_at = monotonic()
+            self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._up = False
+            self._checked_at = monotonic()
+            self.consecutive_failures += 1
+
+    def should_restart(self) -> bool:
+        """True at most once per ``restart_interval`` while the proxy is down."""
+        with self._lock:
+            if self._up is True:
+                return False
+            now = monotonic()
+            if self._restart_at is not None and now - self._restart_at < self.restart_interval:
+                return False
+            self._restart_at = now
+            return True
+
+    async def probe(self) -> bool:
+        """Check the proxy port with an async connect and update the cached state."""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port),
+                                               timeout=self.probe_timeout)
+        except (OSError, asyncio.TimeoutError):
+            self.record_failure()
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        self.record_success()
+        return True
+
+    def refresh_in_background(self) -> Optional[asyncio.Task]:
+        """Schedule a probe on the running loop if the state is stale. Never waits for it."""
+        with self._lock:
+            if self._probing or not self.is_stale():
+                return None
+            self._probing = True
+        return asyncio.ensure_future(self._background_probe())
+
+    async def _background_probe(self) -> None:
+        try:
+            await self.probe()
+        finally:
+            with self._lock:
+                self._probing = False
@@ -1,6 +1,12 @@
 import asyncio
+import heapq
+import itertools
+import json
 import socket
 import threading
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
 
 import aiohttp
 import async_timeout
@@ -9,19 +15,131 @@ from aiohttp import BasicAuth
 from definitions.error_handler import OperationalError
 
 
-class AsyncThreadingSemaphore:
-    """A wrapper to use a threading.BoundedSemaphore in an async context."""
+class RpcLimiter:
+    """
+    Concurrency limiter shared by every event loop in the process.
+
+    Permits are counted globally under a threading lock so the cap holds across the
+    GUI's bot threads, while waiting happens on a future of the caller's own loop, so
+    no executor thread is tied up. Waiters are served by priority (lower value first),
+    then in arrival order.
+    """
 
     def __init__(self, value=1):
-        self._semaphore = threading.BoundedSemaphore(value)
+        self._bound = value
+        self._value = value
+        self._lock = threading.Lock()
+        self._waiters = []  # heap of (priority, seq, _LimiterWaiter)
+        self._seq = itertools.count()
+        self._queue_depth = 0
+        # Metrics
+        self._acquired = 0
+        self._waited = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._queue_depth_max = 0
+
+    async def acquire(self, priority=2):
+        """Wait for a permit. Lower ``priority`` values are served first."""
+        with self._lock:
+            if self._value > 0 and not self._queue_depth:
+                self._value -= 1
+                self._acquired += 1
+                return True
+            waiter = _LimiterWaiter(asyncio.get_running_loop())
+            heapq.heappush(self._waiters, (priority, next(self._seq), waiter))
+            self._queue_depth += 1
+            self._queue_depth_max = max(self._queue_depth_max, self._queue_depth)
+
+        start = time.perf_counter()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    # The permit was handed over just before cancellation; pass it on.
+                    self._release_locked()
+                else:
+                    waiter.cancelled = True
+                    self._queue_depth -= 1
+            raise
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._acquired += 1
+            self._waited += 1
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+        return True
+
+    def release(self):
+        """Return a permit, handing it directly to the highest-priority waiter if any."""
+        with self._lock:
+            self._release_locked()
+
+    def _release_locked(self):
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.cancelled:
+                continue
+            try:
+                waiter.loop.call_soon_threadsafe(_wake_waiter, waiter.future)
+            except RuntimeError:
+                # The waiter's loop is closed; nobody will consume this permit.
+                waiter.cancelled = True
+                self._queue_depth -= 1
+                continue
+            waiter.granted = True
+            self._queue_depth -= 1
+            return
+        if self._value >= self._bound:
+            raise ValueError("RpcLimiter released too many times")
+        self._value += 1
+
+    @asynccontextmanager
+    async def slot(self, priority=2):
+        """Async context manager holding one permit at ``priority``."""
+        await self.acquire(priority)
+        try:
+            yield self
+        finally:
+            self.release()
 
     async def __aenter__(self):
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._semaphore.acquire)
+        await self.acquire()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        self._semaphore.release()
+        self.release()
+
+    def stats(self):
+        """Snapshot of limiter metrics (queue depth and wait times in seconds)."""
+        with self._lock:
+            return {
+                "capacity": self._bound,
+                "available": self._value,
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._queue_depth_max,
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "avg_wait": self._wait_time_total / self._waited if self._waited else 0.0,
+                "max_wait": self._wait_time_max,
+            }
+
+
+class _LimiterWaiter:
+    __slots__ = ("loop", "future", "granted", "cancelled")
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+        self.cancelled = False
+
+
+def _wake_waiter(future):
+    if not future.done():
+        future.set_result(True)
 
 
 class RpcTimeoutError(Exception):
@@ -29,6 +147,45 @@ class RpcTimeoutError(Exception):
     pass
 
 
+class RpcBatchUnsupportedError(Exception):
+    """Raised when the RPC server does not answer JSON-RPC batch requests with a batch response"""
+    pass
+
+
+JSON_HEADERS = {'Content-type': 'application/json'}
+# Payload skeleton shared by every call; only id, method and params are serialized per request.
+_PAYLOAD_TEMPLATE = '{"jsonrpc": "2.0", "id": %d, "method": %s, "params": %s}'
+
+
+@lru_cache(maxsize=16)
+def _basic_auth(rpc_user, rpc_password):
+    """Build (and memoize) the BasicAuth helper for a set of credentials."""
+    return BasicAuth(rpc_user, rpc_password) if rpc_user and rpc_password else None
+
+
+def _encode_payload(method, params, request_id=0):
+    """Serialize a JSON-RPC request body from the pre-built template."""
+    return _PAYLOAD_TEMPLATE % (request_id, json.dumps(method), json.dumps(params))
+
+
+def create_rpc_session(rpc_user=None, rpc_password=None, limit=5, keepalive_timeout=30):
+    """
+    Create a keep-alive aiohttp session dedicated to JSON-RPC traffic.
+
+    Must be called from within the event loop that will use the session.
+
+    :param rpc_user: RPC server username, stored as the session default auth.
+    :param rpc_password: RPC server password.
+    :param limit: Maximum number of pooled connections.
+    :param keepalive_timeout: Seconds an idle connection is kept open for reuse.
+    :return: aiohttp.ClientSession bound to the running loop.
+    """
+    connector = aiohttp.TCPConnector(limit=limit, keepalive_timeout=keepalive_timeout)
+    return aiohttp.ClientSession(connector=connector,
+                                 auth=_basic_auth(rpc_user, rpc_password),
+                                 headers=JSON_HEADERS)
+
+
 async def rpc_call(method, params=None, url="http://127.0.0.1", rpc_user=None, rpc_password=None,
                    rpc_port=None, debug=2, timeout=30, prefix='xbridge', max_err_count=5,
                    logger=None, session=None, error_handler=None,
@@ -48,16 +205,16 @@ async def rpc_call(method, params=None, url="http://127.0.0.1", rpc_user=None, r
     :param prefix: Prefix for debug messages.
     :param max_err_count: Maximum number of retries in case of errors.
     :param logger: Optional logger instance to use for messages.
-    :param session: Optional aiohttp.ClientSession instance.
+    :param session: Optional aiohttp.ClientSession instance. Pass a pooled session (see
+        create_rpc_session) to reuse keep-alive connections across calls.
     :param error_handler: ErrorHandler instance for centralized error handling.
     :return: Result of the RPC call, or None if failed after max attempts.
     """
     if params is None:
         params = []
     url = f"{url}:{rpc_port}" if rpc_port not in {80, 443} else url
-    payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": 0}
-    headers = {'Content-type': 'application/json'}
-    auth = BasicAuth(rpc_user, rpc_password) if rpc_user and rpc_password else None
+    payload = _encode_payload(method, params)
+    auth = _basic_auth(rpc_user, rpc_password)
     client_timeout = aiohttp.ClientTimeout(total=timeout)
 
     async def _rpc_call_internal(s):
@@ -66,8 +223,8 @@ async def rpc_call(method, params=None, url="http://127.0.0.1", rpc_user=None, r
             try:
                 async with async_timeout.timeout(timeout):
                     async with s.post(url,
-                                      json=payload,
-                                      headers=headers,
+                                      data=payload,
+                                      headers=JSON_HEADERS,
                                       auth=auth,
                                       timeout=client_timeout) as response:
                         response_text = await response.text()
@@ -145,6 +302,77 @@ async def rpc_call(method, params=None, url="http://127.0.0.1", rpc_user=None, r
             return await _rpc_call_internal(new_session)
 
 
+# JSON-RPC error codes a server answers with when it cannot take the request array itself
+_BATCH_REJECTION_CODES = frozenset({-32600, -32700})  # Invalid request, parse error
+
+
+def _is_batch_rejection(json_response) -> bool:
+    """True if a non-list reply to a batch rejects the array, rather than reporting one failed call."""
+    if not isinstance(json_response, dict):
+        return True
+    error = json_response.get('error')
+    if json_response.get('id') is not None or not isinstance(error, dict):
+        return False
+    return error.get('code') in _BATCH_REJECTION_CODES
+
+
+async def rpc_batch_call(calls, url="http://127.0.0.1", rpc_user=None, rpc_password=None, rpc_port=None,
+                         timeout=30, session=None):
+    """
+    Send several JSON-RPC calls in a single JSON-RPC 2.0 batch POST.
+
+    No retries are attempted here; callers are expected to fall back to rpc_call
+    for any item that could not be resolved.
+
+    :param calls: Sequence of (method, params) tuples.
+    :param url: URL for the RPC server.
+    :param rpc_user: RPC server username.
+    :param rpc_password: RPC server password.
+    :param rpc_port: RPC port.
+    :param timeout: Timeout for the HTTP request.
+    :param session: Optional aiohttp.ClientSession instance.
+    :return: List of raw JSON-RPC response objects aligned with ``calls``. An entry is
+        None when the server omitted the response for that request id.
+    :raises RpcBatchUnsupportedError: If the server rejected the request array itself.
+    :raises OperationalError: If the server answered with an error that is not a batch rejection.
+    """
+    url = f"{url}:{rpc_port}" if rpc_port not in {80, 443} else url
+    body = "[" + ",".join(_encode_payload(method, params or [], request_id)
+                          for request_id, (method, params) in enumerate(calls)) + "]"
+    auth = _basic_auth(rpc_user, rpc_password)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def _batch_call_internal(s):
+        async with async_timeout.timeout(timeout):
+            async with s.post(url, data=body, headers=JSON_HEADERS, auth=auth,
+                              timeout=client_timeout) as response:
+                response_text = await response.text()
+                try:
+                    json_response = json.loads(response_text)
+                except ValueError:
+                    response.raise_for_status()
+                    raise OperationalError("RPC batch response is not valid JSON",
+                                           context={"content": response_text})
+
+                if not isinstance(json_response, list):
+                    if _is_batch_rejection(json_response):
+                        raise RpcBatchUnsupportedError(
+                            f"Expected a batch response, got {type(json_response).__name__} "
+                            f"(HTTP {response.status})")
+                    # An error about one of the calls, not about the batch: let the caller retry them
+                    raise OperationalError(f"RPC batch request failed (HTTP {response.status})",
+                                           context={"content": response_text})
+
+                by_id = {item.get('id'): item for item in json_response if isinstance(item, dict)}
+                return [by_id.get(request_id) for request_id in range(len(calls))]
+
+    if session:
+        return await _batch_call_internal(session)
+    else:
+        async with aiohttp.ClientSession() as new_session:
+            return await _batch_call_internal(new_session)
+
+
 def is_port_open(ip: str, port: int, timeout: float = 2.0) -> bool:
     """Check if TCP port is open synchronously."""
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
@@ -0,0 +1,115 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+
+def copy_result(value):
+    """Copy the containers of a decoded JSON-RPC result (dicts and lists; leaves are immutable)."""
+    if isinstance(value, dict):
+        return {key: copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_result(item) for item in value]
+    return value
+
+
+class RpcCache:
+    """Thread-safe TTL cache with LRU eviction for read-only RPC results.
+
+    Entries are keyed by ``(method, params)`` and carry a set of tags (token
+    symbols, order ids) so that write calls can invalidate only the entries
+    they affect. A generation counter lets callers drop results of reads that
+    were already in flight when an invalidation happened. Values are copied
+    on ``set`` and ``get``, so a caller mutating its result cannot change what
+    other callers read.
+    """
+
+    def __init__(self, ttls, max_entries=512):
+        """
+        Args:
+            ttls: Mapping of method name to cache lifetime in seconds. Methods
+                missing from the mapping, or with a TTL <= 0, are not cached.
+            max_entries: Maximum number of cached results before the least
+                recently used entry is evicted.
+        """
+        self.ttls = {method: float(ttl) for method, ttl in ttls.items() if ttl and ttl > 0}
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, tags, value)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def is_cacheable(self, method):
+        return method in self.ttls
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def get(self, method, params):
+        """Return ``(True, value)`` for a live entry, else ``(False, None)``."""
+        key = (method, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            if entry[0] <= monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[2]
+        return True, copy_result(value)
+
+    def peek(self, method, params):
+        """Return a live cached value without touching LRU order or counters. Not copied: read only."""
+        with self._lock:
+            entry = self._entries.get((method, params))
+            if entry is None or entry[0] <= monotonic():
+                return None
+            return entry[2]
+
+    def set(self, method, params, value, tags=(), generation=None):
+        """Store a result. Skipped if an invalidation happened since ``generation`` was read."""
+        ttl = self.ttls.get(method)
+        if ttl is None:
+            return
+        key = (method, params)
+        value = copy_result(value)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (monotonic() + ttl, frozenset(tags), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, method, tags=None):
+        """Drop cached entries of ``method``; only those sharing a tag when ``tags`` is given."""
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, (_, entry_tags, _) in self._entries.items()
+                     if key[0] == method and (tags is None or entry_tags & tags)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
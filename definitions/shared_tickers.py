@@ -0,0 +1,187 @@
+import math
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Optional, Tuple
+
+# Layout of the segment (little endian):
+#   header   magic[8] capacity:u32 count:u32 seq:u64 generation:u64
+#   names    capacity x 32 bytes, NUL padded utf-8 symbols
+#   columns  last, bid, ask, updated: capacity x float64 each (NaN when unknown)
+# The writer makes ``seq`` odd while it writes and even when done; a reader
+# retries until it sees the same even ``seq`` before and after reading.
+# ``generation`` changes whenever symbol slots are (re)assigned.
+MAGIC = b"XBTICK01"
+HEADER = struct.Struct("<8sIIQQ")
+SEQ_OFFSET = 16
+NAME_SIZE = 32
+COLUMNS = ("last", "bid", "ask", "updated")
+DEFAULT_CAPACITY = 256
+DEFAULT_NAME = "xbridge_bot_tickers"
+
+_U64 = struct.Struct("<Q")
+_F64 = struct.Struct("<d")
+_NAN = float("nan")
+
+
+def segment_size(capacity: int) -> int:
+    return HEADER.size + capacity * (NAME_SIZE + 8 * len(COLUMNS))
+
+
+class _TickerTable:
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int):
+        self.shm = shm
+        self.buf = shm.buf
+        self.capacity = capacity
+        self._names_offset = HEADER.size
+        self._column_offsets = {
+            column: HEADER.size + capacity * NAME_SIZE + i * capacity * 8
+            for i, column in enumerate(COLUMNS)
+        }
+
+    def _value_offset(self, column: str, slot: int) -> int:
+        return self._column_offsets[column] + slot * 8
+
+    def _read_seq(self) -> int:
+        return _U64.unpack_from(self.buf, SEQ_OFFSET)[0]
+
+
+class SharedTickerWriter(_TickerTable):
+    """Publishes the proxy's ticker cache into a shared-memory segment. Single writer."""
+
+    def __init__(self, name: str = DEFAULT_NAME, capacity: int = DEFAULT_CAPACITY):
+        size = segment_size(capacity)
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left over by a proxy that did not shut down cleanly: take it over
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        super().__init__(shm, capacity)
+        self.name = name
+        self.slots: Dict[str, int] = {}
+        self._seq = 0
+        self._generation = 0
+        HEADER.pack_into(self.buf, 0, MAGIC, capacity, 0, 0, 0)
+        for column in COLUMNS:
+            for slot in range(capacity):
+                _F64.pack_into(self.buf, self._value_offset(column, slot), _NAN)
+
+    def publish(self, tickers: Dict[str, Dict]) -> int:
+        """Write ``{symbol: ccxt ticker}`` into the table. Returns the number of symbols written."""
+        now = time.time()
+        rows = []
+        new_names = []
+        for symbol, ticker in tickers.items():
+            if not isinstance(ticker, dict) or 'error' in ticker:
+                continue
+            slot = self.slots.get(symbol)
+            if slot is None:
+                encoded = symbol.encode()
+                if len(self.slots) >= self.capacity or len(encoded) > NAME_SIZE:
+                    continue
+                slot = self.slots[symbol] = len(self.slots)
+                new_names.append((slot, encoded))
+            rows.append((slot, ticker))
+        if not rows:
+            return 0
+
+        self._seq += 1  # odd: write in progress
+        _U64.pack_into(self.buf, SEQ_OFFSET, self._seq)
+        for slot, encoded in new_names:
+            start = self._names_offset + slot * NAME_SIZE
+            self.buf[start:start + NAME_SIZE] = encoded.ljust(NAME_SIZE, b"\0")
+        for slot, ticker in rows:
+            for column in ("last", "bid", "ask"):
+                value = ticker.get(column)
+                _F64.pack_into(self.buf, self._value_offset(column, slot),
+                               float(value) if value is not None else _NAN)
+            _F64.pack_into(self.buf, self._value_offset("updated", slot), now)
+        if new_names:
+            self._generation += 1
+        HEADER.pack_into(self.buf, 0, MAGIC, self.capacity, len(self.slots), self._seq + 1, self._generation)
+        self._seq += 1  # even: consistent
+        return len(rows)
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedTickerReader(_TickerTable):
+    """Lock-free reader of a segment published by SharedTickerWriter."""
+
+    MAX_RETRIES = 1000
+
+    @classmethod
+    def attach(cls, name: str = DEFAULT_NAME) -> Optional['SharedTickerReader']:
+        """Open the segment, or return None if it does not exist or has an unknown layout."""
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except (FileNotFoundError, OSError):
+            return None
+        if os.name != 'nt':
+            # Readers must not unlink the writer's segment when they exit
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        magic, capacity, _, _, _ = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or shm.size < segment_size(capacity):
+            shm.close()
+            return None
+        return cls(shm, capacity)
+
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int):
+        super().__init__(shm, capacity)
+        self._generation = None
+        self._slots: Dict[str, int] = {}
+
+    def _load_slots(self, count: int) -> Dict[str, int]:
+        slots = {}
+        for slot in range(min(count, self.capacity)):
+            start = self._names_offset + slot * NAME_SIZE
+            raw = bytes(self.buf[start:start + NAME_SIZE]).rstrip(b"\0")
+            if raw:
+                slots[raw.decode()] = slot
+        return slots
+
+    def read(self, symbols: Iterable[str]) -> Optional[Dict[str, Tuple[float, float, float, float]]]:
+        """
+        Consistent snapshot of ``(last, bid, ask, updated)`` per requested symbol present in
+        the table (NaN fields become None). Returns None if no consistent read was possible.
+        """
+        symbols = list(symbols)
+        for _ in range(self.MAX_RETRIES):
+            seq = self._read_seq()
+            if seq & 1:
+                continue
+            _, _, count, _, generation = HEADER.unpack_from(self.buf, 0)
+            if generation != self._generation:
+                slots = self._load_slots(count)
+            else:
+                slots = self._slots
+            result = {}
+            for symbol in symbols:
+                slot = slots.get(symbol)
+                if slot is None:
+                    continue
+                values = tuple(_F64.unpack_from(self.buf, self._value_offset(column, slot))[0]
+                               for column in COLUMNS)
+                result[symbol] = tuple(None if math.isnan(v) else v for v in values)
+            if self._read_seq() == seq:
+                self._generation, self._slots = generation, slots
+                return result
+        return None
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
@@ -59,6 +59,13 @@ class ShutdownCoordinator:
             else:
                 logger.warning("No strategy instance available for order cancellation")
 
+            # 3. Release pooled XBridge RPC connections for this loop
+            try:
+                await config_manager.xbridge_manager.close_session()
+            except Exception as e:
+                context = {"phase": "shutdown", "operation": "close_rpc_session"}
+                await config_manager.error_handler.handle_async(e, context=context)
+
         except asyncio.CancelledError:
             logging.getLogger("unified_shutdown").warning("Shutdown was cancelled.")
             raise
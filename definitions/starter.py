@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import time
 import traceback
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING, Union
@@ -8,8 +9,14 @@ import ccxt
 
 from definitions.ccxt_manager import CCXTManager
 from definitions.errors import RPCConfigError
+from definitions.metrics import MetricsServer, metrics
+from definitions.orders import VirtualOrder
 from definitions.pair import Pair
+from definitions.pair_scheduler import PairScheduler
+from definitions.price_resolver import last_price_key, ticker_last_price
+from definitions.shared_tickers import SharedTickerReader
 from definitions.shutdown import ShutdownCoordinator
+from definitions.ticker_stream import TickerStream
 from definitions.token import Token
 
 if TYPE_CHECKING:
@@ -21,13 +28,28 @@ debug_level = 2
 
 CCXT_PRICE_REFRESH: int = 2
 UPDATE_BALANCES_DELAY: float = 0.5
+BALANCES_FULL_REFRESH_DELAY: float = 60.0
 FLUSH_DELAY: int = 15 * 60
 MAX_THREADS: int = 5
 SLEEP_INTERVAL: int = 1  # Shorter sleep interval (in seconds)
+SHARED_TICKERS_MAX_AGE: float = 60.0  # Older shared-memory prices fall back to the proxy RPC
+SHARED_TICKERS_ATTACH_RETRY: float = 30.0
+# The proxy evicts symbols nobody requests; shared-memory readers renew their demand over RPC this often
+SHARED_TICKERS_KEEPALIVE: float = 120.0
+PAIR_CONCURRENCY: int = 0  # Pairs processed at once per cycle, 0 for no limit
+PAIR_TIMEOUT: float = 60.0  # Seconds a cycle waits for a pair, counted from when the pair starts
 
 
 class TradingProcessor:
-    """Processes trading pairs using target functions asynchronously."""
+    """Processes trading pairs using target functions asynchronously.
+
+    Pairs run with a bounded concurrency width. A pair still running
+    ``pair_timeout`` seconds after it started (time spent waiting for a
+    concurrency slot does not count) no longer holds up the cycle: it gives up
+    its slot and is left to finish in the background (it is not cancelled, so
+    an order being placed is never lost) and is skipped by later cycles until
+    it does.
+    """
 
     def __init__(self, controller: 'MainController') -> None:
         """
@@ -38,35 +60,133 @@ class TradingProcessor:
         """
         self.controller: 'MainController' = controller
         self.pairs_dict: Dict[str, Pair] = controller.pairs_dict
+        config_xbridge = getattr(controller.config_manager, 'config_xbridge', None)
+        self.pair_concurrency: int = int(self._config_number(config_xbridge, 'pair_concurrency', PAIR_CONCURRENCY))
+        self.pair_timeout: Optional[float] = self._config_number(config_xbridge, 'pair_timeout', PAIR_TIMEOUT) or None
+        self._stragglers: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def _config_number(config: Any, key: str, default: float) -> float:
+        value = getattr(config, key, None)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            return default
+        return value
 
     async def process_pairs(
             self,
-            target_function: Callable[[Pair], Union[None, Any]]
+            target_function: Callable[[Pair], Union[None, Any]],
+            pair_names: Optional[List[str]] = None
     ) -> None:
         """
-        Processes all trading pairs using the target function.
+        Processes trading pairs using the target function.
         
-        Handles both async and sync functions. Processes only enabled pairs.
+        Handles both async and sync functions. Processes only enabled pairs,
+        skipping those still running from an earlier cycle.
         
         Args:
             target_function: Function to execute for each pair. Can be async or sync.
+            pair_names: Optional subset of pairs_dict keys to process; all pairs if None.
         """
-        tasks = []
-        for pair in self.pairs_dict.values():
+        if pair_names is None:
+            pairs = list(self.pairs_dict.items())
+        else:
+            pairs = [(name, self.pairs_dict[name]) for name in pair_names if name in self.pairs_dict]
+        semaphore = asyncio.Semaphore(self.pair_concurrency) if self.pair_concurrency else None
+        tasks: Dict[str, asyncio.Future] = {}
+        for name, pair in pairs:
             if pair.disabled:
                 continue
             if self.controller.shutdown_event.is_set():
-                return
+                break
+            straggler = self._stragglers.get(name)
+            if straggler is not None and not straggler.done():
+                self.controller.config_manager.general_log.debug(f"{name}: previous run still in progress, skipping.")
+                continue
+            tasks[name] = asyncio.ensure_future(self._run_pair(name, pair, target_function, semaphore))
+        if not tasks:
+            return
+
+        # Report each pair as it finishes. Every pair returns (finished, failed or handed to
+        # the background), so none is left untracked
+        names: Dict[asyncio.Future, str] = {task: name for name, task in tasks.items()}
+        pending: Set[asyncio.Future] = set(names)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is not None:
+                        await self.controller.config_manager.error_handler.handle_async(
+                            task.exception(), context={"pair": names[task], "stage": "process_pair"}
+                        )
+        finally:
+            # If this cycle is cancelled, cancelling the waits hands the running pairs to the background
+            for task in pending:
+                task.cancel()
+
+    async def _run_pair(
+            self,
+            name: str,
+            pair: Pair,
+            target_function: Callable[[Pair], Union[None, Any]],
+            semaphore: Optional[asyncio.Semaphore]
+    ) -> None:
+        if semaphore is not None:
+            async with semaphore:
+                return await self._run_bounded(name, pair, target_function)
+        return await self._run_bounded(name, pair, target_function)
+
+    async def _run_bounded(self, name: str, pair: Pair, target_function: Callable[[Pair], Union[None, Any]]) -> None:
+        """Run one pair, waiting for it at most ``pair_timeout`` seconds from now."""
+        task = asyncio.ensure_future(self._run_timed(name, pair, target_function))
+        try:
+            # asyncio.wait leaves the pair running on timeout or if this cycle is cancelled
+            await asyncio.wait({task}, timeout=self.pair_timeout)
+        finally:
+            if not task.done():
+                self._keep_in_background(name, task)
+        if task.done():
+            return task.result()
+
+    def _keep_in_background(self, name: str, task: asyncio.Future) -> None:
+        self.controller.config_manager.general_log.warning(
+            f"{name}: still running after {self.pair_timeout}s, continuing in the background."
+        )
+        self._stragglers[name] = task
+        task.add_done_callback(functools.partial(self._on_straggler_done, name))
+
+    async def _run_timed(self, name: str, pair: Pair, target_function: Callable[[Pair], Union[None, Any]]) -> None:
+        start_time = time.perf_counter()
+        try:
             if asyncio.iscoroutinefunction(target_function):
-                tasks.append(target_function(pair))
+                await target_function(pair)
             else:
-                tasks.append(self.controller.loop.run_in_executor(None, target_function, pair))
-        if tasks:
-            await asyncio.gather(*tasks)
+                await self.controller.loop.run_in_executor(None, target_function, pair)
+        finally:
+            metrics.observe("stage", time.perf_counter() - start_time, stage="pair_step",
+                            strategy=self.controller.config_manager.strategy, pair=name)
+
+    def _on_straggler_done(self, name: str, task: asyncio.Future) -> None:
+        if self._stragglers.get(name) is task:
+            del self._stragglers[name]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.controller.config_manager.error_handler.handle(
+                error, context={"pair": name, "stage": "process_pair_background"}
+            )
+        else:
+            self.controller.config_manager.general_log.info(f"{name}: background run finished.")
 
 
 class BalanceManager:
-    """Manages token balance updates for the trading system."""
+    """Manages token balance updates for the trading system.
+
+    One dxgettokenbalances call per refresh acts as a change detector: UTXO
+    detail is only requested for tokens whose bulk balance moved (or on the
+    periodic full refresh), and RPC calls are never made while holding
+    ``config_manager.resource_lock``.
+    """
 
     def __init__(
             self,
@@ -85,20 +205,26 @@ class BalanceManager:
         self.tokens_dict: Dict[str, Token] = tokens_dict
         self.config_manager: 'ConfigManager' = config_manager
         self.timer_main_dx_update_bals: Optional[float] = None
+        self.timer_full_refresh: Optional[float] = None
         self.loop: asyncio.AbstractEventLoop = loop
+        # Last dxgettokenbalances value seen per token
+        self._balance_signatures: Dict[str, Any] = {}
+        # Tokens whose balance changed during the last update, used to wake their pairs early
+        self.changed_tokens: Set[str] = set()
 
     async def update_balances(self) -> None:
         """
         Update token balances if update interval has elapsed.
         
-        Retrieves token UTXOs and calculates free/total balances.
-        Handles errors through the application's error handler.
+        Fetches bulk balances, then retrieves UTXOs only for tokens whose
+        balance changed. Handles errors through the application's error handler.
         """
         strategy_instance = getattr(self.config_manager, 'strategy_instance', None)
         if strategy_instance and hasattr(strategy_instance, 'dry_mode') and strategy_instance.dry_mode:
             self.config_manager.general_log.debug("Skipping balance update in dry_mode.")
             return
 
+        self.changed_tokens = set()
         if self._should_update_bals():
             try:
                 xb_tokens: List[str] = await self.config_manager.xbridge_manager.getlocaltokens()
@@ -115,9 +241,19 @@ class BalanceManager:
                 )
                 return
 
+            bulk_balances = await self._get_bulk_balances()
+            full_refresh = bulk_balances is None or self._should_full_refresh()
+
             futures = []
             for token_data in self.tokens_dict.values():
-                futures.append(self._update_token_balance(token_data, xb_tokens))
+                symbol = token_data.symbol
+                if symbol not in xb_tokens:
+                    self._reset_token_balance(token_data)
+                    continue
+                signature = bulk_balances.get(symbol) if bulk_balances is not None else None
+                if (full_refresh or symbol not in self._balance_signatures
+                        or self._balance_signatures[symbol] != signature):
+                    futures.append(self._update_token_balance(token_data, signature))
 
             if futures:
                 try:
@@ -129,48 +265,80 @@ class BalanceManager:
                     )
 
             self.timer_main_dx_update_bals = time.time()
+            if full_refresh:
+                self.timer_full_refresh = self.timer_main_dx_update_bals
 
     def _should_update_bals(self) -> bool:
         """Determine if balance update interval has elapsed since last update."""
         return (self.timer_main_dx_update_bals is None or
                 time.time() - self.timer_main_dx_update_bals > UPDATE_BALANCES_DELAY)
 
+    def _should_full_refresh(self) -> bool:
+        """Periodically re-read every token's UTXOs regardless of the bulk balances."""
+        return (self.timer_full_refresh is None or
+                time.time() - self.timer_full_refresh > BALANCES_FULL_REFRESH_DELAY)
+
+    async def _get_bulk_balances(self) -> Optional[Dict[str, Any]]:
+        """Return dxgettokenbalances as a dict, or None to fall back to per-token UTXO reads."""
+        try:
+            balances = await self.config_manager.xbridge_manager.gettokenbalances()
+        except Exception as e:
+            await self.config_manager.error_handler.handle_async(e, context={"stage": "get_token_balances"})
+            return None
+        return balances if isinstance(balances, dict) else None
+
+    def _reset_token_balance(self, token_data: Token) -> None:
+        self._balance_signatures.pop(token_data.symbol, None)
+        if token_data.dex.total_balance is not None or token_data.dex.free_balance is not None:
+            self.changed_tokens.add(token_data.symbol)
+        with self.config_manager.resource_lock:
+            token_data.dex.total_balance = None
+            token_data.dex.free_balance = None
+
     async def _update_token_balance(
             self,
             token_data: Token,
-            xb_tokens: List[str]
+            signature: Any = None
     ) -> None:
         """
-        Update balance for a single token.
+        Update balance for a single token from its UTXOs.
         
         Args:
             token_data: Token instance to update
-            xb_tokens: List of tokens to get balances for
+            signature: Bulk balance the UTXOs are read for, recorded on success
         """
-        with self.config_manager.resource_lock:
-            try:
-                if token_data.symbol not in xb_tokens:
-                    token_data.dex.total_balance = None
-                    token_data.dex.free_balance = None
-                    return
-
-                utxos = await self.config_manager.xbridge_manager.gettokenutxo(token_data.symbol, used=True)
-                bal, bal_free = self._calculate_balances(utxos)
+        symbol = token_data.symbol
+        try:
+            utxos = await self.config_manager.xbridge_manager.gettokenutxo(symbol, used=True)
+            if not isinstance(utxos, list):
+                # Leave the previous balance in place and retry next refresh
+                self._balance_signatures.pop(symbol, None)
+                return
+            bal, bal_free = self._calculate_balances(utxos)
+            if (token_data.dex.total_balance, token_data.dex.free_balance) != (bal, bal_free):
+                self.changed_tokens.add(symbol)
+            # Lock only around the assignment so readers never wait on RPC latency
+            with self.config_manager.resource_lock:
                 token_data.dex.total_balance = bal
                 token_data.dex.free_balance = bal_free
-            except Exception as e:
-                await self.config_manager.error_handler.handle_async(
-                    e,
-                    context={"token": token_data.symbol, "stage": "update_balance"}
-                )
+            self._balance_signatures[symbol] = signature
+        except Exception as e:
+            self._balance_signatures.pop(symbol, None)
+            await self.config_manager.error_handler.handle_async(
+                e,
+                context={"token": symbol, "stage": "update_balance"}
+            )
 
     def _calculate_balances(self, utxos: List[Dict[str, Any]]) -> Tuple[float, float]:
         """
         Calculate total and free balances from UTXO list.
-        
+
+        Re-summed from the full list on every call: dxgetutxos always returns the
+        whole set, and it is only read for tokens whose bulk balance moved.
+
         Args:
             utxos: List of UTXO dictionaries
-            
+
         Returns:
             Tuple of (total_balance, free_balance)
         """
@@ -208,6 +376,12 @@ class PriceHandler:
         self.loop: asyncio.AbstractEventLoop = loop
         self.ccxt_price_timer: Optional[float] = None
         self.shutdown_event: asyncio.Event = main_controller.shutdown_event
+        # Push feed from the CCXT proxy; polling is used until it is live and whenever it drops
+        self.ticker_stream: Optional[TickerStream] = None
+        # Shared-memory ticker table published by a proxy on this host, preferred when fresh
+        self.shared_tickers: Optional[SharedTickerReader] = None
+        self._shared_tickers_attach_timer: Optional[float] = None
+        self._proxy_demand_timer: Optional[float] = None  # Last ticker request sent to the proxy
 
     async def update_ccxt_prices(self) -> None:
         """
@@ -229,38 +403,128 @@ class PriceHandler:
                     context={"stage": "price_update"}
                 )
 
-    async def _fetch_and_update_prices(self) -> None:
-        """Fetch ticker data from CEX and update token prices."""
+    async def update_pushed_prices(self) -> bool:
+        """
+        Update CEX prices from the shared ticker table or the live ticker stream only.
+
+        Used by watch ticks between full refreshes: no RPC or HTTP call is made
+        (custom coins are skipped). Returns False if neither source is available.
+        """
+        if not self.config_manager.strategy_instance.should_update_cex_prices():
+            return False
+        return await self._update_from_pushed_prices(self._ticker_keys(), include_custom=False)
+
+    def _ticker_keys(self) -> List[str]:
         custom_coins: Set[str] = set(vars(self.config_manager.config_coins.usd_ticker_custom).keys())
-        keys: List[str] = [
+        return [
             self._construct_key(token)
             for token in self.tokens_dict
             if token not in custom_coins
         ]
 
+    async def _update_from_pushed_prices(self, keys: List[str], include_custom: bool = True) -> bool:
+        """Update token prices from the shared ticker table or the ticker stream. False if neither is usable."""
+        stream = self.ticker_stream
+        stream_live: bool = stream is not None and stream.is_live()
+        shared_prices = self._read_shared_prices(keys)
+        # A live subscription keeps our symbols in demand at the proxy, otherwise poll now and then
+        demand_renewed: bool = stream_live or (
+                self._proxy_demand_timer is not None and
+                time.time() - self._proxy_demand_timer < SHARED_TICKERS_KEEPALIVE)
+        if shared_prices is not None and demand_renewed:
+            await self._update_token_prices(shared_prices, last_prices=True, include_custom=include_custom)
+            return True
+
+        if stream_live:
+            await self._update_token_prices(stream.tickers, include_custom=include_custom)
+            return True
+        return False
+
+    async def _fetch_and_update_prices(self) -> None:
+        """Fetch ticker data from CEX and update token prices."""
+        keys: List[str] = self._ticker_keys()
+        if await self._update_from_pushed_prices(keys):
+            return
+
+        self._proxy_demand_timer = time.time()
         try:
-            tickers: Dict = await self.config_manager.ccxt_manager.ccxt_call_fetch_tickers(
-                self.ccxt_i, keys
-            )
-            await self._update_token_prices(tickers)
+            tickers: Dict = await self.config_manager.price_resolver.fetch_tickers(keys)
+            # Nothing resolved for a non-empty request means the fetch failed: keep the current prices
+            if tickers or not keys:
+                await self._update_token_prices(tickers)
         except Exception as e:
             await self.config_manager.error_handler.handle_async(
                 e,
                 context={"stage": "fetch_cex_tickers"}
             )
+        self._start_ticker_stream(keys)
+
+    def _read_shared_prices(self, keys: List[str]) -> Optional[Dict[str, float]]:
+        """
+        Read last prices from the proxy's shared-memory table.
+
+        Returns None (use the RPC path) if the segment does not exist, or if any
+        tradable symbol is missing or older than SHARED_TICKERS_MAX_AGE.
+        """
+        reader = self.shared_tickers
+        if reader is None:
+            now = time.time()
+            if (self._shared_tickers_attach_timer is not None and
+                    now - self._shared_tickers_attach_timer < SHARED_TICKERS_ATTACH_RETRY):
+                return None
+            self._shared_tickers_attach_timer = now
+            reader = self.shared_tickers = SharedTickerReader.attach()
+            if reader is None:
+                return None
+            self.config_manager.general_log.info("Reading CEX prices from the shared ticker table.")
+
+        symbols = [key for key in keys if key in self.ccxt_i.symbols]
+        rows = reader.read(symbols) if symbols else None
+        if not rows or len(rows) != len(symbols):
+            return None
+        oldest_allowed = time.time() - SHARED_TICKERS_MAX_AGE
+        prices: Dict[str, float] = {}
+        for symbol, (last, _, _, updated) in rows.items():
+            if last is None or updated is None or updated < oldest_allowed:
+                return None
+            prices[symbol] = last
+        return prices
+
+    def _start_ticker_stream(self, keys: List[str]) -> None:
+        """Subscribe to the proxy ticker feed once the proxy is up. The stream reconnects on its own."""
+        if self.ticker_stream is not None or not keys:
+            return
+        url: Optional[str] = CCXTManager.proxy_stream_url()
+        if url is None:
+            return
+        self.ticker_stream = TickerStream(url, keys, logger=self.config_manager.general_log,
+                                          client=CCXTManager.PROXY_CLIENT_ID)
+        self.ticker_stream.start()
+
+    async def close(self) -> None:
+        """Stop the ticker subscription and detach from the shared ticker table."""
+        if self.ticker_stream is not None:
+            await self.ticker_stream.close()
+            self.ticker_stream = None
+        if self.shared_tickers is not None:
+            self.shared_tickers.close()
+            self.shared_tickers = None
 
     def _construct_key(self, token: str) -> str:
         """Construct symbol string for CEX API."""
         return f"{token}/USDT" if token == 'BTC' else f"{token}/BTC"
 
-    async def _update_token_prices(self, tickers: Dict) -> None:
+    async def _update_token_prices(self, tickers: Dict, last_prices: bool = False,
+                                   include_custom: bool = True) -> None:
         """
         Update token prices from ticker data and custom coin configurations.
         
         Args:
             tickers: Dictionary of symbol to ticker data
+            last_prices: True if ``tickers`` maps symbols directly to their last price
+            include_custom: False to leave custom coins (priced by their own request) as they are
         """
-        lastprice_string: str = self._get_last_price_string()
+        lastprice_string: Optional[str] = None if last_prices else self._get_last_price_string()
         # BTC first, then others
         symbols_to_update: List[Tuple[str, Token]] = sorted(
             self.tokens_dict.items(),
@@ -285,6 +549,9 @@ class PriceHandler:
                         context={"token": token_symbol, "symbol": symbol}
                     )
 
+        if not include_custom:
+            return
+
         # Process custom coins
         custom_tokens: Set[str] = set(vars(self.config_manager.config_coins.usd_ticker_custom))
         for token in custom_tokens:
@@ -301,17 +568,13 @@ class PriceHandler:
 
     def _get_last_price_string(self) -> str:
         """Get exchange-specific field name for last price."""
-        exchange_map: Dict[str, str] = {
-            "kucoin": "last",
-            "binance": "lastPrice"
-        }
-        return exchange_map.get(self.config_manager.my_ccxt.id, "lastTradeRate")
+        return last_price_key(self.config_manager.my_ccxt.id)
 
     def _update_token_price(
             self,
             tickers: Dict,
             symbol: str,
-            price_key: str,
+            price_key: Optional[str],
             token_data: Token
     ) -> None:
         """
@@ -320,11 +583,13 @@ class PriceHandler:
         Args:
             tickers: Dictionary of symbol to ticker data
             symbol: Trading symbol to look up
-            price_key: Exchange-specific field containing last price
+            price_key: Exchange-specific field containing last price, None if
+                ``tickers`` already holds last prices
             token_data: Token instance to update
         """
         if symbol in tickers:
-            last_price: float = float(tickers[symbol]['info'][price_key])
+            ticker = tickers[symbol]
+            last_price: float = float(ticker) if price_key is None else ticker_last_price(ticker, price_key)
             if token_data.symbol == 'BTC':
                 token_data.cex.usd_price = last_price
                 token_data.cex.cex_price = 1.0
@@ -355,6 +620,8 @@ class MainController:
         self.ccxt_i: ccxt.Exchange = config_manager.my_ccxt
         self.config_coins: Any = config_manager.config_coins
         self.disabled_coins: List[str] = []
+        # Per-cycle dxGetMyOrders result indexed by order id, consumed by DexPair.check_order_status
+        self.order_snapshot: Dict[str, Dict[str, Any]] = {}
         self.http_session: Optional[aiohttp.ClientSession] = None
         self.shutdown_event: asyncio.Event = asyncio.Event()
         self._http_session_owner: bool = False
@@ -366,12 +633,17 @@ class MainController:
             self.tokens_dict, self.config_manager, loop
         )
         self.processor: TradingProcessor = TradingProcessor(self)
+        self.scheduler: PairScheduler = PairScheduler()
         # Pass controller reference to strategy
         self.config_manager.strategy_instance.controller = self
 
     async def main_init_loop(self) -> None:
         """Initialization loop executed before main trading starts."""
         try:
+            # Exchange markets (symbols) are needed by price updates and pair checks
+            if self.ccxt_i is not None:
+                await self.config_manager.ccxt_manager.ensure_markets(self.ccxt_i)
+
             # Read addresses for enabled tokens
             token_init_futures: List[asyncio.Task] = [
                 token.dex.read_address()
@@ -407,30 +679,133 @@ class MainController:
                 await self.config_manager.error_handler.handle_async(e, context={"component": "main_init_loop"})
             raise
 
-    async def main_loop(self) -> None:
-        """Main trading loop executed repeatedly at configured intervals."""
+    async def main_loop(self, scheduled: bool = False) -> None:
+        """
+        Main trading loop executed repeatedly at configured intervals.
+
+        Args:
+            scheduled: If False, every pair is processed. If True, only pairs that
+                are due in the scheduler (including those woken by price, order
+                status or balance events during this call) are processed and then
+                rescheduled with their own interval.
+        """
         try:
             start_time: float = time.perf_counter()
-            await self.balance_manager.update_balances()
-            await self.price_handler.update_ccxt_prices()
+            await self._timed("balances", self.balance_manager.update_balances())
+            await self._timed("cex_prices", self.price_handler.update_ccxt_prices())
 
             price_futures: List[asyncio.Task] = []
             strategy = self.config_manager.strategy_instance
-            for pair in self.pairs_dict.values():
+            for name, pair in self.pairs_dict.items():
                 if self.shutdown_event.is_set():
                     return
                 if strategy.should_update_cex_prices():
-                    price_futures.append(pair.cex.update_pricing())
+                    price_futures.append(self._timed("pair_pricing", pair.cex.update_pricing(), pair=name))
             if price_futures:
                 await asyncio.gather(*price_futures)
 
-            await self.processor.process_pairs(strategy.safe_thread_loop)
-            self._report_time(start_time)
+            await self._timed("order_snapshot", self.refresh_order_snapshot())
+            if not scheduled:
+                await self.processor.process_pairs(strategy.safe_thread_loop)
+                self._report_time(start_time)
+                return
+
+            self._wake_pairs_on_events()
+            due_pairs: List[str] = self.scheduler.pop_due()
+            if due_pairs:
+                try:
+                    await self.processor.process_pairs(strategy.safe_thread_loop, due_pairs)
+                finally:
+                    # Popped pairs must be put back even if processing fails, or they stop trading
+                    self.schedule_pairs(due_pairs)
+                self._report_time(start_time)
         except Exception as e:
             context: Dict = {"component": "main_loop"}
             if self.config_manager:
                 await self.config_manager.error_handler.handle_async(e, context=context)
 
+    def schedule_pairs(self, pair_names: Optional[List[str]] = None) -> None:
+        """Schedule pairs (all if None) to run after their strategy-defined interval."""
+        strategy = self.config_manager.strategy_instance
+        for name in (self.pairs_dict if pair_names is None else pair_names):
+            pair = self.pairs_dict.get(name)
+            if pair is not None:
+                self.scheduler.schedule(name, strategy.get_pair_interval(pair))
+
+    async def watch_tick(self) -> bool:
+        """
+        Cheap check between full refreshes: re-price pairs from pushed CEX prices
+        (shared ticker table or ticker stream, no RPC) and wake those whose price
+        moved past tolerance.
+
+        Balances and order status are only read by the full refresh in main_loop.
+
+        Returns:
+            True if a pair was woken; the caller then runs a scheduled main_loop for it.
+        """
+        if not await self.price_handler.update_pushed_prices():
+            return False
+        await asyncio.gather(*(pair.cex.update_pricing() for pair in self.pairs_dict.values()))
+        return self._wake_pairs_on_events(price_only=True)
+
+    def _wake_pairs_on_events(self, price_only: bool = False) -> bool:
+        """
+        Move pairs forward in the schedule when their price, order status or balances changed.
+
+        Args:
+            price_only: Only check prices, e.g. when balances and order snapshot were not refreshed.
+
+        Returns:
+            True if any pair was woken.
+        """
+        changed_tokens = set() if price_only else self.balance_manager.changed_tokens
+        order_snapshot = {} if price_only else self.order_snapshot
+        woken = False
+        for name, pair in self.pairs_dict.items():
+            if pair.disabled or name not in self.scheduler:
+                continue
+            dex = pair.dex
+            order = dex.order if isinstance(dex.order, dict) else None
+            reason = None
+            if pair.t1.symbol in changed_tokens or pair.t2.symbol in changed_tokens:
+                reason = "balance changed"
+            elif order and order.get('id') in order_snapshot and \
+                    order_snapshot[order['id']].get('status') != order.get('status'):
+                reason = "order status changed"
+            elif order and isinstance(dex.current_order, VirtualOrder) and dex.current_order.org_pprice and \
+                    pair.cex.price and not dex.check_price_in_range():
+                reason = "price moved past tolerance"
+            if reason and self.scheduler.wake(name):
+                woken = True
+                self.config_manager.general_log.debug(f"{name}: rescheduled early, {reason}.")
+        return woken
+
+    async def refresh_order_snapshot(self) -> None:
+        """
+        Fetch the status of all own orders with a single dxGetMyOrders call.
+
+        The snapshot replaces one dxGetOrder per active pair. It is only
+        fetched when at least one pair has an order on the DEX; on failure the
+        snapshot is left empty and pairs fall back to dxGetOrder.
+        """
+        self.order_snapshot = {}
+        if not any(pair.dex_enabled and isinstance(pair.dex.order, dict) and 'id' in pair.dex.order
+                   for pair in self.pairs_dict.values() if not pair.disabled):
+            return
+        try:
+            myorders = await self.config_manager.xbridge_manager.getmyorders()
+        except Exception as e:
+            await self.config_manager.error_handler.handle_async(e, context={"component": "order_snapshot"})
+            return
+        if isinstance(myorders, list):
+            self.order_snapshot = {order['id']: order for order in myorders
+                                   if isinstance(order, dict) and 'id' in order}
+
+    async def _timed(self, stage: str, coro, **labels) -> Any:
+        """Await ``coro`` and record its duration in the ``stage`` histogram."""
+        with metrics.timer("stage", stage=stage, strategy=self.config_manager.strategy, **labels):
+            return await coro
+
     def _report_time(self, start_time: float) -> None:
         """
         Log operation execution time.
@@ -440,6 +815,7 @@ class MainController:
         """
         end_time: float = time.perf_counter()
         duration: float = end_time - start_time
+        metrics.observe("stage", duration, stage="cycle", strategy=self.config_manager.strategy)
         self.config_manager.general_log.info(f'Operation took {duration:0.2f} second(s) to complete.')
 
     async def close_http_session(self) -> None:
@@ -454,6 +830,13 @@ class MainController:
         self._http_session_owner = False
 
 
+def start_metrics_endpoint(config_manager: 'ConfigManager') -> None:
+    """Serve timing histograms on config_xbridge.metrics_port, once per process (0 disables it)."""
+    port = getattr(config_manager.config_xbridge, 'metrics_port', 0)
+    if isinstance(port, int) and not isinstance(port, bool) and port > 0:
+        MetricsServer.start(port, logger=config_manager.general_log)
+
+
 def run_async_main(config_manager: 'ConfigManager', startup_tasks: Optional[List[Callable]] = None) -> None:
     """
     Run main application loop with proper signal handling and cleanup.
@@ -472,6 +855,7 @@ def run_async_main(config_manager: 'ConfigManager', startup_tasks: Optional[List
             controller = MainController(config_manager, loop)
             config_manager.controller = controller
             config_manager.strategy_instance.is_running = True
+            start_metrics_endpoint(config_manager)
             await main(config_manager, loop, startup_tasks)
         except (SystemExit, asyncio.CancelledError):
             config_manager.general_log.info("Received stop signal. Initiating coordinated shutdown...")
@@ -545,9 +929,15 @@ async def main(
                 f"for {config_manager.strategy} strategy."
             )
 
+            # Pairs may override the interval and are woken early on events. Full
+            # refreshes run when a pair is due; watch ticks in between only check
+            # pushed CEX prices, and run a cycle if that woke a pair.
+            watch_interval: Optional[float] = strategy.get_watch_interval()
+
             flush_timer: float = time.time()
             await controller.main_loop()  # Initial run
-            operation_timer: float = time.time()
+            controller.schedule_pairs()
+            watch_timer: float = time.time()
 
             while not controller.shutdown_event.is_set():
                 current_time: float = time.time()
@@ -558,10 +948,14 @@ async def main(
                     await xbm.dxflushcancelledorders()
                     flush_timer = current_time
 
-                sleep_needed: float = operation_interval - (current_time - operation_timer)
-                if sleep_needed <= 0:
-                    await controller.main_loop()
-                    operation_timer = current_time
+                next_due: Optional[float] = controller.scheduler.next_due_in()
+                if next_due is not None and next_due <= 0:
+                    await controller.main_loop(scheduled=True)
+                    watch_timer = current_time
+                elif watch_interval is not None and current_time - watch_timer >= watch_interval:
+                    watch_timer = current_time
+                    if await controller.watch_tick():
+                        await controller.main_loop(scheduled=True)
 
                 # Short sleep while checking for shutdown
                 try:
@@ -572,7 +966,9 @@ async def main(
                 except asyncio.TimeoutError:
                     pass  # Normal timeout between operations
         finally:
+            await controller.price_handler.close()
             await controller.close_http_session()
+            await config_manager.ccxt_manager.close_loop_exchanges()
     except (asyncio.CancelledError, KeyboardInterrupt):
         config_manager.general_log.info("Main task cancelled. Preparing for shutdown...")
         raise
@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from definitions.order_journal import JOURNAL_FILE, OrderJournal
+
+try:
+    import sqlite3
+except ImportError:  # Some embedded/minimal Python builds ship without it
+    sqlite3 = None
+
+STORE_FILE = "state.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    status TEXT,
+    timestamp REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_status ON records (namespace, status, timestamp);
+CREATE INDEX IF NOT EXISTS records_timestamp ON records (namespace, timestamp);
+"""
+
+
+def open_state_store(root_dir: str):
+    """The process-wide state store under ``<root_dir>/data``: SQLite, or the JSON-lines journal without sqlite3."""
+    if sqlite3 is None:
+        return OrderJournal.for_root(root_dir)
+    return SqliteStateStore.for_root(root_dir)
+
+
+class SqliteStateStore:
+    """SQLite (WAL mode) store of bot state records: order history, trade states and their archives.
+
+    Same interface as OrderJournal: JSON values addressed by ``namespace``/``key``. The
+    ``status`` and ``timestamp`` fields of dict values are also kept in indexed columns, so
+    ``find`` (e.g. trades by status, archive entries by date) is an index lookup. One
+    connection per database file is shared by the whole process. On first use, the records
+    of an existing ``order_journal.jsonl`` next to the database are imported into it.
+    """
+
+    _instances: Dict[str, 'SqliteStateStore'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.RLock()
+        self._conn = None
+
+    @classmethod
+    def for_root(cls, root_dir: str, **kwargs) -> 'SqliteStateStore':
+        """The process-wide store under ``<root_dir>/data``. Opened lazily on first use."""
+        path = os.path.join(root_dir, "data", STORE_FILE)
+        with cls._instances_lock:
+            store = cls._instances.get(path)
+            if store is None:
+                store = cls._instances[path] = cls(path, **kwargs)
+        return store
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._instances_lock:
+            stores = list(cls._instances.values())
+        for store in stores:
+            store.close()
+
+    # --- Reads ---
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM records WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT key, value FROM records WHERE namespace = ? ORDER BY timestamp", (namespace,)).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def find(self, namespace: str, status: Optional[str] = None, since: Optional[float] = None,
+             until: Optional[float] = None) -> Dict[str, Any]:
+        """Records of ``namespace`` with this ``status`` and/or ``timestamp`` range, oldest first."""
+        query = "SELECT key, value FROM records WHERE namespace = ?"
+        params = [namespace]
+        if status is not None:
+            query += " AND status = ?"
+            params.append(status)
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND timestamp < ?"
+            params.append(until)
+        with self._lock:
+            rows = self._connect().execute(query + " ORDER BY timestamp", params).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    # --- Writes ---
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        row = self._row(namespace, key, value)
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO records (namespace, key, status, timestamp, value) VALUES (?, ?, ?, ?, ?)", row)
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM records WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM records WHERE namespace = ?", (namespace,))
+
+    def sync(self) -> None:
+        """Checkpoint the WAL into the database file (commits are otherwise durable up to the last checkpoint
+        on power loss, and always on a process crash)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Internals ---
+
+    @staticmethod
+    def _row(namespace: str, key: str, value: Any):
+        status = timestamp = None
+        if isinstance(value, dict):
+            status = value.get('status')
+            timestamp = value.get('timestamp')
+        if not isinstance(status, str):
+            status = None
+        if not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+            timestamp = time.time()
+        return namespace, key, status, float(timestamp), json.dumps(value, separators=(",", ":"), default=str)
+
+    def _connect(self):
+        if self._conn is not None:
+            return self._conn
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Autocommit: every write is its own transaction unless wrapped in BEGIN/COMMIT
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+        self._import_journal()
+        return conn
+
+    def _import_journal(self) -> None:
+        journal_path = os.path.join(os.path.dirname(self.path), JOURNAL_FILE)
+        if not os.path.exists(journal_path):
+            return
+        journal = OrderJournal(journal_path, logger=self.logger)
+        rows = [self._row(namespace, key, value)
+                for namespace in journal.namespaces()
+                for key, value in journal.items(namespace).items()]
+        journal.close()
+        self._conn.execute("BEGIN")
+        try:
+            # Records already in the database are newer than the journal's
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO records (namespace, key, status, timestamp, value) VALUES (?, ?, ?, ?, ?)",
+                rows)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        os.replace(journal_path, journal_path + ".imported")
+        self.logger.info(f"Imported {len(rows)} records from {journal_path} into {self.path}")
+
+
+if sqlite3 is not None:
+    import atexit
+
+    atexit.register(SqliteStateStore.close_all)
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import logging
+from time import monotonic
+from typing import Dict, Iterable, Optional
+
+import aiohttp
+
+
+class TickerStream:
+    """WebSocket subscription to the CCXT proxy ticker feed.
+
+    Subscribes once to a fixed symbol set, then applies the deltas pushed by the
+    proxy after each of its refreshes. ``is_live()`` turns False when the socket
+    drops or nothing was received for ``stale_after`` seconds (the proxy sends a
+    message, possibly empty, after every refresh), so callers can fall back to
+    polling. Reconnects in the background.
+    """
+
+    RECONNECT_DELAY = 5.0
+    STALE_AFTER = 60.0
+
+    def __init__(self, url: str, symbols: Iterable[str], logger: Optional[logging.Logger] = None,
+                 stale_after: float = STALE_AFTER, reconnect_delay: float = RECONNECT_DELAY,
+                 client: Optional[str] = None):
+        self.url = url
+        self.symbols = sorted(set(symbols))
+        self.client = client  # Requester id reported to the proxy, shared with our RPC polls
+        self.logger = logger or logging.getLogger(__name__)
+        self.stale_after = stale_after
+        self.reconnect_delay = reconnect_delay
+        self.tickers: Dict[str, Dict] = {}
+        self.version = 0  # Bumped whenever tickers change
+        self._received_at: Optional[float] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def is_live(self) -> bool:
+        received_at = self._received_at
+        return received_at is not None and monotonic() - received_at < self.stale_after
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._received_at = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._consume()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.debug(f"Ticker stream {self.url} disconnected: {e}")
+            self._received_at = None
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _consume(self) -> None:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        async with self._session.ws_connect(self.url, heartbeat=30) as ws:
+            request = {"method": "subscribe", "params": self.symbols}
+            if self.client:
+                request["client"] = self.client
+            await ws.send_json(request)
+            async for msg in ws:
+                if msg.type == aiohttp.WSMsgType.TEXT:
+                    self._apply(json.loads(msg.data))
+                elif msg.type == aiohttp.WSMsgType.ERROR:
+                    break
+
+    def _apply(self, message: Dict) -> None:
+        if message.get("method") != "tickers":
+            if "error" in message:
+                self.logger.warning(f"Ticker stream error: {message['error']}")
+            return
+        tickers = message.get("params") or {}
+        if message.get("snapshot"):
+            self.tickers = dict(tickers)
+            self.version += 1
+        elif tickers:
+            # Copy-on-write so readers never see a half-applied delta
+            self.tickers = {**self.tickers, **tickers}
+            self.version += 1
+        if self.tickers:
+            self._received_at = monotonic()
@@ -1,9 +1,12 @@
 import time
+from typing import Optional
 
 import aiohttp
 import yaml
 
 from definitions.errors import OperationalError
+from definitions.file_io import run_file_io
+from definitions.price_resolver import last_price_key, ticker_last_price
 from definitions.rpc import rpc_call
 
 
@@ -95,9 +98,8 @@ class DexToken:
 
         file_path = self._get_address_file_path()
         try:
-            with open(file_path, 'r') as fp:
-                data = yaml.safe_load(fp)
-                self.address = data.get('address') if isinstance(data, dict) else None
+            data = await run_file_io(self._load_address_file, file_path)
+            self.address = data.get('address') if isinstance(data, dict) else None
         except FileNotFoundError:
             self.token.config_manager.general_log.info(f"File not found: {file_path}")
             await self.request_addr()
@@ -118,14 +120,23 @@ class DexToken:
 
         file_path = self._get_address_file_path()
         try:
-            with open(file_path, 'w') as fp:
-                yaml.safe_dump({'address': self.address}, fp)
+            await run_file_io(self._dump_address_file, file_path, self.address)
         except (yaml.YAMLError, Exception) as e:
             await self.token.config_manager.error_handler.handle_async(
                 OperationalError(f"Error writing token address file: {str(e)}"),
                 context={"token": self.token.symbol, "stage": "write_address", "file_path": file_path}
             )
 
+    @staticmethod
+    def _load_address_file(file_path: str):
+        with open(file_path, 'r') as fp:
+            return yaml.safe_load(fp)
+
+    @staticmethod
+    def _dump_address_file(file_path: str, address: Optional[str]) -> None:
+        with open(file_path, 'w') as fp:
+            yaml.safe_dump({'address': address}, fp)
+
     async def request_addr(self) -> None:
         """Request new DEX wallet address from XBridge manager."""
         try:
@@ -176,20 +187,16 @@ class CexToken:
             return
 
         cex_symbol = "BTC/USDT" if self.token.symbol == "BTC" else f"{self.token.symbol}/BTC"
-        lastprice_string = {
-            'kucoin': 'last',
-            'binance': 'lastPrice'
-        }.get(self.token.config_manager.my_ccxt.id, 'lastTradeRate')
+        lastprice_string = last_price_key(self.token.config_manager.my_ccxt.id)
 
         async def fetch_ticker_async(cex_symbol: str) -> float | None:
-            """Fetch ticker from CEX. Retry logic is handled by ccxt_manager.
+            """Fetch ticker through the batching price resolver. Retry logic is handled by ccxt_manager.
             
             Returns:
                 Price float on success, None on failure
             """
             try:
-                ticker = await self.token.config_manager.ccxt_manager.ccxt_call_fetch_ticker(
-                    self.token.config_manager.my_ccxt, cex_symbol)
+                ticker = await self.token.config_manager.price_resolver.fetch_ticker(cex_symbol)
             except Exception as e:
                 await self.token.config_manager.error_handler.handle_async(
                     OperationalError(f"Error fetching ticker: {str(e)}"),
@@ -201,7 +208,7 @@ class CexToken:
                 return None
 
             try:
-                return float(ticker['info'][lastprice_string])
+                return ticker_last_price(ticker, lastprice_string)
             except (KeyError, TypeError, ValueError) as e:
                 await self.token.config_manager.error_handler.handle_async(
                     OperationalError(f"Malformed ticker response: {str(e)}"),
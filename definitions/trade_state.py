@@ -2,14 +2,20 @@ import json
 import os
 import shutil
 import time
-from typing import List, Dict, Any, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from strategies.arbitrage_strategy import ArbitrageStrategy
 
 
 class TradeState:
-    """Manages the state of an arbitrage trade for persistence and recovery."""
+    """Manages the state of an arbitrage trade for persistence and recovery.
+
+    States are records of the process-wide state store (``config_manager.state_store``),
+    keyed by check_id; archived states go to the ``<namespace>/archive`` namespace. One JSON
+    file per check_id in ``state_dir`` is how earlier versions stored them: such files are
+    still resumed, and removed once the trade is deleted or archived.
+    """
 
     def __init__(self, strategy: 'ArbitrageStrategy', check_id: str):
         self.strategy = strategy
@@ -17,7 +23,7 @@ class TradeState:
         self.check_id = check_id
         self.log_prefix = self.check_id if self.strategy.test_mode else self.check_id[:8]
         self.state_dir = self._get_state_dir(self.strategy)
-        os.makedirs(self.state_dir, exist_ok=True)
+        self.namespace = os.path.basename(self.state_dir)
         self.state_file_path = os.path.join(self.state_dir, f"{self.check_id}.json")
         self.state_data = {'check_id': self.check_id}
 
@@ -28,58 +34,82 @@ class TradeState:
         return os.path.join(strategy.config_manager.ROOT_DIR, "data", dir_name)
 
     def save(self, status: str, data: Dict[str, Any]):
-        """Saves the current state to a file."""
+        """Saves the current state to the state store."""
         self.state_data['status'] = status
         self.state_data['timestamp'] = time.time()
         self.state_data.update(data)
         try:
-            with open(self.state_file_path, 'w') as f:
-                json.dump(self.state_data, f, indent=4)
-            self.config_manager.general_log.debug(
-                f"[{self.log_prefix}] Saved state '{status}' to {self.state_file_path}")
+            self.config_manager.state_store.put(self.namespace, self.check_id, self.state_data)
+            self.config_manager.general_log.debug(f"[{self.log_prefix}] Saved state '{status}'")
         except Exception as e:
             self.config_manager.general_log.error(f"[{self.log_prefix}] Failed to save state: {e}")
 
+    def load(self) -> Optional[Dict[str, Any]]:
+        """The stored state of this trade, or None once it was deleted or archived."""
+        state = self.config_manager.state_store.get(self.namespace, self.check_id)
+        if state is None and os.path.exists(self.state_file_path):
+            with open(self.state_file_path, 'r') as fp:
+                state = json.load(fp)
+        return state
+
     def delete(self):
-        """Deletes the state file upon successful completion."""
+        """Deletes the state upon successful completion."""
+        self.config_manager.state_store.delete(self.namespace, self.check_id)
         if os.path.exists(self.state_file_path):
             os.remove(self.state_file_path)
-            self.config_manager.general_log.info(f"[{self.log_prefix}] Trade complete. Removed state file.")
+        self.config_manager.general_log.info(f"[{self.log_prefix}] Trade complete. Removed state.")
 
     def archive(self, reason: str):
-        """Archives the state file for manual review."""
-        if not os.path.exists(self.state_file_path):
+        """Archives the state for manual review."""
+        store = self.config_manager.state_store
+        state = store.get(self.namespace, self.check_id)
+        if state is None and not os.path.exists(self.state_file_path):
             return
-        archive_dir = os.path.join(self.state_dir, "archive")
-        os.makedirs(archive_dir, exist_ok=True)
-        archive_filename = f"{self.check_id}-{reason}-{int(time.time())}.json"
-        archive_path = os.path.join(archive_dir, archive_filename)
+        archive_key = f"{self.check_id}-{reason}-{int(time.time())}"
         try:
-            shutil.move(self.state_file_path, archive_path)
-            self.config_manager.general_log.warning(f"[{self.log_prefix}] Archived state file to {archive_path}")
+            if state is not None:
+                store.put(f"{self.namespace}/archive", archive_key, {**state, 'archive_reason': reason})
+                store.delete(self.namespace, self.check_id)
+            if os.path.exists(self.state_file_path):
+                archive_dir = os.path.join(self.state_dir, "archive")
+                os.makedirs(archive_dir, exist_ok=True)
+                shutil.move(self.state_file_path, os.path.join(archive_dir, f"{archive_key}.json"))
+            self.config_manager.general_log.warning(f"[{self.log_prefix}] Archived state as {archive_key}")
         except OSError as e:
-            self.config_manager.general_log.error(f"[{self.log_prefix}] Failed to archive state file: {e}")
+            self.config_manager.general_log.error(f"[{self.log_prefix}] Failed to archive state: {e}")
+
+    @classmethod
+    def get_archived_trades(cls, strategy: 'ArbitrageStrategy', status: Optional[str] = None,
+                            since: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Archived states by archive key (``<check_id>-<reason>-<time>``), optionally only those
+        left in ``status`` and last saved at or after ``since``."""
+        namespace = os.path.basename(cls._get_state_dir(strategy))
+        return strategy.config_manager.state_store.find(f"{namespace}/archive", status=status, since=since)
 
     @classmethod
     def get_unfinished_trades(cls, strategy: 'ArbitrageStrategy') -> List[Dict[str, Any]]:
-        """Scans for and loads any unfinished trade states."""
+        """Loads any unfinished trade states."""
         state_dir = cls._get_state_dir(strategy)
-        if not os.path.exists(state_dir):
-            return []
-        unfinished_trades = []
-        unfinished_files = [os.path.join(state_dir, f) for f in os.listdir(state_dir) if f.endswith('.json')]
-        for f_path in unfinished_files:
-            try:
-                with open(f_path, 'r') as fp:
-                    unfinished_trades.append(json.load(fp))
-            except json.JSONDecodeError:
-                strategy.config_manager.general_log.error(f"Corrupted state file found and skipped: {f_path}")
-        return unfinished_trades
+        trades = strategy.config_manager.state_store.items(os.path.basename(state_dir))
+        if os.path.isdir(state_dir):
+            for name in os.listdir(state_dir):
+                if not name.endswith('.json') or name[:-len('.json')] in trades:
+                    continue
+                f_path = os.path.join(state_dir, name)
+                try:
+                    with open(f_path, 'r') as fp:
+                        trades[name[:-len('.json')]] = json.load(fp)
+                except json.JSONDecodeError:
+                    strategy.config_manager.general_log.error(f"Corrupted state file found and skipped: {f_path}")
+        return list(trades.values())
 
     @classmethod
     def cleanup_all_states(cls, strategy: 'ArbitrageStrategy'):
         """For testing purposes, clears all active and archived states."""
         state_dir = cls._get_state_dir(strategy)
+        namespace = os.path.basename(state_dir)
+        strategy.config_manager.state_store.clear(namespace)
+        strategy.config_manager.state_store.clear(f"{namespace}/archive")
         if os.path.exists(state_dir):
             shutil.rmtree(state_dir)
         os.makedirs(state_dir, exist_ok=True)
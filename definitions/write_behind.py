@@ -0,0 +1,135 @@
+import atexit
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Callable, Optional
+
+
+class WriteBehindRecord:
+    """Debounced write-behind of one state store record from a background thread.
+
+    ``submit`` only hands over a snapshot and returns. The writer thread encodes the
+    latest snapshot with ``encode`` and puts it in the store once no newer one arrived
+    for ``delay`` seconds (``max_delay`` at most after the first pending one), so a burst
+    of saves costs a single write. ``submit(..., flush=True)`` writes without waiting and
+    syncs the store, for states that must survive a crash. Pending snapshots are written
+    on ``flush()``/``close()`` and at interpreter exit.
+    """
+
+    DELAY = 0.5
+    MAX_DELAY = 2.0
+
+    _instances = weakref.WeakSet()
+
+    def __init__(self, store, namespace: str, key: str, encode: Callable[[Any], Any] = lambda data: data,
+                 delay: float = DELAY, max_delay: float = MAX_DELAY,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.store = store
+        self.namespace = namespace
+        self.key = key
+        self.encode = encode
+        self.delay = delay
+        self.max_delay = max_delay
+        self.on_error = on_error
+        self.logger = logger or logging.getLogger(__name__)
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # Held while a snapshot is encoded and written
+        self._pending = None
+        self._has_pending = False
+        self._sync = False
+        self._first_at = 0.0
+        self._last_at = 0.0
+        self._submitted = 0
+        self._written = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._instances.add(self)
+
+    def submit(self, snapshot: Any, flush: bool = False) -> None:
+        """Queue ``snapshot`` as the next value of the record, replacing any pending one."""
+        with self._cond:
+            now = time.monotonic()
+            if not self._has_pending:
+                self._first_at = now
+            self._pending = snapshot
+            self._has_pending = True
+            self._sync = self._sync or flush
+            self._last_at = now
+            self._submitted += 1
+            self._closed = False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True,
+                                                name=f"WriteBehind-{self.namespace}/{self.key}")
+                self._thread.start()
+            self._cond.notify_all()
+
+    def discard(self) -> None:
+        """Drop the pending snapshot and wait for a write in progress, e.g. before deleting the record."""
+        with self._cond:
+            self._pending = None
+            self._has_pending = False
+            self._sync = False
+            self._written = self._submitted
+            self._cond.notify_all()
+        with self._write_lock:
+            pass
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write the pending snapshot now and wait until it is stored. False on timeout."""
+        with self._cond:
+            target = self._submitted
+            if self._written >= target:
+                return True
+            self._first_at = self._last_at = float("-inf")  # Due immediately
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @classmethod
+    def flush_all(cls) -> None:
+        for writer in list(cls._instances):
+            writer.close()
+
+    def _due_in(self) -> float:
+        if self._sync:
+            return 0.0
+        now = time.monotonic()
+        return min(self._last_at + self.delay, self._first_at + self.max_delay) - now
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and (not self._has_pending or self._due_in() > 0):
+                    self._cond.wait(self._due_in() if self._has_pending else None)
+                if not self._has_pending:
+                    return  # Closed
+                snapshot, sync, target = self._pending, self._sync, self._submitted
+                self._pending = None
+                self._has_pending = False
+                self._sync = False
+                # Taken before releasing the condition so discard() waits for this write
+                self._write_lock.acquire()
+            try:
+                self.store.put(self.namespace, self.key, self.encode(snapshot))
+                if sync:
+                    self.store.sync()
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(e)
+                else:
+                    self.logger.error(f"Write-behind of {self.namespace}/{self.key} failed: {e}")
+            finally:
+                self._write_lock.release()
+                with self._cond:
+                    self._written = max(self._written, target)
+                    self._cond.notify_all()
+
+
+atexit.register(WriteBehindRecord.flush_all)
@@ -8,21 +8,67 @@ import uuid
 import weakref
 
 from definitions.detect_rpc import detect_rpc
-from definitions.errors import RPCConfigError
+from definitions.errors import RPCConfigError, OperationalError, convert_exception
 from definitions.logger import setup_logging
-from definitions.rpc import rpc_call, is_port_open, AsyncThreadingSemaphore
+from definitions.metrics import metrics
+from definitions.rpc import (rpc_call, rpc_batch_call, is_port_open, RpcLimiter, create_rpc_session,
+                             RpcBatchUnsupportedError)
+from definitions.rpc_cache import RpcCache, copy_result
 
 
 class XBridgeManager:
-    _loops = weakref.WeakSet()
+    # Class-level pool of keep-alive RPC sessions, one per event loop. GUI bots each run
+    # their own loop in a separate thread and aiohttp sessions cannot cross loops.
+    _sessions = weakref.WeakKeyDictionary()
+    _sessions_lock = threading.Lock()
+    RPC_KEEPALIVE_TIMEOUT = 30.0  # Seconds an idle pooled connection is kept open
+    # Read-only methods: identical concurrent calls share one request (single-flight) and
+    # calls issued close together may be coalesced into a single JSON-RPC batch request.
+    READ_ONLY_METHODS = frozenset({
+        "dxGetOrder", "dxGetMyOrders", "dxgetutxos", "dxgetlocaltokens", "dxgettokenbalances", "dxgetorderbook",
+    })
+    BATCHABLE_METHODS = READ_ONLY_METHODS
+    # Per-loop map of (method, params) -> future of the in-flight read shared by all callers
+    _inflight_reads = weakref.WeakKeyDictionary()
+    _read_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+    RPC_BATCH_WINDOW = 0.005  # Default seconds to collect calls before flushing a batch
+    RPC_BATCH_MAX_SIZE = 32  # A full batch is flushed at once instead of waiting for the window
+    # Per-loop queues of calls waiting for the next batch flush
+    _batch_queues = weakref.WeakKeyDictionary()
+    _batch_tasks = set()
+    _batch_supported = True  # Cleared once the node rejects a batch request
     # Class-level attributes for global state, ensuring they are shared across all instances.
     _active_rpc_counter = 0
     _rpc_counter_lock = threading.Lock()
-    _rpc_semaphore = None
-    # Class-level UTXO cache and lock for thread-safe access
-    _utxo_cache = {}
-    _utxo_cache_lock = threading.Lock()
-    UTXO_CACHE_DURATION = 3.0  # Cache expiration time in seconds
+    _rpc_limiter = None
+    # Limiter priorities (lower is served first): order cancels and status checks go ahead
+    # of balance reads, which go ahead of bulk orderbook polling.
+    RPC_PRIORITIES = {
+        "dxCancelOrder": 0,
+        "dxflushcancelledorders": 0,
+        "dxGetOrder": 1,
+        "dxMakeOrder": 1,
+        "dxMakePartialOrder": 1,
+        "dxTakeOrder": 1,
+        "dxgetorderbook": 3,
+    }
+    RPC_PRIORITY_DEFAULT = 2
+    # Class-level TTL cache for read-only methods, shared by all instances and threads.
+    # Defaults are overridden by rpc_cache_ttl / rpc_cache_max_entries in config_xbridge.yaml.
+    _rpc_cache = None
+    _rpc_cache_lock = threading.Lock()
+    RPC_CACHE_TTL_DEFAULTS = {
+        "dxgetutxos": 3.0,
+        "dxgetlocaltokens": 30.0,
+        "dxgettokenbalances": 3.0,
+        "dxGetMyOrders": 2.0,
+        "dxgetorderbook": 2.0,
+        "dxGetOrder": 1.0,
+    }
+    RPC_CACHE_MAX_ENTRIES = 512
+    WRITE_METHODS = frozenset({
+        "dxMakeOrder", "dxMakePartialOrder", "dxCancelOrder", "dxTakeOrder", "dxflushcancelledorders",
+    })
     # Class-level cache for RPC config to avoid re-detecting on each instantiation
     _rpc_config = None
     _rpc_config_lock = threading.Lock()
@@ -36,6 +82,20 @@ class XBridgeManager:
         """Provides read-only access to the shared RPC counter."""
         return XBridgeManager._active_rpc_counter
 
+    def rpc_stats(self):
+        """Snapshot of shared RPC metrics (limiter queue depth and wait times)."""
+        limiter = XBridgeManager._rpc_limiter
+        with XBridgeManager._rpc_counter_lock:
+            reads = dict(XBridgeManager._read_stats)
+        cache = XBridgeManager._rpc_cache
+        return {"limiter": limiter.stats() if limiter else None, "reads": reads,
+                "cache": cache.stats() if cache else None}
+
+    @staticmethod
+    def _count_read(stat):
+        with XBridgeManager._rpc_counter_lock:
+            XBridgeManager._read_stats[stat] += 1
+
     def __init__(self, config_manager):
         self.config_manager = config_manager
         strategy = self.config_manager.strategy if hasattr(config_manager, 'strategy') else 'no_strat'
@@ -56,14 +116,26 @@ class XBridgeManager:
         self.xbridge_conf = None
         self.xbridge_fees_estimate = {}
 
-        # Initialize shared semaphore only once
-        if XBridgeManager._rpc_semaphore is None:
-            max_tasks = 5
-            try:
-                max_tasks = self.config_manager.config_xbridge.max_concurrent_tasks
-            except AttributeError:
-                self.logger.info(f"Falling back to default max_concurrent_tasks ({max_tasks})")
-            XBridgeManager._rpc_semaphore = AsyncThreadingSemaphore(max_tasks)
+        self.max_concurrent_tasks = 5
+        try:
+            self.max_concurrent_tasks = self.config_manager.config_xbridge.max_concurrent_tasks
+        except AttributeError:
+            self.logger.info(f"Falling back to default max_concurrent_tasks ({self.max_concurrent_tasks})")
+
+        self.rpc_batch_window = XBridgeManager.RPC_BATCH_WINDOW
+        batch_window = getattr(getattr(self.config_manager, 'config_xbridge', None), 'rpc_batch_window', None)
+        if isinstance(batch_window, (int, float)) and not isinstance(batch_window, bool):
+            self.rpc_batch_window = max(0.0, float(batch_window))
+
+        # Initialize shared limiter only once
+        if XBridgeManager._rpc_limiter is None:
+            XBridgeManager._rpc_limiter = RpcLimiter(self.max_concurrent_tasks)
+
+        # Initialize shared read cache only once
+        if XBridgeManager._rpc_cache is None:
+            with XBridgeManager._rpc_cache_lock:
+                if XBridgeManager._rpc_cache is None:
+                    XBridgeManager._rpc_cache = self._build_rpc_cache()
 
         # Check if RPC port is open (synchronous check)
         if not is_port_open("127.0.0.1", self.blocknet_port_rpc):
@@ -91,7 +163,87 @@ class XBridgeManager:
         # Only run test if port is actually open and we're not in main thread
         if (threading.current_thread() is not threading.main_thread() and is_port_open("127.0.0.1",
                                                                                        self.blocknet_port_rpc)):
-            asyncio.run(self.async_test_rpc())
+            asyncio.run(self._startup_rpc_test())
+
+    async def _startup_rpc_test(self):
+        """Run the connection test on a throwaway loop and release its pooled session."""
+        try:
+            await self.async_test_rpc()
+        finally:
+            await self.close_session()
+
+    def _build_rpc_cache(self):
+        """Create the read cache from config_xbridge.yaml, falling back to the class defaults."""
+        config_xbridge = getattr(self.config_manager, 'config_xbridge', None)
+        ttls = dict(XBridgeManager.RPC_CACHE_TTL_DEFAULTS)
+        configured_ttls = getattr(config_xbridge, 'rpc_cache_ttl', None)
+        for method in ttls:
+            ttl = getattr(configured_ttls, method, None)
+            if isinstance(ttl, (int, float)) and not isinstance(ttl, bool):
+                ttls[method] = float(ttl)
+        max_entries = getattr(config_xbridge, 'rpc_cache_max_entries', None)
+        if not isinstance(max_entries, int) or isinstance(max_entries, bool) or max_entries <= 0:
+            max_entries = XBridgeManager.RPC_CACHE_MAX_ENTRIES
+        return RpcCache(ttls, max_entries=max_entries)
+
+    @staticmethod
+    def _cache_tags(method, params):
+        """Tokens or order ids a cached read depends on, used for targeted invalidation."""
+        if method == "dxgetutxos" and params:
+            return {params[0]}
+        if method == "dxgetorderbook" and len(params) >= 3:
+            return {params[1], params[2]}
+        if method == "dxGetOrder" and params:
+            return {params[0]}
+        return set()
+
+    def _invalidate_after_write(self, method, params):
+        """Drop cached reads that a write call may have made stale."""
+        cache = XBridgeManager._rpc_cache
+        if cache is None:
+            return
+        tokens = None  # None invalidates token-scoped entries for every token
+        if method in ("dxMakeOrder", "dxMakePartialOrder"):
+            if 'dryrun' in params:
+                return
+            if len(params) >= 4:
+                tokens = {params[0], params[3]}
+        elif method in ("dxCancelOrder", "dxTakeOrder") and params:
+            order = cache.peek("dxGetOrder", (params[0],))
+            if isinstance(order, dict) and order.get('maker') and order.get('taker'):
+                tokens = {order['maker'], order['taker']}
+            cache.invalidate("dxGetOrder", {params[0]})
+        elif method == "dxflushcancelledorders":
+            cache.invalidate("dxGetOrder")
+            cache.invalidate("dxGetMyOrders")
+            return
+
+        cache.invalidate("dxGetMyOrders")
+        cache.invalidate("dxgettokenbalances")
+        cache.invalidate("dxgetutxos", tokens)
+        cache.invalidate("dxgetorderbook", tokens)
+
+    def _get_session(self):
+        """Return the pooled RPC session for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with XBridgeManager._sessions_lock:
+            session = XBridgeManager._sessions.get(loop)
+            if session is None or session.closed:
+                session = create_rpc_session(rpc_user=self.blocknet_user_rpc,
+                                             rpc_password=self.blocknet_password_rpc,
+                                             limit=self.max_concurrent_tasks,
+                                             keepalive_timeout=XBridgeManager.RPC_KEEPALIVE_TIMEOUT)
+                XBridgeManager._sessions[loop] = session
+        return session
+
+    async def close_session(self):
+        """Close the pooled RPC session owned by the running event loop, if any."""
+        loop = asyncio.get_running_loop()
+        with XBridgeManager._sessions_lock:
+            session = XBridgeManager._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+            self.logger.debug("Pooled XBridge RPC session closed")
 
     async def rpc_wrapper(self, method, params=None, shutdown_event=None, use_shutdown_event=True):
         """Execute RPC call with context tracking and optional shutdown event"""
@@ -108,16 +260,93 @@ class XBridgeManager:
                 self.logger.debug(f"RPC call to {method} cancelled due to shutdown signal.")
                 return None
 
-        async with XBridgeManager._rpc_semaphore:
+        # Default parameters
+        if params is None:
+            params = []
+
+        if method in XBridgeManager.READ_ONLY_METHODS:
+            return await self._cached_read(method, params, final_shutdown_event)
+        try:
+            return await self._call_single(method, params, final_shutdown_event)
+        finally:
+            if method in XBridgeManager.WRITE_METHODS:
+                self._invalidate_after_write(method, params)
+
+    async def _cached_read(self, method, params, shutdown_event):
+        """Serve a read-only call from the TTL cache, or fetch it and cache successful results."""
+        cache = XBridgeManager._rpc_cache
+        if cache is None or not cache.is_cacheable(method):
+            return await self._single_flight_read(method, params, shutdown_event)
+        try:
+            key_params = tuple(params)
+            hit, value = cache.get(method, key_params)
+        except TypeError:
+            return await self._single_flight_read(method, params, shutdown_event)
+        if hit:
+            XBridgeManager._count_read("hits")
+            return value
+
+        generation = cache.generation
+        result = await self._single_flight_read(method, params, shutdown_event)
+        if result is not None and not (isinstance(result, dict) and 'error' in result):
+            cache.set(method, key_params, result, tags=self._cache_tags(method, params), generation=generation)
+        return result
+
+    async def _single_flight_read(self, method, params, shutdown_event):
+        """Share one in-flight request between concurrent identical read-only calls on this loop."""
+        try:
+            key = (method, tuple(params))
+            hash(key)
+        except TypeError:
+            return await self._dispatch_read(method, params, shutdown_event)
+
+        loop = asyncio.get_running_loop()
+        inflight = XBridgeManager._inflight_reads.setdefault(loop, {})
+        shared = inflight.get(key)
+        if shared is not None:
+            XBridgeManager._count_read("coalesced")
+            # asyncio.wait leaves the shared future untouched if this caller is cancelled
+            await asyncio.wait({shared})
+            if not shared.cancelled():
+                # Followers get their own copy, as cache hits do: the leader's caller may mutate its result
+                return copy_result(shared.result())
+            # The leading call was cancelled; issue our own request instead
+            return await self._dispatch_read(method, params, shutdown_event)
+
+        XBridgeManager._count_read("misses")
+        shared = loop.create_future()
+        inflight[key] = shared
+        try:
+            result = await self._dispatch_read(method, params, shutdown_event)
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except Exception as e:
+            shared.set_exception(e)
+            shared.exception()  # Mark retrieved; followers re-raise it via result()
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            if inflight.get(key) is shared:
+                del inflight[key]
+
+    async def _dispatch_read(self, method, params, shutdown_event):
+        if self.rpc_batch_window > 0 and XBridgeManager._batch_supported:
+            return await self._enqueue_batched(method, params, shutdown_event)
+        return await self._call_single(method, params, shutdown_event)
+
+    async def _call_single(self, method, params, shutdown_event):
+        """Issue one JSON-RPC request under the shared concurrency limit."""
+        priority = XBridgeManager.RPC_PRIORITIES.get(method, XBridgeManager.RPC_PRIORITY_DEFAULT)
+        async with XBridgeManager._rpc_limiter.slot(priority):
             with XBridgeManager._rpc_counter_lock:
                 XBridgeManager._active_rpc_counter += 1
 
             try:
-                # Default parameters
-                if params is None:
-                    params = []
-
-                try:
+                # Only requests sent to the daemon are timed; cache hits and shared reads are counted in rpc_stats
+                with metrics.timer("rpc", method=method):
                     return await rpc_call(
                         method=method,
                         params=params,
@@ -126,17 +355,141 @@ class XBridgeManager:
                         rpc_port=self.blocknet_port_rpc,
                         debug=self.config_manager.config_xbridge.debug_level,
                         logger=self.logger,
-                        session=None,  # Create new session per call
-                        shutdown_event=final_shutdown_event,
+                        session=self._get_session(),
+                        shutdown_event=shutdown_event,
                         error_handler=getattr(self.config_manager, 'error_handler', None)
                     )
-                except Exception as e:
-                    from definitions.errors import convert_exception
-                    raise convert_exception(e) from e
+            except Exception as e:
+                raise convert_exception(e) from e
             finally:
                 with XBridgeManager._rpc_counter_lock:
                     XBridgeManager._active_rpc_counter -= 1
 
+    async def _enqueue_batched(self, method, params, shutdown_event):
+        """Queue a read-only call for the next batch flush on this loop and await its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = XBridgeManager._batch_queues.setdefault(loop, [])
+        queue.append((method, params, shutdown_event, future))
+        if len(queue) == 1:
+            self._start_batch_task(loop, self._flush_batch_after_window(loop, queue))
+        if len(queue) >= XBridgeManager.RPC_BATCH_MAX_SIZE:
+            # Full: send it now; later calls start a new queue with its own window
+            del XBridgeManager._batch_queues[loop]
+            self._start_batch_task(loop, self._flush_queue(queue))
+        return await future
+
+    @staticmethod
+    def _start_batch_task(loop, coro):
+        task = loop.create_task(coro)
+        XBridgeManager._batch_tasks.add(task)
+        task.add_done_callback(XBridgeManager._batch_tasks.discard)
+
+    async def _flush_batch_after_window(self, loop, queue):
+        await asyncio.sleep(self.rpc_batch_window)
+        if XBridgeManager._batch_queues.get(loop) is not queue:
+            return  # Already flushed because it was full
+        del XBridgeManager._batch_queues[loop]
+        await self._flush_queue(queue)
+
+    async def _flush_queue(self, queue):
+        pending = [entry for entry in queue if not entry[3].done()]
+        try:
+            await self._flush_batch(pending)
+        except asyncio.CancelledError:
+            for entry in pending:
+                entry[3].cancel()
+            raise
+
+    async def _flush_batch(self, pending):
+        """Send queued calls as one batch, falling back to single calls where needed."""
+        if not pending:
+            return
+        if len(pending) == 1 or not XBridgeManager._batch_supported:
+            await asyncio.gather(*(self._resolve_single(entry) for entry in pending))
+            return
+
+        responses = None
+        priority = min(XBridgeManager.RPC_PRIORITIES.get(entry[0], XBridgeManager.RPC_PRIORITY_DEFAULT)
+                       for entry in pending)
+        async with XBridgeManager._rpc_limiter.slot(priority):
+            with XBridgeManager._rpc_counter_lock:
+                XBridgeManager._active_rpc_counter += len(pending)
+            try:
+                start_time = time.perf_counter()
+                responses = await rpc_batch_call(
+                    [(method, params) for method, params, _, _ in pending],
+                    rpc_user=self.blocknet_user_rpc,
+                    rpc_password=self.blocknet_password_rpc,
+                    rpc_port=self.blocknet_port_rpc,
+                    session=self._get_session()
+                )
+                # Each batched call waited for the whole round trip
+                elapsed = time.perf_counter() - start_time
+                for method, _, _, _ in pending:
+                    metrics.observe("rpc", elapsed, method=method)
+            except RpcBatchUnsupportedError as e:
+                XBridgeManager._batch_supported = False
+                self.logger.info(f"JSON-RPC batching disabled, node rejected batch request: {e}")
+            except Exception as e:
+                self.logger.debug(f"Batch RPC failed, retrying {len(pending)} call(s) individually: {e}")
+            finally:
+                with XBridgeManager._rpc_counter_lock:
+                    XBridgeManager._active_rpc_counter -= len(pending)
+
+        if responses is None:
+            await asyncio.gather(*(self._resolve_single(entry) for entry in pending))
+            return
+        if self.config_manager.config_xbridge.debug_level >= 2:
+            self.logger.info(f"xbridge_rpc_batch({', '.join(entry[0] for entry in pending)})")
+
+        retry = []
+        for entry, response in zip(pending, responses):
+            if response is None:
+                retry.append(entry)
+            else:
+                self._resolve_batched_item(entry, response)
+        if retry:
+            await asyncio.gather(*(self._resolve_single(entry) for entry in retry))
+
+    def _resolve_batched_item(self, entry, response):
+        """Map one batch response item onto its caller, mirroring rpc_call's result handling."""
+        method, params, _, future = entry
+        if future.done():
+            return
+        try:
+            if response.get('error') is not None:
+                error = response['error']
+                error_msg = error.get('message', 'Unknown RPC error') if isinstance(error, dict) else str(error)
+                error_code = error.get('code', -1) if isinstance(error, dict) else -1
+                error_handler = getattr(self.config_manager, 'error_handler', None)
+                if error_handler:
+                    error_handler.handle(
+                        OperationalError(f"RPC error {error_code}: {error_msg}", {"method": method, "params": params}),
+                        context={"prefix": "xbridge", "err_count": 0}
+                    )
+                else:
+                    self.logger.warning(f"xbridge_rpc_call: RPC error {error_code} - {error_msg}")
+                future.set_result(response)
+            else:
+                result = response.get('result')
+                if result is None:
+                    self.logger.warning("xbridge_rpc_call: Missing result in response")
+                future.set_result(result)
+        except Exception as e:
+            future.set_exception(convert_exception(e))
+
+    async def _resolve_single(self, entry):
+        method, params, shutdown_event, future = entry
+        try:
+            result = await self._call_single(method, params, shutdown_event)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
     async def async_test_rpc(self):
         """Perform RPC connection test asynchronously with cancellation handling"""
         try:
@@ -245,6 +598,9 @@ class XBridgeManager:
     async def getnewtokenadress(self, token):
         return await self.rpc_wrapper("dxGetNewTokenAddress", [token])
 
+    async def getmyorders(self):
+        return await self.rpc_wrapper("dxGetMyOrders")
+
     async def getmyordersbymarket(self, maker, taker):
         myorders = await self.rpc_wrapper("dxGetMyOrders")
         return [zz for zz in myorders if (zz['maker'] == maker) and (zz['taker'] == taker)]
@@ -296,23 +652,7 @@ class XBridgeManager:
         return await self.rpc_wrapper("dxgettokenbalances")
 
     async def gettokenutxo(self, token, used=False):
-        cache_key = f"{token}_{used}"
-        current_time = time.time()
-
-        # Check cache under class lock (thread-safe)
-        with XBridgeManager._utxo_cache_lock:
-            cached_data = XBridgeManager._utxo_cache.get(cache_key)
-            if cached_data and (current_time - cached_data[0]) < XBridgeManager.UTXO_CACHE_DURATION:
-                self.logger.debug(f"Returning class-level cached UTXO data for {token} (used={used})")
-                return cached_data[1]
-
-        # If not cached or expired, make the RPC call
-        result = await self.rpc_wrapper("dxgetutxos", [token, used])
-
-        with XBridgeManager._utxo_cache_lock:
-            XBridgeManager._utxo_cache[cache_key] = (time.time(), result)
-            # self.logger.debug(f"Cached new class-level UTXO data for {token} (used={used})")
-        return result
+        return await self.rpc_wrapper("dxgetutxos", [token, used])
 
     async def getlocaltokens(self):
         return await self.rpc_wrapper("dxgetlocaltokens")
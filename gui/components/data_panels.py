@@ -55,18 +55,18 @@ class OrdersPanel(BaseDataPanel):
 
         for i, order in enumerate(data):
             tree.insert('', 'end', values=(
-                order['name'],
-                order['symbol'],
-                order.get('status', 'None'),
-                order.get('side', 'None'),
-                order.get('flag', 'X'),
-                order.get('variation', 'None'),
-                order.get('maker_size', 'None'),
-                order.get('maker', 'None'),
-                order.get('taker_size', 'None'),
-                order.get('taker', 'None'),
-                order.get('dex_price', 'None'),
-                order.get('order_id', 'None'),
+                order.name,
+                order.symbol,
+                order.status,
+                order.side,
+                order.flag,
+                order.variation,
+                order.maker_size,
+                order.maker,
+                order.taker_size,
+                order.taker,
+                order.dex_price,
+                order.order_id,
             ), tags=('evenrow' if i % 2 == 0 else 'oddrow',))
 
         tree.configure(height=display_height)
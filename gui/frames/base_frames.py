@@ -4,9 +4,10 @@ import asyncio
 import logging
 import threading
 from tkinter import ttk
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from definitions.config_manager import ConfigManager
+from definitions.orders import OrderRow
 from gui.components.data_panels import OrdersPanel
 from gui.utils.async_updater import AsyncUpdater
 
@@ -44,8 +45,13 @@ class BaseStrategyFrame(ttk.Frame):
 
     def initialize_config(self, loadxbridgeconf: bool = True):
         """Initializes the configuration manager for the specific strategy."""
+        previous = self.config_manager
         try:
             self.config_manager = ConfigManager(strategy=self.strategy_name, master_manager=self.master_config_manager)
+            # Released only once the new manager holds its own reference, so the shared
+            # exchange instance and its markets survive a configuration reload
+            if previous:
+                previous.release_ccxt()
             self.config_manager.initialize(loadxbridgeconf=loadxbridgeconf)
             # Register the GUI-safe critical error handler with the strategy instance
             if self.config_manager.strategy_instance:
@@ -202,6 +208,8 @@ class BaseStrategyFrame(ttk.Frame):
                     context={"stage": "cancel_all"}
                 )
             finally:
+                loop.run_until_complete(self.config_manager.xbridge_manager.close_session())
+                loop.close()
                 # Restart the orders updater to refresh the orders panel
                 if self.orders_updater:
                     self.orders_updater.start()
@@ -232,6 +240,8 @@ class BaseStrategyFrame(ttk.Frame):
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             loop.run_until_complete(self.config_manager.strategy_instance.cancel_own_orders())
+            loop.run_until_complete(self.config_manager.xbridge_manager.close_session())
+            loop.close()
         except Exception as e:
             logger.error(f"Cancel own orders error: {e}", exc_info=True)
 
@@ -247,7 +257,7 @@ class BaseStrategyFrame(ttk.Frame):
             'open', 'new', 'created', 'accepting', 'hold', 'initialized', 'committed', 'finished'
         } else 'X'
 
-    def _fetch_orders_data(self) -> List[Dict[str, Any]]:
+    def _fetch_orders_data(self) -> List[OrderRow]:
         """Fetches order data for the AsyncUpdater."""
         orders = []
         if not self.config_manager or not hasattr(self.config_manager, 'pairs'):
@@ -257,52 +267,26 @@ class BaseStrategyFrame(ttk.Frame):
         with self.config_manager.resource_lock:
             # logger.debug("GUI: _fetch_orders_data - acquired config_manager.resource_lock")
             for pair_obj in self.config_manager.pairs.values():
-                name = pair_obj.name
-                symbol = pair_obj.symbol
-                # pair = pair_obj.cfg
-                status = 'None'
-                current_order_side = 'None'
-                maker_size = 'None'
-                maker = 'None'
-                taker_size = 'None'
-                taker = 'None'
-                dex_price = 'None'
-                order_id = 'None'
-
-                if self.started and pair_obj.dex.order and 'status' in pair_obj.dex.order:
-                    status = pair_obj.dex.order.get('status', 'None')
-                    current_order_side = pair_obj.dex.current_order.get('side',
-                                                                        'None') if pair_obj.dex.current_order else 'None'
-                    maker_size = pair_obj.dex.current_order.get('maker_size',
-                                                                'None') if pair_obj.dex.current_order else 'None'
-                    maker = pair_obj.dex.current_order.get('maker', 'None') if pair_obj.dex.current_order else 'None'
-                    taker_size = pair_obj.dex.current_order.get('taker_size',
-                                                                'None') if pair_obj.dex.current_order else 'None'
-                    taker = pair_obj.dex.current_order.get('taker', 'None') if pair_obj.dex.current_order else 'None'
-                    dex_price = pair_obj.dex.current_order.get('dex_price',
-                                                               'None') if pair_obj.dex.current_order else 'None'
-                    order_id = pair_obj.dex.order.get('id', 'None') if pair_obj.dex.current_order else 'None'
+                row = OrderRow(name=pair_obj.name, symbol=pair_obj.symbol)
+                dex_order = pair_obj.dex.order
+                current_order = pair_obj.dex.current_order
+
+                if self.started and dex_order and 'status' in dex_order:
+                    row.status = dex_order.get('status', 'None')
+                    if current_order:
+                        row.side = current_order.side
+                        row.maker_size = current_order.maker_size
+                        row.maker = current_order.maker
+                        row.taker_size = current_order.taker_size
+                        row.taker = current_order.taker
+                        row.dex_price = current_order.dex_price
+                        row.order_id = dex_order.get('id', 'None')
+                    row.variation = str(pair_obj.dex.variation)
                 elif pair_obj.dex.disabled:
-                    status = 'Disabled'
-
-                variation_display = 'None'
-                if self.started and pair_obj.dex.order and 'status' in pair_obj.dex.order:
-                    variation_display = str(pair_obj.dex.variation)
-
-                orders.append({
-                    "name": name,
-                    "symbol": symbol,
-                    "status": status,
-                    "side": current_order_side,
-                    "flag": self._get_flag(status),
-                    "variation": variation_display,
-                    "maker_size": maker_size,
-                    "maker": maker,
-                    "taker_size": taker_size,
-                    "taker": taker,
-                    "dex_price": dex_price,
-                    "order_id": order_id
-                })
+                    row.status = 'Disabled'
+
+                row.flag = self._get_flag(row.status)
+                orders.append(row)
         # logger.debug(f"GUI: _fetch_orders_data - orders: {orders}")
         return orders
 
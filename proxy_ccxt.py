@@ -1,15 +1,20 @@
 import asyncio
+import json
 import logging
 import os
 import signal
+import statistics
 from functools import wraps
-from typing import Any
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
 
 import aiohttp
 import ccxt.async_support as ccxt
 from aiohttp import ClientSession, web
 
 from definitions.logger import setup_logging
+from definitions.markets_cache import MarketsCache
+from definitions.shared_tickers import SharedTickerWriter
 from definitions.yaml_mix import YamlToObject
 
 if os.name == 'nt':
@@ -55,15 +60,85 @@ def async_retry(max_retries=5, delay=1, backoff=2, exceptions_to_retry=(Exceptio
     return decorator
 
 
+# --- Price aggregation ---
+AGGREGATION_METHODS = ('median', 'vwap')
+
+
+def aggregate_price(quotes: Iterable[Tuple[Optional[float], Optional[float]]], method: str = 'median') -> Optional[float]:
+    """
+    Consolidate ``(last, base_volume)`` quotes from several venues into one price.
+
+    ``vwap`` weights by base volume and falls back to the median when a venue reports no volume.
+    Quotes without a positive last price are ignored; returns None if none is left.
+    """
+    quotes = [(float(last), volume) for last, volume in quotes if last is not None and float(last) > 0]
+    if not quotes:
+        return None
+    if method == 'vwap' and all(volume and volume > 0 for _, volume in quotes):
+        total_volume = sum(float(volume) for _, volume in quotes)
+        return sum(last * float(volume) for last, volume in quotes) / total_volume
+    return statistics.median(last for last, _ in quotes)
+
+
+def consolidate_tickers(venue_tickers: Dict[str, Dict], primary: str, method: str) -> Optional[Dict]:
+    """
+    Merge one symbol's tickers from several venues: the primary venue's ticker (or the first
+    available) with ``last`` set to the consolidated price, plus ``consolidated`` and ``venues``.
+    """
+    venue_tickers = {venue: ticker for venue, ticker in venue_tickers.items() if isinstance(ticker, dict)}
+    price = aggregate_price(((t.get('last'), t.get('baseVolume')) for t in venue_tickers.values()), method)
+    if price is None:
+        return None
+    base = venue_tickers.get(primary) or next(iter(venue_tickers.values()))
+    ticker = dict(base)
+    ticker['last'] = price
+    ticker['consolidated'] = {'last': price, 'method': method, 'venue_count': len(venue_tickers)}
+    ticker['venues'] = {
+        venue: {key: t.get(key) for key in ('last', 'bid', 'ask', 'baseVolume', 'timestamp')}
+        for venue, t in venue_tickers.items()
+    }
+    return ticker
+
+
 # --- Price Fetcher (Same Logic) ---
 class PriceFetcher:
+    # A ticker older than MAX_AGE seconds is stale: it is still served for up to
+    # STALE_WHILE_REVALIDATE more seconds while a background refresh runs, after
+    # which requests wait for a refresh and never get it.
+    MAX_AGE = 30.0
+    STALE_WHILE_REVALIDATE = 90.0
+    # Periodic refresh planning: symbols nobody requested for IDLE_TIMEOUT seconds are dropped,
+    # symbols with HOT_REQUESTERS or more active requesters refresh HOT_SPEEDUP times faster,
+    # and all intervals stretch so periodic calls use at most RATE_LIMIT_SHARE of the
+    # exchange's request budget (ccxt ``rateLimit``, ms between requests).
+    IDLE_TIMEOUT = 300.0
+    HOT_REQUESTERS = 2
+    HOT_SPEEDUP = 3.0
+    RATE_LIMIT_SHARE = 0.5
+
     def __init__(self, config, session: ClientSession):
         self.config = config
         self.session = session
         self.ccxt_i = None
+        # Extra exchanges aggregated with ccxt_i: exchange id -> ccxt instance
+        self.venues: Dict[str, Any] = {}
+        aggregation = getattr(config, 'ccxt_aggregation', None)
+        self.aggregation = aggregation if aggregation in AGGREGATION_METHODS else 'median'
+        # Once one venue answered, slower ones get this many more seconds before being skipped
+        self.venue_grace = 2.0
+        # Both tables are replaced as a whole, never mutated in place, so readers see either
+        # the previous or the new state of a refresh
         self.tickers = {}
+        self.ticker_times: Dict[str, float] = {}  # symbol -> monotonic time it was fetched
+        self.max_age = self.MAX_AGE
+        self.stale_while_revalidate = self.STALE_WHILE_REVALIDATE
         self.custom_tickers = {}
+        self.custom_ticker_times: Dict[str, float] = {}
         self.symbols_list = []
+        # Demand tracking: symbol -> last request time, symbol -> {requester: last request time}
+        self.last_requested: Dict[str, float] = {}
+        self.requesters: Dict[str, Dict[Hashable, float]] = {}
+        self.refresh_attempts: Dict[str, float] = {}  # symbol -> last time a refresh asked for it
         self.active_custom_tickers = set()
         self.fetch_timeout = 10  # Timeout for fetchTickers in seconds
 
@@ -74,6 +149,24 @@ class PriceFetcher:
         self.custom_ticker_cache_hit = 0
 
         self._refresh_lock = asyncio.Lock()
+        self._revalidate_task: Optional[asyncio.Task] = None
+        # Coroutines called with {symbol: ticker} of changed tickers after each CCXT refresh
+        self._listeners = []
+        # Optional shared-memory copy of the ticker cache for bots on the same host
+        self.shared_table = None
+        # Optional on-disk markets cache; stale entries are reloaded by these tasks
+        self.markets_cache: Optional[MarketsCache] = None
+        self._markets_refresh_tasks: List[asyncio.Task] = []
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], Awaitable[None]]):
+        self._listeners.append(callback)
+
+    async def _notify_listeners(self, changed: Dict[str, Any]):
+        for callback in list(self._listeners):
+            try:
+                await callback(changed)
+            except Exception as e:
+                logger.error(f"Error notifying ticker listener: {e}", exc_info=True)
 
     async def initialize(self):
         """Initializes the CCXT instance and loads markets."""
@@ -91,7 +184,34 @@ class PriceFetcher:
 
         self.ccxt_i = exchange_class(config)
 
-        await self._load_markets_with_retry()
+        if not self._markets_from_cache(self.ccxt_i, hostname):
+            await self._load_markets_with_retry()
+            self._cache_markets(self.ccxt_i, hostname)
+        await self._initialize_venues()
+
+    async def _initialize_venues(self):
+        """Create and load the optional extra exchanges. One that fails to load is left out."""
+        names = getattr(self.config, 'ccxt_aggregate_exchanges', None)
+        if not isinstance(names, (list, tuple)):
+            return
+        for name in names:
+            if name == self.ccxt_i.id or name in self.venues:
+                continue
+            if name not in ccxt.exchanges:
+                logger.error(f"Aggregate exchange {name} not supported by ccxt, ignoring it")
+                continue
+            exchange = getattr(ccxt, name)({'enableRateLimit': True})
+            if not self._markets_from_cache(exchange):
+                try:
+                    await exchange.load_markets()
+                except Exception as e:
+                    logger.error(f"Could not load markets for aggregate exchange {name}, ignoring it: {e}")
+                    await exchange.close()
+                    continue
+                self._cache_markets(exchange)
+            self.venues[name] = exchange
+        if self.venues:
+            logger.info(f"Aggregating {self.ccxt_i.id} prices with {list(self.venues)} ({self.aggregation})")
 
     @async_retry(exceptions_to_retry=(ccxt.NetworkError,))
     async def _load_markets_with_retry(self):
@@ -99,51 +219,221 @@ class PriceFetcher:
         await self.ccxt_i.load_markets()
         logger.info(f"Markets loaded successfully for exchange: {self.ccxt_i.id}")
 
+    def _markets_from_cache(self, exchange, hostname: Optional[str] = None) -> bool:
+        """Set ``exchange`` markets from the disk cache, reloading them in the background if stale."""
+        if self.markets_cache is None:
+            return False
+        cached = self.markets_cache.load(exchange.id, hostname)
+        if cached is None:
+            return False
+        markets, currencies, age = cached
+        try:
+            exchange.set_markets(markets, currencies)
+        except Exception as e:
+            logger.warning(f"Discarding unusable cached markets for {exchange.id}: {e}")
+            return False
+        logger.info(f"Markets for {exchange.id} loaded from cache: {len(exchange.markets)} markets, {age:.0f}s old")
+        if self.markets_cache.is_stale(age):
+            self._markets_refresh_tasks.append(asyncio.ensure_future(self._reload_markets(exchange, hostname)))
+        return True
+
+    def _cache_markets(self, exchange, hostname: Optional[str] = None):
+        if self.markets_cache is not None and exchange.markets:
+            self.markets_cache.save_in_background(exchange.id, hostname, exchange.markets, exchange.currencies)
+
+    async def _reload_markets(self, exchange, hostname: Optional[str]):
+        try:
+            await exchange.load_markets(True)
+        except Exception as e:
+            logger.warning(f"Background markets refresh failed for {exchange.id}, keeping cached markets: {e}")
+            return
+        self._cache_markets(exchange, hostname)
+
     async def close(self):
+        if self._revalidate_task and not self._revalidate_task.done():
+            self._revalidate_task.cancel()
+        for task in self._markets_refresh_tasks:
+            task.cancel()
+        self._markets_refresh_tasks = []
         if self.ccxt_i:
             await self.ccxt_i.close()
             logger.info("CCXT instance closed.")
+        for exchange in self.venues.values():
+            await exchange.close()
+        self.venues = {}
+
+    def ticker_age(self, symbol: str) -> float:
+        """Seconds since ``symbol`` was last fetched, infinite if it never was."""
+        fetched_at = self.ticker_times.get(symbol)
+        return float('inf') if fetched_at is None else monotonic() - fetched_at
 
-    def _needs_refresh(self, symbols=None):
-        """Check if a refresh is needed for the given symbols."""
+    def _needs_refresh(self, symbols=None, max_age: Optional[float] = None):
+        """Check if a refresh is needed for the given symbols (missing, or older than max_age)."""
         if symbols is None:
             symbols = self.symbols_list
-        return any(s not in self.tickers for s in symbols)
+        return any(s not in self.tickers or (max_age is not None and self.ticker_age(s) > max_age)
+                   for s in symbols)
+
+    def record_demand(self, symbols: Iterable[str], requester: Hashable = None):
+        """Note that ``requester`` asked for ``symbols`` now."""
+        now = monotonic()
+        for symbol in symbols:
+            self.last_requested[symbol] = now
+            self.requesters.setdefault(symbol, {})[requester] = now
+
+    def requester_count(self, symbol: str) -> int:
+        """Requesters that asked for ``symbol`` within the idle timeout."""
+        cutoff = monotonic() - self.IDLE_TIMEOUT
+        return sum(1 for seen in self.requesters.get(symbol, {}).values() if seen >= cutoff)
+
+    def evict_idle(self) -> List[str]:
+        """Stop tracking symbols nobody requested for ``IDLE_TIMEOUT`` seconds. Returns them."""
+        now = monotonic()
+        cutoff = now - self.IDLE_TIMEOUT
+        for symbol, seen in list(self.requesters.items()):
+            self.requesters[symbol] = {requester: t for requester, t in seen.items() if t >= cutoff}
+        idle = []
+        for symbol in self.symbols_list:
+            # Symbols registered without a request start their idle clock now
+            if self.last_requested.setdefault(symbol, now) < cutoff:
+                idle.append(symbol)
+        if not idle:
+            return idle
+
+        idle_set = set(idle)
+        self.symbols_list = [symbol for symbol in self.symbols_list if symbol not in idle_set]
+        self.tickers = {symbol: t for symbol, t in self.tickers.items() if symbol not in idle_set}
+        self.ticker_times = {symbol: t for symbol, t in self.ticker_times.items() if symbol not in idle_set}
+        for symbol in idle:
+            self.last_requested.pop(symbol, None)
+            self.requesters.pop(symbol, None)
+            self.refresh_attempts.pop(symbol, None)
+        logger.info(f"Evicted idle symbols: {idle}")
+        return idle
+
+    def request_budget(self) -> Optional[float]:
+        """Exchange requests per second periodic refreshes may use, None if the exchange has no rate limit."""
+        rate_limit_ms = getattr(self.ccxt_i, 'rateLimit', None)
+        if not isinstance(rate_limit_ms, (int, float)) or rate_limit_ms <= 0:
+            return None
+        return self.RATE_LIMIT_SHARE * 1000.0 / rate_limit_ms
+
+    def refresh_intervals(self, base_interval: float) -> Dict[str, float]:
+        """Refresh interval per tracked symbol, from its demand and the exchange rate limit."""
+        intervals = {
+            symbol: (base_interval / self.HOT_SPEEDUP
+                     if self.requester_count(symbol) >= self.HOT_REQUESTERS else base_interval)
+            for symbol in self.symbols_list
+        }
+        budget = self.request_budget()
+        if intervals and budget:
+            # One fetchTickers call per market type and interval tier
+            markets = self.ccxt_i.markets
+            calls = {((markets.get(symbol) or {}).get('type'), interval) for symbol, interval in intervals.items()}
+            load = sum(1.0 / interval for _, interval in calls)
+            if load > budget:
+                scale = load / budget
+                intervals = {symbol: interval * scale for symbol, interval in intervals.items()}
+        return intervals
+
+    def due_symbols(self, intervals: Dict[str, float]) -> List[str]:
+        """
+        Symbols whose interval elapsed since they were last fetched (or last attempted, so a
+        symbol the exchange never returns is not retried every tick). Symbols of the same market
+        type past half their interval ride along, since the call costs the same.
+        """
+        now = monotonic()
+
+        def since_refresh(symbol):
+            return min(self.ticker_age(symbol), now - self.refresh_attempts.get(symbol, float('-inf')))
+
+        due = [symbol for symbol, interval in intervals.items() if since_refresh(symbol) >= interval]
+        if not due:
+            return due
+        markets = self.ccxt_i.markets
+        due_types = {(markets.get(symbol) or {}).get('type') for symbol in due}
+        due_set = set(due)
+        due.extend(symbol for symbol, interval in intervals.items()
+                   if symbol not in due_set and (markets.get(symbol) or {}).get('type') in due_types
+                   and since_refresh(symbol) >= interval / 2)
+        return due
+
+    def _revalidate_in_background(self, symbols: Iterable[str], max_age: float):
+        """Refresh stale symbols without making the current request wait. At most one at a time."""
+        if self._revalidate_task is None or self._revalidate_task.done():
+            self._revalidate_task = asyncio.ensure_future(self._revalidate(list(symbols), max_age))
+
+    async def _revalidate(self, symbols, max_age: float):
+        try:
+            async with self._refresh_lock:
+                if self._needs_refresh(symbols, max_age):
+                    logger.info("Revalidating stale CCXT tickers in background.")
+                    await self.refresh_ccxt_tickers()
+        except Exception as e:
+            logger.warning(f"Background ticker refresh failed, serving stale tickers: {e}")
 
     @async_retry(max_retries=3, delay=2, exceptions_to_retry=(ccxt.NetworkError,))
-    async def refresh_ccxt_tickers(self):
-        """Refreshes tickers from CCXT for all registered symbols."""
-        if not self.symbols_list:
+    async def refresh_ccxt_tickers(self, symbols: Optional[List[str]] = None):
+        """Refreshes tickers from CCXT for ``symbols``, by default all registered symbols."""
+        if symbols is None:
+            symbols = self.symbols_list
+        if not symbols:
             return
 
-        logger.info(f"Refreshing CCXT tickers for: {self.symbols_list}")
+        logger.info(f"Refreshing CCXT tickers for: {symbols}")
 
         try:
             # Group symbols by market type to avoid mixed spot/swap requests
             markets = self.ccxt_i.markets
             grouped = {}
-            for symbol in self.symbols_list:
+            self.refresh_attempts.update(dict.fromkeys(symbols, monotonic()))
+            for symbol in symbols:
                 market = markets.get(symbol)
                 if market:
                     grouped.setdefault(market['type'], []).append(symbol)
 
-            self.tickers = {}
+            fresh = {}
+            errors = []
             for market_type, symbols in grouped.items():
                 if len(symbols) > 0:
                     self.ccxt_call_count += 1
-                    tickers = await asyncio.wait_for(
-                        self.ccxt_i.fetchTickers(symbols),
-                        timeout=self.fetch_timeout
-                    )
+                    try:
+                        if self.venues:
+                            tickers = await self._fetch_aggregated_tickers(symbols)
+                        else:
+                            tickers = await asyncio.wait_for(
+                                self.ccxt_i.fetchTickers(symbols),
+                                timeout=self.fetch_timeout
+                            )
+                    except Exception as e:
+                        # Keep the other market types' results, raise once they are stored
+                        errors.append(e)
+                        continue
                     # Handle invalid ticker responses (non-dict/non-iterable)
                     if not isinstance(tickers, dict) and not hasattr(tickers, '__iter__'):
                         logger.error(f"Invalid tickers response type: {type(tickers)}")
                     else:
                         try:
-                            self.tickers.update(tickers)
+                            fresh.update(tickers)
                         except (TypeError, ValueError) as e:
                             logger.error(f"Error updating tickers: {e}")
+
+            previous = self.tickers
+            if fresh:
+                # Swap in new tables; symbols that failed this time keep their previous ticker and age
+                fetched_at = monotonic()
+                self.tickers = {**previous, **fresh}
+                self.ticker_times = {**self.ticker_times, **dict.fromkeys(fresh, fetched_at)}
+                if self.shared_table is not None:
+                    self.shared_table.publish(fresh)
+            if errors:
+                raise errors[0]
+
             logger.info("Successfully refreshed CCXT tickers.")
+            # Subscribers get the delta, possibly empty, after every successful refresh
+            await self._notify_listeners(
+                {symbol: ticker for symbol, ticker in fresh.items() if previous.get(symbol) != ticker}
+            )
 
         except ccxt.BadRequest as e:
             logger.error(f"Invalid symbol combination: {e}")
@@ -152,6 +442,65 @@ class PriceFetcher:
             logger.error(f"Error refreshing tickers: {e}")
             raise
 
+    async def _fetch_aggregated_tickers(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch ``symbols`` from the primary exchange and every venue listing them in parallel and
+        consolidate per symbol. Venues that fail, or are still running ``venue_grace`` seconds
+        after the first successful answer, are skipped. Failures do not start that window: while
+        every venue done so far failed, the others get up to ``fetch_timeout``. Raises only if no
+        venue answered.
+        """
+        tasks = {asyncio.ensure_future(self.ccxt_i.fetchTickers(symbols)): self.ccxt_i.id}
+        for name, exchange in self.venues.items():
+            listed = [symbol for symbol in symbols if symbol in exchange.markets]
+            if listed:
+                tasks[asyncio.ensure_future(exchange.fetchTickers(listed))] = name
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.fetch_timeout
+        done, pending = set(), set(tasks)
+        answered = False
+        while pending and not answered:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            newly_done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                     return_when=asyncio.FIRST_COMPLETED)
+            done |= newly_done
+            answered = any(task.exception() is None for task in newly_done)
+        if pending and answered:
+            more_done, pending = await asyncio.wait(pending, timeout=self.venue_grace)
+            done |= more_done
+        for task in pending:
+            task.cancel()
+            logger.warning(f"Skipping slow exchange {tasks[task]} for this refresh")
+
+        by_symbol: Dict[str, Dict[str, Dict]] = {}
+        first_error = None
+        for task in done:
+            name = tasks[task]
+            if task.exception() is not None:
+                logger.warning(f"Exchange {name} failed to return tickers: {task.exception()}")
+                first_error = first_error or task.exception()
+                continue
+            result = task.result()
+            if not isinstance(result, dict):
+                logger.error(f"Invalid tickers response type from {name}: {type(result)}")
+                continue
+            for symbol, ticker in result.items():
+                by_symbol.setdefault(symbol, {})[name] = ticker
+
+        if not by_symbol:
+            if first_error is not None:
+                raise first_error
+            raise asyncio.TimeoutError(f"No exchange returned tickers for {symbols}")
+        consolidated = {}
+        for symbol, venue_tickers in by_symbol.items():
+            ticker = consolidate_tickers(venue_tickers, self.ccxt_i.id, self.aggregation)
+            if ticker is not None:
+                consolidated[symbol] = ticker
+        return consolidated
+
     @async_retry(max_retries=3, delay=2, exceptions_to_retry=(aiohttp.ClientError,))
     async def update_custom_ticker_block(self):
         """Updates the BLOCK ticker from CryptoCompare."""
@@ -164,15 +513,32 @@ class PriceFetcher:
             price = data.get('BTC')
             if price and isinstance(price, float):
                 self.custom_tickers['BLOCK'] = price
+                self.custom_ticker_times['BLOCK'] = monotonic()
                 logger.info(f"Updated BLOCK ticker: {price} BTC")
             else:
                 logger.error(f"Invalid data for BLOCK ticker: {data}")
 
-    async def refresh_all_tickers(self):
-        """Refreshes all configured tickers."""
-        tasks = [self.refresh_ccxt_tickers()]
-        if 'BLOCK' in self.active_custom_tickers:
-            tasks.append(self.update_custom_ticker_block())
+    async def refresh_all_tickers(self, base_interval: Optional[float] = None):
+        """
+        Refreshes all configured tickers, or with ``base_interval`` only those due under the
+        demand-driven plan (see :meth:`refresh_intervals`), after evicting idle symbols.
+        """
+        if base_interval is None:
+            tasks = [self.refresh_ccxt_tickers()]
+            if 'BLOCK' in self.active_custom_tickers:
+                tasks.append(self.update_custom_ticker_block())
+        else:
+            self.evict_idle()
+            tasks = []
+            due = self.due_symbols(self.refresh_intervals(base_interval))
+            if due:
+                tasks.append(self.refresh_ccxt_tickers(due))
+            block_fetched_at = self.custom_ticker_times.get('BLOCK')
+            if 'BLOCK' in self.active_custom_tickers and (
+                    block_fetched_at is None or monotonic() - block_fetched_at >= base_interval):
+                tasks.append(self.update_custom_ticker_block())
+            if not tasks:
+                return
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
         for i, result in enumerate(results):
@@ -181,8 +547,18 @@ class PriceFetcher:
 
         self.print_metrics()
 
-    async def get_ccxt_tickers(self, *symbols: str) -> dict:
-        """Get tickers from CCXT, fetching if necessary."""
+    async def get_ccxt_tickers(self, *symbols: str, max_age: Optional[float] = None,
+                               requester: Hashable = None) -> dict:
+        """
+        Get tickers from CCXT, fetching if necessary.
+
+        Tickers fetched within ``max_age`` seconds (default ``self.max_age``) are served from
+        cache. Older ones are served too, while refreshed in the background, until they are
+        ``stale_while_revalidate`` seconds past ``max_age``; beyond that the request waits for
+        a refresh and gets an error entry for any symbol still that old.
+        """
+        max_age = self.max_age if max_age is None else max(0.0, float(max_age))
+        serve_limit = max_age + self.stale_while_revalidate
         new_symbols = []
         request_invalid_symbols = []
         request_valid_symbols = []
@@ -199,29 +575,37 @@ class PriceFetcher:
 
         if new_symbols:
             self.symbols_list.extend(new_symbols)
+        self.record_demand(request_valid_symbols, requester)
 
-        # 2. If any requested symbols are missing from cache, trigger a refresh.
-        if self._needs_refresh(request_valid_symbols):
+        # 2. If any requested symbols are missing from cache or too old to serve, trigger a refresh.
+        if self._needs_refresh(request_valid_symbols, serve_limit):
             # 3. Use a lock to prevent concurrent refreshes (dogpiling).
             async with self._refresh_lock:
                 # 4. Re-check need for refresh inside the lock (double-checked locking).
-                if self._needs_refresh(request_valid_symbols):
+                if self._needs_refresh(request_valid_symbols, serve_limit):
                     logger.info("Triggering on-demand refresh for CCXT tickers.")
                     await self.refresh_ccxt_tickers()
                     self.print_metrics()
         else:
             self.ccxt_cache_hit += 1
-            logger.info("Returning cached CCXT tickers.")
+            if self._needs_refresh(request_valid_symbols, max_age):
+                logger.info("Returning stale CCXT tickers, refreshing in background.")
+                self._revalidate_in_background(request_valid_symbols, max_age)
+            else:
+                logger.info("Returning cached CCXT tickers.")
 
         # 5. Construct the final response.
         result = {}
+        tickers = self.tickers
         # Add the valid symbols from the cache.
         for s in request_valid_symbols:
-            if s in self.tickers:
-                result[s] = self.tickers[s]
-            else:
+            if s not in tickers:
                 # This case might occur if refresh failed for a specific symbol.
                 result[s] = {'error': 'Ticker data not found after refresh'}
+            elif self.ticker_age(s) > serve_limit:
+                result[s] = {'error': 'Ticker data is stale'}
+            else:
+                result[s] = tickers[s]
 
         # Add invalid symbols with error messages.
         for s in request_invalid_symbols:
@@ -265,9 +649,14 @@ class WebServer:
         self.port = port
         self.app = web.Application()
         self.app.router.add_post("/", self.handle_request)
+        self.app.router.add_get("/ws", self.handle_subscribe)
         self.runner = None
         self.periodic_task = None
-        self.refresh_interval = 15
+        self.refresh_interval = 15  # Base interval, adapted per symbol by PriceFetcher.refresh_intervals
+        self.tick_interval = 1  # How often the refresh plan is checked
+        # Ticker subscriptions: websocket -> subscribed symbols
+        self.subscribers: Dict[web.WebSocketResponse, Set[str]] = {}
+        self.fetcher.add_listener(self.broadcast_tickers)
 
     def _error_response(self, code: int, message: str, request_id: Any, status: int) -> web.Response:
         """Creates and returns a standardized JSON-RPC error web response."""
@@ -283,11 +672,17 @@ class WebServer:
             data = await request.json()
             method = data.get('method')
             params = data.get('params', [])
+            options = {}
+            if isinstance(params, dict):
+                # {"symbols": [...], "max_age": seconds} form, a plain list uses the default max age
+                options = {'max_age': params['max_age']} if params.get('max_age') is not None else {}
+                params = params.get('symbols', [])
 
             logger.info(f"Received request for method: {method}")
 
             if method == 'ccxt_call_fetch_tickers':
-                response_data = await self.fetcher.get_ccxt_tickers(*params)
+                response_data = await self.fetcher.get_ccxt_tickers(*params, requester=self._requester(request, data),
+                                                                    **options)
             elif method == 'fetch_ticker_block':
                 response_data = await self.fetcher.get_block_ticker()
             else:
@@ -308,16 +703,69 @@ class WebServer:
             logger.error(f"Error handling request: {e}", exc_info=True)
             return self._error_response(500, str(e), data.get("id") if data else None, 500)
 
+    @staticmethod
+    def _requester(request: web.Request, data: Dict) -> Hashable:
+        """
+        Demand-tracking identity: the ``client`` id sent by the bot (top level or in dict
+        params), else the remote host. Never the connection: bots open a new one per call.
+        """
+        params = data.get('params')
+        client = data.get('client') or (params.get('client') if isinstance(params, dict) else None)
+        if client:
+            return str(client)
+        return request.remote
+
+    async def handle_subscribe(self, request: web.Request) -> web.WebSocketResponse:
+        """
+        WebSocket ticker feed. The client sends ``{"method": "subscribe", "params": [symbols]}``
+        once, receives a full ``tickers`` snapshot, then a ``tickers`` message holding only the
+        changed symbols after every refresh.
+        """
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                try:
+                    data = json.loads(msg.data)
+                    if not isinstance(data, dict) or data.get('method') != 'subscribe':
+                        raise ValueError("Unsupported method")
+                    symbols = [symbol for symbol in data.get('params', []) if isinstance(symbol, str)]
+                    snapshot = await self.fetcher.get_ccxt_tickers(*symbols, requester=self._requester(request, data))
+                except Exception as e:
+                    logger.warning(f"Rejected ticker subscription: {e}")
+                    await ws.send_json({"jsonrpc": "2.0", "error": {"code": 400, "message": str(e)}})
+                    continue
+                self.subscribers[ws] = set(symbols)
+                logger.info(f"Ticker subscription for: {symbols}")
+                await ws.send_json({"jsonrpc": "2.0", "method": "tickers", "params": snapshot, "snapshot": True})
+        finally:
+            self.subscribers.pop(ws, None)
+        return ws
+
+    async def broadcast_tickers(self, changed: Dict[str, Any]):
+        """Push each subscriber the changed tickers it subscribed to."""
+        for ws, symbols in list(self.subscribers.items()):
+            # A live subscription keeps its symbols in demand
+            self.fetcher.record_demand(symbols, id(ws))
+            delta = {symbol: changed[symbol] for symbol in symbols if symbol in changed}
+            try:
+                await ws.send_json({"jsonrpc": "2.0", "method": "tickers", "params": delta})
+            except (ConnectionResetError, RuntimeError) as e:
+                logger.info(f"Dropping ticker subscriber: {e}")
+                self.subscribers.pop(ws, None)
+
     async def _run_periodically(self):
-        """Periodically refreshes all tickers, handling errors gracefully."""
+        """Periodically refreshes the tickers that are due, handling errors gracefully."""
         try:
             while True:
                 try:
-                    await self.fetcher.refresh_all_tickers()
+                    await self.fetcher.refresh_all_tickers(self.refresh_interval)
                 except Exception as e:
                     logger.error(f"Error during ticker refresh: {e}", exc_info=True)
 
-                await asyncio.sleep(self.refresh_interval)
+                await asyncio.sleep(min(self.tick_interval, self.refresh_interval))
         except asyncio.CancelledError:
             logger.info("Periodic refresh task cancelled.")
 
@@ -339,6 +787,10 @@ class WebServer:
             self.periodic_task.cancel()
             await self.periodic_task
 
+        for ws in list(self.subscribers):
+            await ws.close()
+        self.subscribers.clear()
+
         if self.runner:
             await self.runner.cleanup()
             logger.info("Web server stopped.")
@@ -369,7 +821,13 @@ class AsyncPriceService:
         self._loop = asyncio.get_running_loop()
         self.session = aiohttp.ClientSession()
         self.fetcher = PriceFetcher(self.config, self.session)
+        self.fetcher.markets_cache = MarketsCache.for_root(os.path.abspath(os.curdir), logger=logger)
         await self.fetcher.initialize()
+        try:
+            self.fetcher.shared_table = SharedTickerWriter()
+            logger.info(f"Publishing tickers to shared memory segment '{self.fetcher.shared_table.name}'")
+        except OSError as e:
+            logger.warning(f"Shared memory ticker table unavailable, bots will use RPC: {e}")
         self.server = WebServer(self.fetcher, "localhost", 2233)
 
     def _setup_signal_handlers(self):
@@ -403,6 +861,9 @@ class AsyncPriceService:
             await self.server.stop()
         if self.fetcher:
             await self.fetcher.close()
+            if self.fetcher.shared_table is not None:
+                self.fetcher.shared_table.close()
+                self.fetcher.shared_table = None
         if self.session:
             await self.session.close()
         logger.info("Shutdown complete.")
@@ -9,6 +9,7 @@ from typing import List, Dict, Any, Optional, Callable, Coroutine, TYPE_CHECKING
 import aiohttp
 
 from definitions.error_handler import OperationalError
+from definitions.file_io import ControlFile, run_file_io
 from beta.thorchain_def import get_thorchain_quote, execute_thorchain_swap, check_thorchain_path_status, \
     get_inbound_addresses, get_thorchain_tx_status
 from definitions.trade_state import TradeState
@@ -145,18 +146,18 @@ class ArbitrageStrategy(BaseStrategy):
 
     async def process_pair_async(self, pair_instance: 'Pair'):
         """The core arbitrage logic. This is now an async method."""
-        # --- PAUSE CHECK ---
-        if os.path.exists(self.pause_file_path):
-            try:
-                with open(self.pause_file_path, 'r') as f:
-                    pause_reason = json.load(f).get('reason', 'Unknown reason.')
+        # --- PAUSE CHECK --- (in-memory view of the pause file, see ControlFile)
+        pause_file = ControlFile.watch(self.pause_file_path)
+        if pause_file.exists:
+            if pause_file.data is not None:
+                pause_reason = pause_file.data.get('reason', 'Unknown reason.')
                 self.config_manager.general_log.warning(
                     f"TRADING PAUSED. Reason: {pause_reason}. "
                     f"Bot is monitoring for refund. Trading will resume automatically."
                 )
-            except (IOError, json.JSONDecodeError) as e:
+            else:
                 self.config_manager.error_handler.handle(
-                    OperationalError(f"Could not read pause file: {str(e)}"),
+                    OperationalError(f"Could not read pause file: {pause_file.error}"),
                     context={"file": self.pause_file_path}
                 )
             return
@@ -570,10 +571,9 @@ class ArbitrageStrategy(BaseStrategy):
                     f"[{log_prefix}] No handler found for resumption status '{initial_status}'. Archiving for manual review.")
                 state.archive("unknown-resume-status")
 
-            if os.path.exists(state.state_file_path):
+            final_state_data = state.load()
+            if final_state_data is not None:
                 # Check the status again after the handler has run to see if it changed.
-                with open(state.state_file_path, 'r') as f:
-                    final_state_data = json.load(f)
                 final_status = final_state_data.get('status')
 
                 # Only warn if the status hasn't changed, indicating a potential stall.
@@ -628,8 +628,8 @@ class ArbitrageStrategy(BaseStrategy):
                 f"Thorchain swap {thor_txid} for {refund_amount} {refund_asset} was refunded. "
                 "Actively monitoring for fund return. All new trading is paused until refund is confirmed."
             )
-            with open(self.pause_file_path, 'w') as f:
-                json.dump({'reason': pause_reason, 'trade_details': state_data}, f, indent=4)
+            await run_file_io(ControlFile.watch(self.pause_file_path).write,
+                              json.dumps({'reason': pause_reason, 'trade_details': state_data}, indent=4))
 
             self.config_manager.general_log.critical(f"[{state.log_prefix}] {pause_reason}")
 
@@ -656,8 +656,7 @@ class ArbitrageStrategy(BaseStrategy):
                 f"[{state.log_prefix}] Refund of {refund_amount} {refund_asset} confirmed in wallet.")
 
             # 1. Remove the pause file to resume trading
-            if os.path.exists(self.pause_file_path):
-                os.remove(self.pause_file_path)
+            if await run_file_io(ControlFile.watch(self.pause_file_path).remove):
                 self.config_manager.general_log.info(f"[{state.log_prefix}] Trading pause has been lifted.")
 
             # 2. Archive the completed (refunded) trade state
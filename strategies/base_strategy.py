@@ -133,6 +133,24 @@ class BaseStrategy(ABC):
         """
         pass
 
+    def get_pair_interval(self, pair_instance) -> float:
+        """
+        Returns the interval in seconds between two runs of process_pair_async for a pair.
+        A pair can override the strategy interval with 'operation_interval' in its config.
+        """
+        cfg = getattr(pair_instance, 'cfg', None)
+        if isinstance(cfg, dict) and cfg.get('operation_interval'):
+            return float(cfg['operation_interval'])
+        return self.get_operation_interval()
+
+    def get_watch_interval(self) -> Optional[float]:
+        """
+        Returns how often, in seconds, the controller checks pushed CEX prices between
+        full refreshes for price moves that reschedule a pair early. None disables it.
+        Watch ticks make no RPC; balances and order status are read by the full refresh.
+        """
+        return None
+
     @abstractmethod
     def get_startup_tasks(self) -> list:
         """
@@ -78,6 +78,10 @@ class MakerStrategy(BaseStrategy):
     async def handle_error_swap_status(self, dex_pair: 'DexPair'):
         pass
 
+    def get_watch_interval(self):
+        """Makers react to price moves between their regular runs (watch ticks make no RPC)."""
+        return 5
+
     def get_startup_tasks(self) -> list:
         """
         For maker strategies, it's often useful to clear out any old,
@@ -17,6 +17,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
 from definitions.logger import setup_logging
+from definitions.orders import GridOrder
 from strategies.base_strategy import BaseStrategy
 
 
@@ -65,10 +66,10 @@ class RangeConfig:
 @dataclass
 class OrderGrid:
     """Represents an order grid for a trading pair."""
-    buy_orders: Dict[float, Dict[str, Any]] = field(default_factory=dict)
-    sell_orders: Dict[float, Dict[str, Any]] = field(default_factory=dict)
-    active_orders: List[Dict[str, Any]] = field(default_factory=list)
-    # Track order history
+    buy_orders: Dict[float, GridOrder] = field(default_factory=dict)
+    sell_orders: Dict[float, GridOrder] = field(default_factory=dict)
+    active_orders: List[GridOrder] = field(default_factory=list)
+    # Track order history: plain dicts of the filled order's fields plus fill details ('filled_at')
     filled_orders_history: List[Dict[str, Any]] = field(default_factory=list)
 
     def clear(self):
@@ -210,7 +211,7 @@ class OrderBuilder:
 
     @staticmethod
     def build_orders(prices: np.ndarray, weights: np.ndarray, config: RangeConfig,
-                     pair_instance: Any, t1_balance: float, t2_balance: float) -> Tuple[List[Dict], List[Dict]]:
+                     pair_instance: Any, t1_balance: float, t2_balance: float) -> Tuple[List[GridOrder], List[GridOrder]]:
         """Build buy and sell orders."""
         mid_price = config.current_mid_price
 
@@ -255,7 +256,7 @@ class OrderBuilder:
     @staticmethod
     def _build_buy_orders(prices: List[float], base_prices: List[float], weights: List[float],
                           config: RangeConfig, pair_instance: Any, balance: float,
-                          other_balance: float, base_depleted: bool) -> List[Dict]:
+                          other_balance: float, base_depleted: bool) -> List[GridOrder]:
         """Build buy orders."""
         if not prices:
             return []
@@ -272,21 +273,21 @@ class OrderBuilder:
                 continue
 
             taker_size = size / price
-            orders.append({
-                'maker': pair_instance.t2.symbol,
-                'maker_size': size,
-                'taker': pair_instance.t1.symbol,
-                'taker_size': taker_size,
-                'price': base_price,
-                'type': 'buy'
-            })
+            orders.append(GridOrder(
+                maker=pair_instance.t2.symbol,
+                maker_size=size,
+                taker=pair_instance.t1.symbol,
+                taker_size=taker_size,
+                price=base_price,
+                type='buy'
+            ))
 
         return orders
 
     @staticmethod
     def _build_sell_orders(prices: List[float], base_prices: List[float], weights: List[float],
                            config: RangeConfig, pair_instance: Any, balance: float,
-                           other_balance: float, base_depleted: bool) -> List[Dict]:
+                           other_balance: float, base_depleted: bool) -> List[GridOrder]:
         """Build sell orders."""
         if not prices:
             return []
@@ -300,14 +301,14 @@ class OrderBuilder:
         orders = []
         for price, base_price, size in zip(prices, base_prices, sizes):
             taker_size = size * price
-            orders.append({
-                'maker': pair_instance.t1.symbol,
-                'maker_size': size,
-                'taker': pair_instance.t2.symbol,
-                'taker_size': taker_size,
-                'price': base_price,
-                'type': 'sell'
-            })
+            orders.append(GridOrder(
+                maker=pair_instance.t1.symbol,
+                maker_size=size,
+                taker=pair_instance.t2.symbol,
+                taker_size=taker_size,
+                price=base_price,
+                type='sell'
+            ))
 
         return orders
 
@@ -482,7 +483,7 @@ class RangeMakerStrategy(BaseStrategy):
             for i, order in enumerate(filled_orders):
                 self.logger.debug(
                     f"Fill #{total_fills - len(filled_orders) + i + 1}: "
-                    f"{order['type'].upper()} {order['taker_size']:.6f} @ {order['price']:.6f}"
+                    f"{order.type.upper()} {order.taker_size:.6f} @ {order.price:.6f}"
                 )
 
     async def _initialize_grid(self, pair_instance: Any, config: RangeConfig) -> None:
@@ -551,15 +552,15 @@ class RangeMakerStrategy(BaseStrategy):
 
         if grid:
             for order in grid.active_orders:
-                if order['type'] == 'sell':
-                    committed['t1'] += order['maker_size']
-                elif order['type'] == 'buy':
-                    committed['t2'] += order['maker_size']
+                if order.type == 'sell':
+                    committed['t1'] += order.maker_size
+                elif order.type == 'buy':
+                    committed['t2'] += order.maker_size
 
         return committed
 
     def _generate_orders(self, config: RangeConfig, pair_instance: Any, grid: OrderGrid,
-                         available_t1: float, available_t2: float) -> Tuple[List[Dict], List[Dict]]:
+                         available_t1: float, available_t2: float) -> Tuple[List[GridOrder], List[GridOrder]]:
         """Generate buy and sell orders based on configuration."""
         try:
             self.logger.debug("Calculating price steps...")
@@ -591,9 +592,9 @@ class RangeMakerStrategy(BaseStrategy):
                 quote_token = pair_instance.t2.symbol
                 for i, order in enumerate(buy_orders):
                     buy_info.append(
-                        f"#{i + 1}: {order['price']:.4f} "
-                        f"(b:{order['taker_size']:.6f} {base_token}, "
-                        f"q:{order['maker_size']:.6f} {quote_token})"
+                        f"#{i + 1}: {order.price:.4f} "
+                        f"(b:{order.taker_size:.6f} {base_token}, "
+                        f"q:{order.maker_size:.6f} {quote_token})"
                     )
                 self.logger.debug(f"Buy orders [{len(buy_orders)}]: {' | '.join(buy_info)}")
 
@@ -603,35 +604,35 @@ class RangeMakerStrategy(BaseStrategy):
                 quote_token = pair_instance.t2.symbol
                 for i, order in enumerate(sell_orders):
                     sell_info.append(
-                        f"#{i + 1}: {order['price']:.4f} "
-                        f"(b:{order['maker_size']:.6f} {base_token}, "
-                        f"q:{order['taker_size']:.6f} {quote_token})"
+                        f"#{i + 1}: {order.price:.4f} "
+                        f"(b:{order.maker_size:.6f} {base_token}, "
+                        f"q:{order.taker_size:.6f} {quote_token})"
                     )
                 self.logger.debug(f"Sell orders [{len(sell_orders)}]: {' | '.join(sell_info)}")
 
             # Ensure no overlap between buy and sell prices
             if buy_orders and sell_orders:
-                max_buy_price = max(order['price'] for order in buy_orders)
-                min_sell_price = min(order['price'] for order in sell_orders)
+                max_buy_price = max(order.price for order in buy_orders)
+                min_sell_price = min(order.price for order in sell_orders)
                 if max_buy_price >= min_sell_price:
                     self.logger.error(
                         f"PRICE OVERLAP DETECTED: max buy {max_buy_price:.6f} >= min sell {min_sell_price:.6f}")
                     # Filter out overlapping orders
-                    buy_orders = [order for order in buy_orders if order['price'] < min_sell_price]
-                    sell_orders = [order for order in sell_orders if order['price'] > max_buy_price]
+                    buy_orders = [order for order in buy_orders if order.price < min_sell_price]
+                    sell_orders = [order for order in sell_orders if order.price > max_buy_price]
                     self.logger.warning(f"Filtered to {len(buy_orders)} buy and {len(sell_orders)} sell orders")
 
             # Ensure mid price is between buy and sell prices
             if buy_orders and sell_orders:
-                max_buy_price = max(order['price'] for order in buy_orders)
-                min_sell_price = min(order['price'] for order in sell_orders)
+                max_buy_price = max(order.price for order in buy_orders)
+                min_sell_price = min(order.price for order in sell_orders)
                 if not (max_buy_price < config.current_mid_price < min_sell_price):
                     self.logger.warning(
                         f"Mid price {config.current_mid_price:.6f} not between buy ({max_buy_price:.6f}) and sell ({min_sell_price:.6f})")
 
             # Store original prices for debugging
             for order in buy_orders + sell_orders:
-                order['original_price'] = order.get('base_price', order['price'])
+                order.original_price = order.price
 
             return buy_orders, sell_orders
 
@@ -639,10 +640,10 @@ class RangeMakerStrategy(BaseStrategy):
             self.logger.error(f"Error generating orders: {e}", exc_info=True)
             return [], []
 
-    def _update_grid(self, grid: OrderGrid, buy_orders: List[Dict], sell_orders: List[Dict]) -> None:
+    def _update_grid(self, grid: OrderGrid, buy_orders: List[GridOrder], sell_orders: List[GridOrder]) -> None:
         """Update the order grid with new orders."""
-        grid.buy_orders = {order['price']: order for order in buy_orders}
-        grid.sell_orders = {order['price']: order for order in sell_orders}
+        grid.buy_orders = {order.price: order for order in buy_orders}
+        grid.sell_orders = {order.price: order for order in sell_orders}
         grid.active_orders = buy_orders + sell_orders
 
     def update_mid_price(self, pair_key: str, new_mid_price: float) -> None:
@@ -1,9 +1,10 @@
 import asyncio
+import copy
 import json
 import os
 import time
 import uuid
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, is_dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 
@@ -11,7 +12,9 @@ import aiohttp
 import yaml
 
 from definitions.error_handler import OperationalError
+from definitions.file_io import ControlFile, run_file_io, submit_file_io
 from definitions.pair import Pair
+from definitions.write_behind import WriteBehindRecord
 from beta.thorchain_def import get_thorchain_quote, execute_thorchain_swap, check_thorchain_path_status, \
     get_actual_swap_received
 from definitions.token import Token
@@ -45,12 +48,24 @@ class TradeMetrics:
 
 
 class ContinuousTradeState:
-    """Manages persistent state for continuous trading: anchor, direction, metrics."""
+    """Manages persistent state for continuous trading: anchor, direction, metrics.
+
+    The state is a record of the process-wide state store; the YAML file at
+    ``state_file_path`` is only read when the store has no record yet (earlier versions).
+    Saves are write-behind: ``save`` snapshots the state and returns, and a background
+    writer normalizes and stores the latest snapshot (see WriteBehindRecord).
+    """
+
+    NAMESPACE = "thorchain_continuous"
 
     def __init__(self, strategy: 'ThorChainContinuousStrategy', state_id: str = "global"):
         self.strategy = strategy
         self.check_id = state_id
         self.state_file_path = strategy.get_dex_history_file_path("state")
+        self.state_key = os.path.basename(self.state_file_path)
+        self.writer = WriteBehindRecord(strategy.config_manager.state_store, self.NAMESPACE, self.state_key,
+                                        encode=self._encode_for_store, on_error=self._handle_save_error,
+                                        logger=strategy.config_manager.general_log)
 
         # Initialize with default state
         self.state_data: Dict[str, Any] = {
@@ -104,12 +119,22 @@ class ContinuousTradeState:
         return data  # Primitives are fine
 
     def load(self) -> None:
-        """Load state from JSON file if exists."""
+        """Load state from the state store, or from the legacy state file if it exists."""
         if self.strategy.dry_mode:
             self._handle_dry_mode_load()
             return
 
-        if os.path.exists(self.state_file_path):
+        try:
+            stored = self.strategy.config_manager.state_store.get(self.NAMESPACE, self.state_key)
+        except Exception as e:
+            self._handle_load_error(e)
+            return
+        if stored is not None:
+            try:
+                self._process_loaded_state(stored)
+            except Exception as e:
+                self._handle_load_error(e)
+        elif os.path.exists(self.state_file_path):
             self._load_existing_state()
         else:
             self._ensure_dict_floats('starting_balances')
@@ -163,7 +188,8 @@ class ContinuousTradeState:
         self.state_data.setdefault('success_count', 0)
         self.state_data.setdefault('virtual_balances', self.state_data['starting_balances'])
 
-    def _ensure_numeric_fields(self):
+    def _ensure_numeric_fields(self, data: Optional[Dict[str, Any]] = None):
+        data = self.state_data if data is None else data
         numeric_fields = {
             'anchor_rate': 0.0,
             'last_sent': 0.0,
@@ -175,21 +201,21 @@ class ContinuousTradeState:
             'success_count': 0,
         }
         for key, default in numeric_fields.items():
-            if key in self.state_data:
+            if key in data:
                 try:
-                    self.state_data[key] = float(self.state_data[key])
+                    data[key] = float(data[key])
                 except (ValueError, TypeError):
                     self.strategy.config_manager.general_log.warning(
-                        f"Invalid {key}: {self.state_data[key]}; defaulting to {default}.")
-                    self.state_data[key] = default
+                        f"Invalid {key}: {data[key]}; defaulting to {default}.")
+                    data[key] = default
         for key, default in int_fields.items():
-            if key in self.state_data:
+            if key in data:
                 try:
-                    self.state_data[key] = int(self.state_data[key])
+                    data[key] = int(data[key])
                 except (ValueError, TypeError):
                     self.strategy.config_manager.general_log.warning(
-                        f"Invalid {key}: {self.state_data[key]}; defaulting to {default}.")
-                    self.state_data[key] = default
+                        f"Invalid {key}: {data[key]}; defaulting to {default}.")
+                    data[key] = default
 
     def _process_metrics_field(self):
         if 'metrics' in self.state_data and isinstance(self.state_data['metrics'], dict):
@@ -240,14 +266,15 @@ class ContinuousTradeState:
         self.strategy.config_manager.general_log.warning(
             f"Failed to load state from '{self.state_file_path}': {e}; using defaults.")
 
-    def _ensure_dict_floats(self, key: str) -> None:
-        """Ensure state_data[key] is dict with float values."""
-        if key not in self.state_data:
+    def _ensure_dict_floats(self, key: str, state: Optional[Dict[str, Any]] = None) -> None:
+        """Ensure state[key] (state_data by default) is dict with float values."""
+        state = self.state_data if state is None else state
+        if key not in state:
             return
-        data = self.state_data[key]
+        data = state[key]
         if not isinstance(data, dict):
             self.strategy.config_manager.general_log.warning(f"{key} not dict; defaulting to {{}}.")
-            self.state_data[key] = {}
+            state[key] = {}
             return
         for k, v in list(data.items()):
             try:
@@ -257,8 +284,12 @@ class ContinuousTradeState:
                 self.strategy.config_manager.general_log.warning(f"Invalid {key}.{k}: {v}; defaulting to 0.0.")
                 data[k] = 0.0
 
-    def save(self, update_data: Dict[str, Any] = None) -> None:
-        """Save state to YAML with optional updates."""
+    def save(self, update_data: Dict[str, Any] = None, flush: bool = False) -> None:
+        """Apply optional updates and queue the state for the background writer.
+
+        ``flush`` writes it without debouncing and syncs the store, for transitions that
+        must survive a crash (swap sent, refund pending).
+        """
         if update_data:
             # Ensure numeric fields stay as floats
             for key in ['last_sent', 'last_received', 'anchor_rate', 'cumulative_surplus_t1', 'cumulative_surplus_t2']:
@@ -268,61 +299,87 @@ class ContinuousTradeState:
                     except (TypeError, ValueError):
                         update_data[key] = 0.0
             self.state_data.update(update_data)
-        # Ensure all numeric fields are floats
-        self._ensure_numeric_fields()
-        self._ensure_dict_floats('starting_balances')
-        self._ensure_dict_floats('virtual_balances')
-        # Set last_update before serialization
+            for key in ('starting_balances', 'virtual_balances'):
+                if key in update_data:
+                    self._ensure_dict_floats(key)
+        # Avoid saving empty/invalid state
+        if not self.state_data or all(v is None for v in self.state_data.values()):
+            self.strategy.config_manager.general_log.warning("Skipping save: state is empty/invalid.")
+            return
         self.state_data['last_update'] = time.time()
-        # Create a copy for saving to avoid modifying in-memory state
-        save_data = self.state_data.copy()
+        self.writer.submit(self._snapshot(), flush=flush)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Copy of the state the writer thread can own: the loop keeps mutating nested dicts and metrics."""
+        snapshot = dict(self.state_data)
+        for key, value in snapshot.items():
+            if isinstance(value, dict):
+                snapshot[key] = dict(value)
+            elif is_dataclass(value):
+                snapshot[key] = copy.copy(value)
+        return snapshot
+
+    def _encode_for_store(self, save_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a snapshot into the stored record. Runs on the writer thread."""
+        self._ensure_numeric_fields(save_data)
+        self._ensure_dict_floats('starting_balances', save_data)
+        self._ensure_dict_floats('virtual_balances', save_data)
         # Convert metrics to dict if it's a dataclass
-        if 'metrics' in save_data and hasattr(save_data['metrics'], '__dict__'):
+        if 'metrics' in save_data and is_dataclass(save_data['metrics']):
             save_data['metrics'] = asdict(save_data['metrics'])
         # Convert enums to strings for serialization
         if 'last_direction' in save_data and isinstance(save_data['last_direction'], TradeDirection):
             save_data['last_direction'] = save_data['last_direction'].value
-        # Avoid saving empty/invalid state
-        if not save_data or all(v is None for v in save_data.values()):
-            self.strategy.config_manager.general_log.warning("Skipping save: state is empty/invalid.")
-            return
-        try:
-            with open(self.state_file_path, 'w') as f:
-                yaml.safe_dump(save_data, f)
-            self.strategy.config_manager.general_log.debug("State saved successfully in YAML format.")
-        except Exception as e:
-            self.strategy.error_handler.handle(OperationalError(f"Failed to save state: {e}"),
-                                               context={"stage": "save_state"})
+        return save_data
+
+    def _handle_save_error(self, e: Exception) -> None:
+        self.strategy.error_handler.handle(OperationalError(f"Failed to save state: {e}"),
+                                           context={"stage": "save_state"})
+
+    async def flush(self) -> None:
+        """Wait, off the event loop, until every queued save is stored."""
+        await asyncio.to_thread(self.writer.flush)
 
     def archive(self, reason: str) -> None:
-        """Archive state to metrics file on pause/error."""
-        metrics_file = self.strategy.get_dex_history_file_path("metrics")
+        """Archive state to the store's archive namespace on pause/error."""
+        store = self.strategy.config_manager.state_store
+        timestamp = time.time()
+        self.writer.discard()  # A queued save must not bring the active state back
         try:
-            with open(metrics_file, 'a') as f:
-                yaml.safe_dump({**self.state_data, 'archive_reason': reason, 'timestamp': time.time()}, f)
-            os.remove(self.state_file_path)  # Clear active state
+            store.put(f"{self.NAMESPACE}/archive", f"{self.state_key}-{int(timestamp)}",
+                      self.serialize_for_json({**self.state_data, 'archive_reason': reason, 'timestamp': timestamp}))
+            store.delete(self.NAMESPACE, self.state_key)  # Clear active state
+            if os.path.exists(self.state_file_path):
+                os.remove(self.state_file_path)
         except Exception as e:
             self.strategy.error_handler.handle(OperationalError(f"Failed to archive state: {e}"),
                                                context={"stage": "archive"})
 
-    def log_trade(self, trade_data: Dict) -> None:                                                                                                                                           
-        """Append trade to persistent log file using JSON Lines format."""                                                                                                                   
-        log_file = self.strategy.get_dex_history_file_path("trades")                                                                                                                         
-        trade_entry = {                                                                                                                                                                      
-            **trade_data,                                                                                                                                                                    
-            'timestamp': time.time(),                                                                                                                                                        
-            'direction': self.state_data.get('last_direction')                                                                                                                               
-        }                                                                                                                                                                                    
-        try:                                                                                                                                                                                 
-            with open(log_file, 'a') as f:                                                                                                                                                   
-                # Use JSON Lines format: one JSON object per line                                                                                                                            
-                json_line = json.dumps(trade_entry)                                                                                                                                          
-                f.write(json_line + '\n')                                                                                                                                                    
-            self.strategy.config_manager.general_log.debug("Trade logged in JSON Lines format.")                                                                                             
-        except Exception as e:                                                                                                                                                               
-            self.strategy.error_handler.handle(OperationalError(f"Failed to log trade: {e}"),                                                                                                
-                                               context={"stage": "log_trade"})  
+    def log_trade(self, trade_data: Dict) -> None:
+        """Append trade to persistent log file using JSON Lines format (written on the file I/O thread)."""
+        log_file = self.strategy.get_dex_history_file_path("trades")
+        trade_entry = {
+            **trade_data,
+            'timestamp': time.time(),
+            'direction': self.state_data.get('last_direction')
+        }
+        try:
+            # Use JSON Lines format: one JSON object per line
+            json_line = json.dumps(self.serialize_for_json(trade_entry))
+        except Exception as e:
+            self.strategy.error_handler.handle(OperationalError(f"Failed to log trade: {e}"),
+                                               context={"stage": "log_trade"})
+            return
+        submit_file_io(self._append_trade_line, log_file, json_line)
 
+    def _append_trade_line(self, log_file: str, json_line: str) -> None:
+        try:
+            with open(log_file, 'a') as f:
+                f.write(json_line + '\n')
+            self.strategy.config_manager.general_log.debug("Trade logged in JSON Lines format.")
+        except Exception as e:
+            self.strategy.error_handler.handle(OperationalError(f"Failed to log trade: {e}"),
+                                               context={"stage": "log_trade"})
 
 
 class ThorChainContinuousStrategy(BaseStrategy):
@@ -782,14 +839,16 @@ class ThorChainContinuousStrategy(BaseStrategy):
         """Handle swap failure and pause trading if refunded."""
         if 'refunded' in result.get('reason', '').lower():
             reason = f"Swap refunded for {direction.value}"
-            with open(self.pause_file_path, 'w') as f:
-                yaml.dump({'reason': reason, 'trade_details': eval_result}, f)
+            await run_file_io(ControlFile.watch(self.pause_file_path).write,
+                              yaml.safe_dump({'reason': reason,
+                                              'trade_details': self.state.serialize_for_json(eval_result)}))
 
             self.config_manager.general_log.critical(f"[{log_prefix}] {reason}")
             self.state.save({
                 'status': 'AWAITING_REFUND',
                 'awaiting_refund_since': time.time()
-            })
+            }, flush=True)
+            await self.state.flush()
 
     def _calculate_profitability(self, cost: float, gross: float, fee: float) -> Dict[str, Any]:
         """Calculate profitability metrics."""
@@ -831,7 +890,26 @@ class ThorChainContinuousStrategy(BaseStrategy):
         return []
 
     async def thread_init_async_action(self, pair_instance: 'Pair'):
-        pass
+        await self._recover_pending_swap()
+
+    async def _recover_pending_swap(self) -> None:
+        """Pause trading if a swap was sent before the last shutdown but its result was never recorded.
+
+        Balances and anchor metrics cannot be trusted until the operator checks the swap, so the
+        swap details go into the pause file and trading resumes once that file is removed.
+        """
+        pending = self.state.state_data.get('pending_swap') if self.state else None
+        if not pending or self.dry_mode:
+            return
+        reason = (f"Swap {pending.get('txid')} was sent before the last shutdown and its result was "
+                  f"never recorded. Check it and reconcile balances, then remove this file to resume.")
+        await run_file_io(ControlFile.watch(self.pause_file_path).write,
+                          yaml.safe_dump({'reason': reason,
+                                          'pending_swap': self.state.serialize_for_json(pending)}))
+        self.config_manager.general_log.critical(reason)
+        # The pause file now holds the details; clear the record so resuming does not pause again
+        self.state.save({'pending_swap': None}, flush=True)
+        await self.state.flush()
 
     async def process_pair_async(self, pair_instance: 'Pair') -> None:
         """Core continuous trading logic executed asynchronously."""
@@ -905,24 +983,23 @@ class ThorChainContinuousStrategy(BaseStrategy):
         self.config_manager.general_log.info(f"[{log_prefix}] Finished check for {pair_instance.symbol}.")
 
     def _is_paused(self) -> bool:
-        """Check if trading is paused."""
-        if not os.path.exists(self.pause_file_path):
+        """Check if trading is paused (in-memory view of the pause file, see ControlFile)."""
+        pause_file = ControlFile.watch(self.pause_file_path)
+        if not pause_file.exists:
             return False
 
-        try:
-            with open(self.pause_file_path, 'r') as f:
-                pause_reason = yaml.load(f).get('reason', 'Unknown reason.')
+        if pause_file.data is not None:
+            pause_reason = pause_file.data.get('reason', 'Unknown reason.')
             self.config_manager.general_log.warning(
                 f"TRADING PAUSED. Reason: {pause_reason}. "
                 f"Bot is monitoring for refund. Trading will resume automatically."
             )
-            return True
-        except (Exception) as e:
+        else:
             self.config_manager.error_handler.handle(
-                OperationalError(f"Could not read pause file: {str(e)}"),
+                OperationalError(f"Could not read pause file: {pause_file.error}"),
                 context={"file": self.pause_file_path}
             )
-            return True
+        return True
 
     def _generate_trading_report(self, eval_result: Dict, direction: TradeDirection, pair_instance: 'Pair') -> str:
         """Generate comprehensive trading report showing Thorchain quote vs required conditions."""
@@ -1230,7 +1307,21 @@ class ThorChainContinuousStrategy(BaseStrategy):
         )
         if not txid:
             return {'success': False, 'reason': 'Execution failed'}
-
+        # Funds are in flight from here: store the swap before anything else can fail, so a
+        # restart before its result is recorded pauses trading (see _recover_pending_swap)
+        self.state.save({'pending_swap': {'txid': txid, 'direction': direction.value, 'amount': float(amount),
+                                          'sent_at': time.time()}}, flush=True)
+        await self.state.flush()
+
+        result = await self._settle_live_swap(txid, quote, amount, direction, to_token_symbol)
+        if not result['success']:
+            # Failed, refunded or unreadable: the swap is settled as far as this run can tell
+            self.state.save({'pending_swap': None})
+        return result
+
+    async def _settle_live_swap(self, txid: str, quote: Dict, amount: float, direction: TradeDirection,
+                                to_token_symbol: str) -> Dict[str, Any]:
+        """Check fees, wait for the outcome of a sent swap and read the amount received."""
         # Validate fees
         decimals_to = quote.get('decimals_to', 8)
         outbound_fee_base = float(quote.get('fees', {}).get('outbound', 0)) / (10 ** decimals_to)
@@ -1246,9 +1337,8 @@ class ThorChainContinuousStrategy(BaseStrategy):
             return {'success': False, 'reason': f'Status: {status}'}
 
         # Get actual received amount
-        to_chain = to_token_symbol
         actual_received = await get_actual_swap_received(
-            txid, self.http_session, self.thor_tx_url, to_chain,
+            txid, self.http_session, self.thor_tx_url, to_token_symbol,
             quote.get('inbound_address'), self.thor_api_url
         )
         if actual_received is None:
@@ -1264,6 +1354,7 @@ class ThorChainContinuousStrategy(BaseStrategy):
         # Update state with new trade - ENSURE VALUES ARE FLOATS
         self.state.state_data['last_sent'] = float(amount)
         self.state.state_data['last_received'] = float(actual_received)
+        self.state.state_data['pending_swap'] = None
 
         # Calculate metrics
         effective_rate = actual_received / amount if direction == TradeDirection.TOKEN1_TO_TOKEN2 else amount / actual_received
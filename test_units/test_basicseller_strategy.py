@@ -9,6 +9,9 @@ import pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from definitions.config_manager import ConfigManager
+from definitions.orders import VirtualOrder
+from definitions.state_store import SqliteStateStore
+from definitions.pair import DexPair
 from strategies.basicseller_strategy import BasicSellerStrategy
 
 
@@ -36,6 +39,7 @@ class BasicSellerStrategyTester:
         self.pair.dex.disabled = False
         self.pair.dex.order = None
         self.pair.min_sell_price_usd = self.initial_min_sell_price_usd
+        self.config_manager.state_store.clear(DexPair.HISTORY_NAMESPACE)
 
     @contextmanager
     def _patch_dependencies(self):
@@ -146,7 +150,7 @@ class BasicSellerStrategyTester:
             # Arrange
             self.pair.dex.disabled = False
             self.pair.dex.order = {'id': 'mock_order_id_456', 'status': 'open'}
-            self.pair.dex.current_order = {'maker': self.pair.t1.symbol}
+            self.pair.dex.current_order = VirtualOrder(maker=self.pair.t1.symbol)
             mocks['get_status'].return_value = {'id': 'mock_order_id_456', 'status': 'finished'}
 
             # Act
@@ -244,9 +248,10 @@ class BasicSellerStrategyTester:
 
 
 @pytest.fixture(scope="module")
-def mock_strategy_cli():
+def mock_strategy_cli(tmp_path_factory):
     """Fixture to create a mock strategy instance for testing in CLI mode."""
     config_manager = ConfigManager(strategy="basic_seller")
+    config_manager.state_store = SqliteStateStore(str(tmp_path_factory.mktemp("basic_seller") / "state.sqlite3"))
     # Simulate CLI arguments for initialization
     config_manager.initialize(
         token_to_sell="BLOCK",
@@ -10,11 +10,22 @@ import json
 import logging
 from unittest.mock import AsyncMock, MagicMock, patch, mock_open
 
-import ccxt
+import ccxt.async_support as ccxt
 import pytest
 
 # Note: We need to mock the environment where CCXTManager operates
 from definitions.ccxt_manager import CCXTManager
+from definitions.markets_cache import MarketsCache
+from definitions.proxy_health import ProxyHealth
+
+
+def _probe_result(health, up):
+    """Stand-in for ProxyHealth.probe that sets the state without touching the network."""
+    if up:
+        health.record_success()
+    else:
+        health.record_failure()
+    return up
 
 
 @pytest.fixture
@@ -31,15 +42,23 @@ def mock_config_manager():
 class TestCCXTManager:
 
     @pytest.fixture(autouse=True)
-    def setup(self, mock_config_manager):
+    def setup(self, mock_config_manager, tmp_path):
         self.mock_cm = mock_config_manager
         self.manager = CCXTManager(self.mock_cm)
+        self.manager.markets_cache = MarketsCache(str(tmp_path / "markets_cache"))
         # Reset class state before each test
         CCXTManager._proxy_service_instance = None
         CCXTManager._proxy_service_thread = None
         CCXTManager._proxy_ref_count = 0
+        CCXTManager._proxy_health = ProxyHealth("127.0.0.1", CCXTManager._proxy_port)
+        CCXTManager._exchanges = {}
+        CCXTManager._exchange_keys = {}
         # Setup a mock for the proxy logger since it's used at class level
         CCXTManager._proxy_logger = MagicMock(spec=logging.Logger)
+        yield
+        CCXTManager._proxy_health = ProxyHealth("127.0.0.1", CCXTManager._proxy_port)
+        CCXTManager._exchanges = {}
+        CCXTManager._exchange_keys = {}
 
     def test_register_unregister_strategy(self):
         assert CCXTManager._proxy_ref_count == 0
@@ -87,10 +106,8 @@ class TestCCXTManager:
         fake_thread.join.assert_called_once_with(timeout=10.0)
         CCXTManager._proxy_logger.warning.assert_called_once()
 
-    @patch("definitions.ccxt_manager.is_port_open")
     @patch.object(ccxt, "binance")
-    def test_init_ccxt_with_private_api(self, mock_binance, mock_is_port_open):
-        mock_is_port_open.return_value = True
+    def test_init_ccxt_with_private_api(self, mock_binance):
         mock_exchange = MagicMock()
         mock_binance.return_value = mock_exchange
         # Setup mock API keys
@@ -109,10 +126,8 @@ class TestCCXTManager:
         self.manager.logger.error.assert_not_called()
         self.mock_cm.ccxt_log.error.assert_not_called()
 
-    @patch("definitions.ccxt_manager.is_port_open")
     @patch.object(ccxt, "binance")
-    def test_init_ccxt_with_hostname(self, mock_binance, mock_is_port_open):
-        mock_is_port_open.return_value = True
+    def test_init_ccxt_with_hostname(self, mock_binance):
         mock_exchange = MagicMock()
         mock_binance.return_value = mock_exchange
 
@@ -129,9 +144,8 @@ class TestCCXTManager:
             'hostname': 'global.binance.com',
         })
 
-    @patch("definitions.ccxt_manager.is_port_open")
     @patch("definitions.ccxt_manager.getattr")
-    def test_init_ccxt_failure(self, mock_getattr, mock_is_port_open):
+    def test_init_ccxt_failure(self, mock_getattr):
         # Test handling of unsupported exchange
         mock_getattr.side_effect = AttributeError
         instance = self.manager.init_ccxt_instance("fake_exchange")
@@ -139,7 +153,7 @@ class TestCCXTManager:
         self.mock_cm.ccxt_log.error.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch("definitions.ccxt_manager.CCXTManager._ccxt_blocking_call_with_retry", new_callable=AsyncMock)
+    @patch("definitions.ccxt_manager.CCXTManager._ccxt_call_with_retry", new_callable=AsyncMock)
     async def test_fetch_order_book_with_rate_limit(self, mock_retry):
         mock_retry.return_value = {"bids": [], "asks": []}
         mock_ccxt = MagicMock()
@@ -148,7 +162,7 @@ class TestCCXTManager:
         assert result == mock_retry.return_value
 
     @pytest.mark.asyncio
-    @patch("definitions.ccxt_manager.CCXTManager._ccxt_blocking_call_with_retry", new_callable=AsyncMock)
+    @patch("definitions.ccxt_manager.CCXTManager._ccxt_call_with_retry", new_callable=AsyncMock)
     async def test_fetch_free_balance(self, mock_retry):
         mock_retry.return_value = {"BTC": 1.5}
         mock_ccxt = MagicMock()
@@ -157,19 +171,57 @@ class TestCCXTManager:
 
     @pytest.mark.asyncio
     @patch("definitions.ccxt_manager.rpc_call", new_callable=AsyncMock)
-    @patch("definitions.ccxt_manager.CCXTManager._start_proxy")
+    @patch("definitions.ccxt_manager.CCXTManager._start_proxy", new_callable=AsyncMock)
     async def test_fetch_tickers_with_proxy(self, mock_start_proxy, mock_rpc_call):
         mock_rpc_call.return_value = {}
         mock_ccxt = MagicMock()
-        # Set port closed to trigger proxy start, then open to use it
-        with patch("definitions.ccxt_manager.is_port_open", side_effect=[False, True]):
+        # Proxy found down to trigger proxy start, then up to use it
+        with patch.object(ProxyHealth, "probe", autospec=True) as mock_probe:
+            mock_probe.side_effect = lambda health: _probe_result(health, mock_probe.call_count > 1)
             result = await self.manager.ccxt_call_fetch_tickers(mock_ccxt, ["BTC/USDT"])
-            mock_start_proxy.assert_called_once()
+            mock_start_proxy.assert_awaited_once()
             mock_rpc_call.assert_awaited_once()
 
-    def test_start_proxy_handles_process_creation_failure(self):
-        with patch("definitions.ccxt_manager.AsyncPriceService", side_effect=OSError("Process error")):
-            self.manager._start_proxy()
+    @pytest.mark.asyncio
+    @patch("definitions.ccxt_manager.rpc_call", new_callable=AsyncMock)
+    @patch("definitions.ccxt_manager.CCXTManager._start_proxy", new_callable=AsyncMock)
+    async def test_fetch_tickers_falls_back_when_proxy_fails(self, mock_start_proxy, mock_rpc_call):
+        """A failed proxy request marks it down so the retry goes to the exchange directly."""
+        CCXTManager._proxy_health.record_success()
+        mock_rpc_call.side_effect = ConnectionError("proxy died")
+        self.manager.error_handler.handle_async = AsyncMock(return_value=True)
+        mock_ccxt = MagicMock()
+        mock_ccxt.fetch_tickers = AsyncMock(return_value={"BTC/USDT": {}})
+
+        result = await self.manager.ccxt_call_fetch_tickers(mock_ccxt, ["BTC/USDT"])
+
+        assert result == {"BTC/USDT": {}}
+        assert CCXTManager._proxy_health.is_up() is False
+        mock_rpc_call.assert_awaited_once()
+        mock_start_proxy.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_start_proxy_waits_for_port_without_blocking(self):
+        """The proxy thread is started and its port polled with async probes until it opens."""
+        service = MagicMock()
+        service.run = AsyncMock()
+        with patch("definitions.ccxt_manager.AsyncPriceService", return_value=service), \
+                patch("definitions.ccxt_manager.asyncio.sleep", new_callable=AsyncMock) as mock_sleep, \
+                patch.object(ProxyHealth, "probe", autospec=True) as mock_probe:
+            mock_probe.side_effect = lambda health: _probe_result(health, mock_probe.call_count > 2)
+            await self.manager._start_proxy()
+
+        assert mock_probe.call_count == 3  # Port free, still starting, then open
+        assert mock_sleep.await_count == 2
+        assert CCXTManager._proxy_service_instance is service
+        assert CCXTManager._proxy_health.is_up()
+
+    @pytest.mark.asyncio
+    async def test_start_proxy_handles_process_creation_failure(self):
+        with patch("definitions.ccxt_manager.AsyncPriceService", side_effect=OSError("Process error")), \
+                patch.object(ProxyHealth, "probe", autospec=True) as mock_probe:
+            mock_probe.side_effect = lambda health: _probe_result(health, False)
+            await self.manager._start_proxy()
             CCXTManager._proxy_logger.error.assert_called()
             # Verify the proxy process is set to None after failure
             assert CCXTManager._proxy_service_instance is None
@@ -193,19 +245,124 @@ class TestCCXTManager:
             self.mock_cm.ccxt_log.reset_mock()
 
     @pytest.mark.asyncio
-    @patch("asyncio.get_running_loop")
-    async def test_ccxt_blocking_retry(self, mock_loop):
-        # Setup a mock function that fails then succeeds
-        future1 = asyncio.Future()
-        future1.set_exception(Exception('Transient'))
-        future2 = asyncio.Future()
-        future2.set_result("Success")
-        mock_loop.return_value.run_in_executor.side_effect = [future1, future2]
+    async def test_ccxt_call_retry(self):
+        # Setup a mock exchange method that fails then succeeds
+        mock_ccxt = MagicMock()
+        mock_ccxt.fetch_ticker = AsyncMock(side_effect=[Exception('Transient'), "Success"])
         # Setup error handler to allow one retry
         self.manager.error_handler.handle_async = AsyncMock(return_value=True)
 
-        result = await self.manager._ccxt_blocking_call_with_retry(
-            lambda: None, {}, "param"
+        result = await self.manager._ccxt_call_with_retry(
+            mock_ccxt, "fetch_ticker", {}, "param"
         )
         assert result == "Success"
+        mock_ccxt.fetch_ticker.assert_awaited_with("param")
         self.manager.error_handler.handle_async.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_exchange_clones_per_loop_share_markets(self):
+        """Requests use one async clone per event loop; markets load once, with backoff, and are shared."""
+        instance = self.manager.init_ccxt_instance("binance")
+        assert instance.markets is None
+        clone = self.manager.exchange_for_loop(instance)
+        assert clone is not instance
+        assert self.manager.exchange_for_loop(instance) is clone
+
+        markets = {"BTC/USDT": {"id": "BTCUSDT", "symbol": "BTC/USDT", "base": "BTC", "quote": "USDT",
+                                "baseId": "BTC", "quoteId": "USDT", "type": "spot", "spot": True,
+                                "precision": {}, "limits": {}}}
+
+        async def load_markets(reload=False):
+            if clone.load_markets.await_count == 1:
+                raise ccxt.NetworkError("timeout")
+            clone.markets = markets
+            clone.currencies = {}
+            return markets
+
+        clone.load_markets = AsyncMock(side_effect=load_markets)
+        self.manager.error_handler.handle_async = AsyncMock(return_value=True)
+        with patch("definitions.ccxt_manager.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            assert await self.manager.ensure_markets(instance) is True
+        mock_sleep.assert_awaited_once_with(CCXTManager.MARKETS_RETRY_DELAY)
+        assert instance.symbols == ["BTC/USDT"]
+
+        # A loop started later gets a clone that already has the markets
+        other = await asyncio.to_thread(lambda: asyncio.run(self._clone_in_new_loop(instance)))
+        assert other is not clone and other.symbols == ["BTC/USDT"]
+
+        await self.manager.close_loop_exchanges()
+        assert self.manager.exchange_for_loop(instance) is not clone
+        await self.manager.close_loop_exchanges()
+
+    @pytest.mark.asyncio
+    async def test_ensure_markets_uses_disk_cache(self):
+        """Cached markets are used without a download; a stale cache is served and refreshed in the background."""
+        cache = self.manager.markets_cache
+        markets = {"BTC/USDT": {"id": "BTCUSDT", "symbol": "BTC/USDT", "base": "BTC", "quote": "USDT",
+                                "baseId": "BTC", "quoteId": "USDT", "type": "spot", "spot": True,
+                                "precision": {}, "limits": {}}}
+        assert cache.save("binance", None, markets, {})
+
+        instance = self.manager.init_ccxt_instance("binance")
+        clone = self.manager.exchange_for_loop(instance)
+        clone.load_markets = AsyncMock()
+        assert await self.manager.ensure_markets(instance) is True
+        assert instance.symbols == ["BTC/USDT"] and clone.symbols == ["BTC/USDT"]
+        clone.load_markets.assert_not_awaited()
+        assert self.manager._markets_refresh_task is None
+
+        CCXTManager.release_ccxt_instance(instance)
+        await self.manager.close_loop_exchanges()
+        cache.ttl = -1
+        other = self.manager.init_ccxt_instance("binance")
+        assert other is not instance
+        other_clone = self.manager.exchange_for_loop(other)
+        other_clone.load_markets = AsyncMock()
+        with patch.object(cache, "save_in_background") as mock_save:
+            assert await self.manager.ensure_markets(other) is True
+            await self.manager._markets_refresh_task
+        other_clone.load_markets.assert_awaited_once_with(True)
+        mock_save.assert_called_once()
+        await self.manager.close_loop_exchanges()
+
+    @pytest.mark.asyncio
+    async def test_exchange_instances_shared_and_ref_counted(self):
+        """Managers asking for the same exchange share one instance until the last one releases it."""
+        other_manager = CCXTManager(self.mock_cm)
+        first = self.manager.init_ccxt_instance("binance")
+        second = other_manager.init_ccxt_instance("binance")
+        assert second is first
+        assert self.manager.init_ccxt_instance("binance", hostname="binance.us") is not first
+        assert other_manager.exchange_for_loop(first) is self.manager.exchange_for_loop(first)
+
+        CCXTManager.release_ccxt_instance(first)
+        assert self.manager.init_ccxt_instance("binance") is first
+        CCXTManager.release_ccxt_instance(first)
+        CCXTManager.release_ccxt_instance(first)
+        # Unregistered, but kept until this loop's clone is closed
+        assert id(first) in CCXTManager._exchanges
+        fresh = self.manager.init_ccxt_instance("binance")
+        assert fresh is not first
+        await self.manager.close_loop_exchanges()
+        assert id(first) not in CCXTManager._exchanges
+        assert id(fresh) in CCXTManager._exchanges
+
+    @pytest.mark.asyncio
+    async def test_loop_clones_share_one_rate_limiter(self):
+        """Clones of one exchange on different loops draw from a single throttle."""
+        instance = self.manager.init_ccxt_instance("binance")
+        clone = self.manager.exchange_for_loop(instance)
+        other = await asyncio.to_thread(lambda: asyncio.run(self._clone_in_new_loop(instance)))
+        assert clone.throttle is other.throttle
+
+        with patch("definitions.ccxt_manager.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            await clone.throttle(1)
+            await clone.throttle(2)
+        mock_sleep.assert_awaited_once()
+        assert mock_sleep.await_args.args[0] == pytest.approx(1.0, abs=0.1)
+        await self.manager.close_loop_exchanges()
+
+    async def _clone_in_new_loop(self, instance):
+        clone = self.manager.exchange_for_loop(instance)
+        await self.manager.close_loop_exchanges()
+        return clone
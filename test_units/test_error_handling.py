@@ -323,11 +323,11 @@ def test_ccxt_manager_proxy_error():
         mock_detect_rpc.return_value = ("user", 12345, "pass", "/path/to/datadir")
         manager = CCXTManager(mock_config)
 
-        with patch("definitions.ccxt_manager.is_port_open", return_value=False), \
+        with patch("definitions.proxy_health.ProxyHealth.probe", new_callable=AsyncMock, return_value=False), \
                 patch("definitions.ccxt_manager.AsyncPriceService", side_effect=Exception("Proxy failed")):
             # Patch the actual error_handler used by CCXTManager
             with patch.object(manager.error_handler, "handle") as mock_handle:
-                manager._start_proxy()
+                asyncio.run(manager._start_proxy())
 
                 # Verify error handler was called with CriticalError
                 assert mock_handle.called
@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.file_io import ControlFile, run_file_io, submit_file_io
+
+
+@pytest.fixture
+def pause_path(tmp_path):
+    path = str(tmp_path / "data" / "TRADING_PAUSED.json")
+    yield path
+    ControlFile._instances.pop(path, None)
+
+
+@pytest.mark.asyncio
+async def test_own_writes_are_published_immediately(pause_path):
+    """Tests that pausing and resuming through the control file update the flag without waiting for a poll."""
+    pause_file = ControlFile.watch(pause_path)
+    assert ControlFile.watch(pause_path) is pause_file
+    assert not pause_file.exists
+
+    await run_file_io(pause_file.write, json.dumps({'reason': 'refund pending'}, indent=4))
+    assert pause_file.exists
+    assert pause_file.data == {'reason': 'refund pending'}
+
+    assert await run_file_io(pause_file.remove) is True
+    assert not pause_file.exists
+    assert await run_file_io(pause_file.remove) is False
+
+
+def test_reads_do_no_syscalls(pause_path):
+    """Tests that the flag is served from memory between polls."""
+    pause_file = ControlFile.watch(pause_path)
+    with patch('definitions.file_io.os.stat', side_effect=AssertionError("stat on hot path")), \
+            patch('builtins.open', side_effect=AssertionError("open on hot path")):
+        for _ in range(100):
+            assert not pause_file.exists
+
+
+def test_external_changes_are_picked_up_by_refresh(pause_path):
+    """Tests that files created, edited or broken by hand are seen on the next poll."""
+    pause_file = ControlFile.watch(pause_path)
+    os.makedirs(os.path.dirname(pause_path), exist_ok=True)
+    with open(pause_path, 'w') as fp:
+        fp.write("reason: manual pause\n")
+    assert pause_file.refresh()
+    assert pause_file.data == {'reason': 'manual pause'}
+    assert not pause_file.refresh()  # Unchanged: not read again
+
+    with open(pause_path, 'w') as fp:
+        fp.write("reason: [unterminated\n")
+    pause_file.refresh()
+    assert pause_file.exists and pause_file.data is None and pause_file.error
+
+    os.remove(pause_path)
+    assert pause_file.refresh()
+    assert not pause_file.exists
+
+
+def test_file_io_runs_in_submission_order(tmp_path):
+    log_file = str(tmp_path / "trades.log")
+
+    def append(line):
+        with open(log_file, 'a') as fp:
+            fp.write(line + '\n')
+
+    futures = [submit_file_io(append, str(i)) for i in range(50)]
+    futures[-1].result(timeout=5)
+    with open(log_file) as fp:
+        assert fp.read().split() == [str(i) for i in range(50)]
@@ -0,0 +1,55 @@
+import gzip
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.markets_cache import MarketsCache
+
+MARKETS = {"BLOCK/BTC": {"id": "BLOCKBTC", "symbol": "BLOCK/BTC", "base": "BLOCK", "quote": "BTC",
+                         "precision": {"price": 1e-08}, "limits": {"amount": {"min": 1.0}}}}
+CURRENCIES = {"BLOCK": {"id": "BLOCK", "code": "BLOCK"}}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Tests that saved tables load back unchanged, keyed by exchange and hostname."""
+    cache = MarketsCache(str(tmp_path / "markets_cache"))
+    assert cache.save("kucoin", None, MARKETS, CURRENCIES)
+    assert cache.save("kucoin", "api.kucoin.cc", {"LTC/BTC": {"id": "LTCBTC"}}, None)
+
+    markets, currencies, age = cache.load("kucoin")
+    assert markets == MARKETS and currencies == CURRENCIES
+    assert 0 <= age < 5
+    assert cache.load("kucoin", "api.kucoin.cc")[0] == {"LTC/BTC": {"id": "LTCBTC"}}
+    assert cache.load("binance") is None
+    assert not [name for name in os.listdir(cache.cache_dir) if name.endswith(".tmp")]
+
+
+def test_unreadable_or_foreign_files_are_ignored(tmp_path):
+    """Tests that a corrupt, empty or mismatched file is treated as a cache miss."""
+    cache = MarketsCache(str(tmp_path))
+    with open(cache.path("kucoin"), "wb") as fp:
+        fp.write(b"not gzip")
+    assert cache.load("kucoin") is None
+
+    with gzip.open(cache.path("binance"), "wt") as fp:
+        fp.write('{"version": 1, "exchange": "kucoin", "markets": {"A/B": {}}}')
+    assert cache.load("binance") is None
+
+    assert cache.save("bittrex", None, {}, {})
+    assert cache.load("bittrex") is None
+
+
+def test_staleness_uses_saved_time(tmp_path):
+    """Tests that entries older than the TTL are reported stale."""
+    cache = MarketsCache(str(tmp_path), ttl=60)
+    with patch("definitions.markets_cache.time.time", return_value=time.time() - 120):
+        cache.save("kucoin", None, MARKETS, CURRENCIES)
+    _, _, age = cache.load("kucoin")
+    assert cache.is_stale(age)
+    cache.save_in_background("kucoin", None, MARKETS, CURRENCIES).join()
+    _, _, age = cache.load("kucoin")
+    assert not cache.is_stale(age)
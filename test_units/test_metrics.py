@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+import urllib.request
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.metrics import LatencyHistogram, MetricsRegistry, MetricsServer
+
+
+def test_latency_histogram_percentiles():
+    """Tests bucket counting and percentile estimation."""
+    histogram = LatencyHistogram(buckets=(0.1, 1.0, 10.0))
+    assert histogram.percentile(50) == 0.0
+    for value in [0.05] * 90 + [0.5] * 9 + [20.0]:
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 100
+    assert snapshot["max"] == 20.0
+    assert snapshot["p50"] == 0.1
+    assert snapshot["p99"] == 1.0
+    assert histogram.percentile(100) == 20.0
+    assert snapshot["buckets"] == {0.1: 90, 1.0: 9, 10.0: 0, float("inf"): 1}
+
+
+def test_registry_renders_prometheus_and_json():
+    """Tests labelled histograms, cumulative Prometheus buckets and the JSON view."""
+    registry = MetricsRegistry(prefix="test")
+    registry.observe("rpc", 0.02, method="dxGetOrder")
+    registry.observe("rpc", 2.0, method="dxGetOrder")
+    with registry.timer("stage", stage="balances"):
+        pass
+
+    text = registry.render_prometheus()
+    assert text.count("# TYPE test_rpc_seconds histogram") == 1
+    assert 'test_rpc_seconds_bucket{method="dxGetOrder",le="0.025"} 1' in text
+    assert 'test_rpc_seconds_bucket{method="dxGetOrder",le="+Inf"} 2' in text
+    assert 'test_rpc_seconds_count{method="dxGetOrder"} 2' in text
+
+    data = registry.to_dict()
+    assert data["test_stage_seconds"][0]["labels"] == {"stage": "balances"}
+    assert data["test_rpc_seconds"][0]["count"] == 2
+    json.dumps(data)
+
+
+def test_metrics_server_serves_registry():
+    """Tests that the HTTP endpoint serves both formats and is started once per process."""
+    registry = MetricsRegistry(prefix="test")
+    registry.observe("rpc", 0.1, method="dxGetMyOrders")
+    server = MetricsServer.start(0, registry=registry)
+    try:
+        assert MetricsServer.start(0, registry=registry) is server
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert 'method="dxGetMyOrders"' in response.read().decode()
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json", timeout=5) as response:
+            assert json.loads(response.read())["test_rpc_seconds"][0]["count"] == 1
+    finally:
+        MetricsServer.stop()
@@ -0,0 +1,87 @@
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.order_journal import OrderJournal
+
+
+def _journal(tmp_path, **kwargs):
+    return OrderJournal(str(tmp_path / "data" / "order_journal.jsonl"), **kwargs)
+
+
+def test_records_survive_reopen(tmp_path):
+    """Tests that puts, deletes and clears are replayed into the same index after a restart."""
+    journal = _journal(tmp_path)
+    journal.put("dex_history", "pingpong_A_B", {"side": "SELL", "dex_price": 0.3})
+    journal.put("dex_history", "pingpong_C_D", {"side": "BUY"})
+    journal.put("dex_history", "pingpong_A_B", {"side": "BUY", "dex_price": 0.29})
+    journal.delete("dex_history", "pingpong_C_D")
+    journal.put("arbitrage_states", "abc", {"status": "XBRIDGE_INITIATED"})
+    journal.clear("arbitrage_states")
+    journal.close()
+
+    reopened = _journal(tmp_path)
+    assert reopened.items("dex_history") == {"pingpong_A_B": {"side": "BUY", "dex_price": 0.29}}
+    assert reopened.get("arbitrage_states", "abc") is None
+
+
+def test_reads_are_detached_from_stored_values(tmp_path):
+    """Tests that neither the caller's object nor a returned value can change a stored record."""
+    journal = _journal(tmp_path)
+    order = {"side": "SELL", "fills": [1.0]}
+    journal.put("dex_history", "pair", order)
+    order["fills"].append(2.0)
+    journal.get("dex_history", "pair")["side"] = "BUY"
+    assert journal.get("dex_history", "pair") == {"side": "SELL", "fills": [1.0]}
+
+
+def test_torn_and_corrupt_records_are_skipped(tmp_path):
+    """Tests recovery from a crash mid-write: the torn tail is dropped and later appends stay readable."""
+    journal = _journal(tmp_path)
+    journal.put("dex_history", "a", {"side": "SELL"})
+    journal.close()
+    with open(journal.path, "a") as fp:
+        fp.write("not json\n")
+        fp.write('{"op":"put","ns":"dex_history","key":"b","ts":1,"value":{"si')
+
+    journal = _journal(tmp_path)
+    assert journal.items("dex_history") == {"a": {"side": "SELL"}}
+    journal.put("dex_history", "c", {"side": "BUY"})
+    journal.close()
+    assert _journal(tmp_path).items("dex_history") == {"a": {"side": "SELL"}, "c": {"side": "BUY"}}
+
+
+def test_fsync_is_batched(tmp_path):
+    """Tests that appends are fsynced every sync_every records rather than one by one."""
+    journal = _journal(tmp_path, sync_every=3, sync_interval=3600)
+    with patch("definitions.order_journal.os.fsync") as mock_fsync:
+        for i in range(7):
+            journal.put("dex_history", "pair", {"n": i})
+        assert mock_fsync.call_count == 2
+        journal.sync()
+        assert mock_fsync.call_count == 3
+
+
+def test_compaction_keeps_only_live_records(tmp_path):
+    """Tests that the file is rewritten with its live records once it outgrows them."""
+    journal = _journal(tmp_path, compact_min_records=10, compact_ratio=2.0)
+    for i in range(25):
+        journal.put("dex_history", "pair", {"n": i})
+    journal.put("dex_history", "other", {"n": -1})
+    journal.close()
+
+    with open(journal.path) as fp:
+        assert len(fp.readlines()) < 10
+    assert _journal(tmp_path).items("dex_history") == {"pair": {"n": 24}, "other": {"n": -1}}
+
+
+def test_for_root_shares_one_instance_per_file(tmp_path):
+    """Tests that every ConfigManager of a process writes through the same journal."""
+    first = OrderJournal.for_root(str(tmp_path))
+    assert OrderJournal.for_root(str(tmp_path)) is first
+    assert first.path == os.path.join(str(tmp_path), "data", "order_journal.jsonl")
+    assert not os.path.exists(first.path)  # Opened lazily
+    OrderJournal._instances.pop(first.path)
@@ -0,0 +1,36 @@
+import os
+import sys
+from dataclasses import replace
+
+import pytest
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.orders import GridOrder, OrderRow, VirtualOrder
+
+
+def test_sizes_and_prices_are_floats():
+    order = GridOrder(maker='B', maker_size=3, taker='A', taker_size=1.5, price=2, type='buy')
+    assert type(order.maker_size) is float and type(order.price) is float
+    assert order.status is None and order.original_price is None
+
+    filled = replace(order, status='filled')
+    assert filled is not order and order.status is None
+    assert filled.to_dict() == {**order.to_dict(), 'status': 'filled'}
+    with pytest.raises(AttributeError):
+        order.not_a_field = 1
+
+
+def test_dict_conversion_at_the_boundaries():
+    order = VirtualOrder.from_dict({'side': 'BUY', 'maker_size': 1, 'legacy_field': 'x'})
+    assert order == VirtualOrder(side='BUY', maker_size=1.0)
+    assert order.to_dict() == {'side': 'BUY', 'maker_size': 1.0}
+    with pytest.raises(TypeError):
+        VirtualOrder(legacy_field='x')
+
+
+def test_order_row_column_lookup():
+    row = OrderRow(name='LTC/DOGE', symbol='LTC/DOGE', maker_size=1.5)
+    assert row.get('maker_size') == 1.5 and row.get('status') == 'None'
+    assert row.get('total_usd', '') == ''
@@ -13,12 +13,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 # Remove custom event loop fixtures
 # Pytest-asyncio already handles event management
 
+from definitions.orders import VirtualOrder
+from definitions.state_store import SqliteStateStore
 from definitions.pair import DexPair, Pair, CexPair
 from definitions.token import Token, CexToken, DexToken
 
 
 @pytest.fixture
-def mock_pair():
+def mock_pair(tmp_path):
     """Fixture to create a mock Pair instance for DexPair testing."""
     token1 = MagicMock(spec=Token)
     token1.symbol = 'T1'
@@ -47,6 +49,7 @@ def mock_pair():
     config_manager = MagicMock()
     config_manager.strategy_instance = MagicMock()
     config_manager.strategy_instance.get_dex_history_file_path.return_value = 'mock_history.yaml'
+    config_manager.state_store = SqliteStateStore(str(tmp_path / "state.sqlite3"))
     config_manager.general_log = MagicMock()
     config_manager.error_handler = MagicMock()
     config_manager.error_handler.handle_async = AsyncMock()
@@ -115,7 +118,7 @@ def test_check_price_in_range(dex_pair):
     # Mock the strategy's variation calculation
     # Simulate a normal SELL order check
     strategy_mock.calculate_variation_based_on_side.return_value = 1.01  # 1% variation
-    dex_pair.current_order = {'side': 'SELL', 'org_pprice': 10.0}
+    dex_pair.current_order = VirtualOrder(side='SELL', org_pprice=10.0)
     dex_pair.pair.cex.price = 10.1
     assert dex_pair.check_price_in_range() is True
 
@@ -136,7 +139,7 @@ def test_check_price_in_range(dex_pair):
 
     # Locked order (signaled by list return)
     strategy_mock.calculate_variation_based_on_side.return_value = [1.05]  # 5% variation, but locked
-    dex_pair.current_order = {'side': 'BUY', 'org_pprice': 10.0}
+    dex_pair.current_order = VirtualOrder(side='BUY', org_pprice=10.0)
     dex_pair.pair.cex.price = 10.5
     assert dex_pair.check_price_in_range() is True
     # Verify variation is stored as a list
@@ -154,14 +157,14 @@ def test_create_virtual_sell_order(dex_pair):
 
     order = dex_pair.current_order
     assert order is not None
-    assert order['side'] == 'SELL'
-    assert order['maker'] == 'T1'
-    assert order['taker'] == 'T2'
-    assert order['maker_size'] == pytest.approx(1.5)
-    assert order['taker_size'] == pytest.approx(1.5 * 10.0 * (1 + 0.01))
-    assert order['dex_price'] == pytest.approx(10.0 * (1 + 0.01))
-    assert order['taker_size'] == pytest.approx(1.5 * 10.0 * (1 + 0.01))
-    assert order['dex_price'] == pytest.approx(10.0 * (1 + 0.01))
+    assert order.side == 'SELL'
+    assert order.maker == 'T1'
+    assert order.taker == 'T2'
+    assert order.maker_size == pytest.approx(1.5)
+    assert order.taker_size == pytest.approx(1.5 * 10.0 * (1 + 0.01))
+    assert order.dex_price == pytest.approx(10.0 * (1 + 0.01))
+    assert order.taker_size == pytest.approx(1.5 * 10.0 * (1 + 0.01))
+    assert order.dex_price == pytest.approx(10.0 * (1 + 0.01))
 
 
 def test_create_virtual_buy_order(dex_pair):
@@ -174,12 +177,12 @@ def test_create_virtual_buy_order(dex_pair):
 
     order = dex_pair.current_order
     assert order is not None
-    assert order['side'] == 'BUY'
-    assert order['maker'] == 'T2'
-    assert order['taker'] == 'T1'
-    assert order['taker_size'] == pytest.approx(1.5)  # taker_size is amount for buy
-    assert order['maker_size'] == pytest.approx(1.5 * 9.0 * (1 - 0.02))
-    assert order['dex_price'] == pytest.approx(9.0 * (1 - 0.02))
+    assert order.side == 'BUY'
+    assert order.maker == 'T2'
+    assert order.taker == 'T1'
+    assert order.taker_size == pytest.approx(1.5)  # taker_size is amount for buy
+    assert order.maker_size == pytest.approx(1.5 * 9.0 * (1 - 0.02))
+    assert order.dex_price == pytest.approx(9.0 * (1 - 0.02))
 
 
 def test_is_shutting_down(dex_pair):
@@ -275,9 +278,8 @@ def test_init_virtual_order_no_disabled_coins(dex_pair):
 
 def test_write_last_order_history_failure(dex_pair):
     """Tests error handling in write_last_order_history."""
-    file_path = dex_pair._get_history_file_path()
-    with patch("builtins.open", mock_open()) as mock_file:
-        mock_file.side_effect = IOError("Disk full")
+    store = dex_pair.pair.config_manager.state_store
+    with patch.object(store, "put", side_effect=IOError("Disk full")):
         dex_pair.write_last_order_history()
         # Verify error handler was called with expected exception type
         handle_call_args = dex_pair.pair.config_manager.error_handler.handle.call_args
@@ -291,7 +293,27 @@ def test_write_last_order_history_failure(dex_pair):
         assert isinstance(error, IOError)
         assert context["pair"] == dex_pair.pair.name
         assert context["stage"] == "write_last_order_history"
-        assert context["file_path"] == file_path
+        assert context["record"] == "mock_history.yaml"
+
+
+def test_order_history_round_trip_through_journal(dex_pair, tmp_path):
+    """Tests that history is read back from the journal after a restart, ahead of a legacy history file."""
+    legacy_path = tmp_path / "pingpong_T1_T2_last_order.yaml"
+    legacy_path.write_text(yaml.safe_dump({'side': 'BUY'}))
+    config_manager = dex_pair.pair.config_manager
+    config_manager.strategy_instance.get_dex_history_file_path.return_value = str(legacy_path)
+
+    # Nothing journaled yet: the file written by earlier versions is used
+    dex_pair.read_last_order_history()
+    assert dex_pair.order_history == {'side': 'BUY'}
+
+    dex_pair.order_history = {'side': 'SELL', 'maker_size': 1.0, 'dex_price': 0.3}
+    dex_pair.write_last_order_history()
+    config_manager.state_store.close()
+
+    dex_pair.order_history = None
+    dex_pair.read_last_order_history()
+    assert dex_pair.order_history == {'side': 'SELL', 'maker_size': 1.0, 'dex_price': 0.3}
 
 
 @pytest.mark.asyncio
@@ -311,16 +333,16 @@ async def test_dex_at_order_finished(dex_pair):
     """Tests order completion workflow."""
     # Setup
     dex_pair.order = {'id': 'test_order_id', 'status': 'finished', 'taker': 'T2', 'taker_address': 'test_address'}
-    dex_pair.current_order = {
-        'symbol': 'T1/T2',
-        'maker': 'T1',
-        'maker_address': 'maker_addr',
-        'taker': 'T2',
-        'taker_address': 'taker_addr',
-        'maker_size': 1.0,
-        'taker_size': 10.0,
-        'dex_price': 10.0
-    }
+    dex_pair.current_order = VirtualOrder(
+        symbol='T1/T2',
+        maker='T1',
+        maker_address='maker_addr',
+        taker='T2',
+        taker_address='taker_addr',
+        maker_size=1.0,
+        taker_size=10.0,
+        dex_price=10.0
+    )
     dex_pair.t2.symbol = 'T2'  # Ensure consistent symbol
 
     # Setup mocks to return completed futures
@@ -336,8 +358,9 @@ async def test_dex_at_order_finished(dex_pair):
         handle_mock.assert_awaited_once_with(dex_pair, [])
         write_mock.assert_called_once()
 
-    # Verify order history update
-    assert dex_pair.order_history == dex_pair.current_order
+    # Verify order history update (stored as a plain dict)
+    assert dex_pair.order_history == dex_pair.current_order.to_dict()
+    assert type(dex_pair.order_history) is dict
 
 
 def test_dex_pair_read_last_order_history(dex_pair):
@@ -515,7 +538,7 @@ async def test_update_dex_orderbook(dex_pair):
 async def test_check_price_variation_cancellation(dex_pair):
     """Tests cancellation and reinit when prices go out of range."""
     # Setup virtual order
-    dex_pair.current_order = {'side': 'SELL', 'org_pprice': 10.0, 'dex_price': 10.0}
+    dex_pair.current_order = VirtualOrder(side='SELL', org_pprice=10.0, dex_price=10.0)
     dex_pair.order = {'id': 'test_order', 'status': 'open'}
 
     # Always report price out of range
@@ -561,6 +584,26 @@ async def test_status_open_flow(dex_pair):
     mock_handle_open.assert_awaited_once_with(['T3'], True)
 
 
+@pytest.mark.asyncio
+async def test_check_order_status_uses_snapshot(dex_pair):
+    """Tests that the per-cycle dxGetMyOrders snapshot is used before falling back to dxGetOrder."""
+    controller = MagicMock()
+    controller.order_snapshot = {'snap_order': {'id': 'snap_order', 'status': 'finished'}}
+    dex_pair.pair.config_manager.controller = controller
+    getorderstatus = AsyncMock(return_value={'id': 'snap_order', 'status': 'open'})
+    dex_pair.pair.config_manager.xbridge_manager.getorderstatus = getorderstatus
+    dex_pair.order = {'id': 'snap_order', 'status': 'open'}
+
+    # Served from the snapshot, entry consumed
+    assert await dex_pair.check_order_status() == dex_pair.STATUS_FINISHED
+    getorderstatus.assert_not_awaited()
+    assert controller.order_snapshot == {}
+
+    # Second check in the same cycle falls back to dxGetOrder
+    assert await dex_pair.check_order_status() == dex_pair.STATUS_OPEN
+    getorderstatus.assert_awaited_once_with('snap_order')
+
+
 @pytest.mark.asyncio
 async def test_handle_status_open_disabled_coins(dex_pair):
     """Tests cancellation when coins are disabled during open status."""
@@ -593,9 +636,9 @@ def test_partial_order_creation(dex_pair):
     order = dex_pair.current_order
 
     # Verify order details
-    assert order['type'] == 'partial'
-    assert 'minimum_size' in order
-    assert order['minimum_size'] == pytest.approx(1.5 * 0.5)
+    assert order.type == 'partial'
+    assert order.minimum_size is not None
+    assert order.minimum_size == pytest.approx(1.5 * 0.5)
 
 
 def test_zero_partial_order(dex_pair):
@@ -608,8 +651,8 @@ def test_zero_partial_order(dex_pair):
     dex_pair.create_virtual_sell_order()
     order = dex_pair.current_order
 
-    assert order['type'] == 'exact'
-    assert 'minimum_size' not in order
+    assert order.type == 'exact'
+    assert order.minimum_size is None
 
 
 @pytest.mark.asyncio
@@ -804,3 +847,20 @@ class TestCexPair:
         # Verify exception was handled
         mock_cex_pair.pair.config_manager.error_handler.handle_async.assert_awaited()
         assert mock_cex_pair.cex_orderbook_timer is None  # Should be reset
+
+
+def test_virtual_order_is_slotted_and_typed(dex_pair):
+    """Tests that virtual orders are compact value objects and become dicts only when persisted."""
+    strategy_mock = dex_pair.pair.config_manager.strategy_instance
+    strategy_mock.calculate_sell_price.return_value = 10
+    strategy_mock.build_sell_order_details.return_value = (2, 0)
+
+    dex_pair.create_virtual_sell_order()
+    order = dex_pair.current_order
+
+    assert isinstance(order, VirtualOrder)
+    assert not hasattr(order, '__dict__')
+    assert type(order.maker_size) is float and type(order.dex_price) is float
+    assert order.maker_size == 2.0
+    assert order.minimum_size is None
+    assert VirtualOrder.from_dict(order.to_dict()) == order
@@ -0,0 +1,37 @@
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.pair_scheduler import PairScheduler
+
+
+def test_pop_due_in_due_order():
+    """Tests that only pairs past their due time are returned, earliest first."""
+    scheduler = PairScheduler()
+    with patch('definitions.pair_scheduler.monotonic', return_value=100.0):
+        scheduler.schedule('slow', 60)
+        scheduler.schedule('fast', 5)
+        scheduler.schedule('faster', 2)
+    with patch('definitions.pair_scheduler.monotonic', return_value=106.0):
+        assert scheduler.pop_due() == ['faster', 'fast']
+        assert scheduler.next_due_in() == 54.0
+    assert 'slow' in scheduler and 'fast' not in scheduler
+
+
+def test_wake_moves_pair_forward_once():
+    """Tests that waking a pair supersedes its queued entry instead of duplicating it."""
+    scheduler = PairScheduler()
+    with patch('definitions.pair_scheduler.monotonic', return_value=100.0):
+        scheduler.schedule('a', 15)
+        scheduler.schedule('b', 15)
+        assert scheduler.wake('a') is True
+        assert scheduler.wake('a') is False  # already due
+        assert scheduler.wake('unknown') is False
+        assert scheduler.pop_due() == ['a']
+    with patch('definitions.pair_scheduler.monotonic', return_value=116.0):
+        assert scheduler.pop_due() == ['b']
+    assert len(scheduler) == 0
+    assert scheduler.next_due_in() is None
@@ -9,6 +9,8 @@ import pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from definitions.config_manager import ConfigManager
+from definitions.state_store import SqliteStateStore
+from definitions.pair import DexPair
 
 if TYPE_CHECKING:
     from strategies.pingpong_strategy import PingPongStrategy
@@ -39,6 +41,8 @@ class PingPongStrategyTester:
         self.pair.dex.disabled = False
         self.pair.dex.variation = None
         self.pair.dex.order = None
+        # Start from the legacy history file, which the tests mock through yaml.safe_load
+        self.config_manager.state_store.clear(DexPair.HISTORY_NAMESPACE)
 
     @contextmanager
     def _patch_dependencies(self):
@@ -53,6 +57,8 @@ class PingPongStrategyTester:
                 patch('builtins.open', new_callable=MagicMock) as mock_open, \
                 patch('yaml.safe_load') as mock_yaml_load, \
                 patch('yaml.safe_dump') as mock_yaml_dump, \
+                patch.object(self.config_manager.state_store, 'put',
+                             wraps=self.config_manager.state_store.put) as mock_history_put, \
                 patch('asyncio.sleep', return_value=None), \
                 patch.object(self.pair.t1.dex, 'free_balance', 1000.0), \
                 patch.object(self.pair.t2.dex, 'free_balance', 1000.0):
@@ -67,6 +73,7 @@ class PingPongStrategyTester:
                 'open': mock_open,
                 'yaml_load': mock_yaml_load,
                 'yaml_dump': mock_yaml_dump,
+                'history_put': mock_history_put,
             }
             yield mocks
 
@@ -228,7 +235,7 @@ class PingPongStrategyTester:
             await self.pair.dex.status_check()
 
             # Assert
-            mocks['yaml_dump'].assert_called_once()  # History was written
+            mocks['history_put'].assert_called_once()  # History was written
             # A new order should have been created
             mocks['make_order'].assert_called_once()
             call_args = mocks['make_order'].call_args[0]
@@ -260,7 +267,7 @@ class PingPongStrategyTester:
 
             # Assert:
             # 1. The bot should not have written a new history file, as the trade didn't finish.
-            mocks['yaml_dump'].assert_not_called()
+            mocks['history_put'].assert_not_called()
 
             # 2. The bot should have tried to create a new order, and it should be another SELL.
             mocks['make_order'].assert_called_once()
@@ -294,7 +301,7 @@ class PingPongStrategyTester:
             self.pair.dex.init_virtual_order()
 
             # Assert: The bot should use the new, lower price as its base
-            favorable_base_price = self.pair.dex.current_order['org_pprice']
+            favorable_base_price = self.pair.dex.current_order.org_pprice
             assert favorable_base_price == favorable_live_price, \
                 f"Expected base price {favorable_live_price}, but got {favorable_base_price}."
             self.config_manager.general_log.info(
@@ -308,7 +315,7 @@ class PingPongStrategyTester:
             self.pair.dex.init_virtual_order()
 
             # Assert: The bot should lock its price to the last sell price, ignoring the higher live price
-            unfavorable_base_price = self.pair.dex.current_order['org_pprice']
+            unfavorable_base_price = self.pair.dex.current_order.org_pprice
             assert unfavorable_base_price == last_sell_price, \
                 f"Expected locked base price {last_sell_price}, but got {unfavorable_base_price}."
             self.config_manager.general_log.info(
@@ -470,9 +477,10 @@ class PingPongStrategyTester:
 
 
 @pytest.fixture(scope="module")
-def mock_strategy():
+def mock_strategy(tmp_path_factory):
     """Fixture to create a mock strategy instance for testing."""
     config_manager = ConfigManager(strategy="pingpong")
+    config_manager.state_store = SqliteStateStore(str(tmp_path_factory.mktemp("pingpong") / "state.sqlite3"))
     config_manager.initialize()
     return config_manager.strategy_instance
 
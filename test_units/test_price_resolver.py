@@ -0,0 +1,78 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.price_resolver import PriceResolver, ticker_last_price
+
+
+@pytest.fixture
+def config_manager():
+    cm = MagicMock()
+    cm.error_handler.handle_async = AsyncMock()
+    cm.ccxt_manager.ccxt_call_fetch_tickers = AsyncMock(
+        side_effect=lambda ccxt_o, symbols: {s: {'info': {'lastPrice': '1'}} for s in symbols}
+    )
+    return cm
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch(config_manager):
+    """Tests that concurrent lookups are merged into one fetchTickers call with deduplicated symbols."""
+    resolver = PriceResolver(config_manager, batch_window=0.01)
+    results = await asyncio.gather(
+        resolver.fetch_ticker('LTC/BTC'),
+        resolver.fetch_ticker('DASH/BTC'),
+        resolver.fetch_ticker('LTC/BTC'),
+        resolver.fetch_tickers(['BTC/USDT', 'LTC/BTC']),
+    )
+    assert all(results)
+    assert set(results[3]) == {'BTC/USDT', 'LTC/BTC'}
+    config_manager.ccxt_manager.ccxt_call_fetch_tickers.assert_awaited_once()
+    symbols = config_manager.ccxt_manager.ccxt_call_fetch_tickers.await_args.args[1]
+    assert sorted(symbols) == ['BTC/USDT', 'DASH/BTC', 'LTC/BTC']
+
+
+@pytest.mark.asyncio
+async def test_requests_during_fetch_join_inflight_or_next_batch(config_manager):
+    """Tests that a symbol in flight is not re-requested and new symbols go into a following batch."""
+    release = asyncio.Event()
+
+    async def slow_fetch(ccxt_o, symbols):
+        await release.wait()
+        return {s: {'info': {}} for s in symbols}
+
+    config_manager.ccxt_manager.ccxt_call_fetch_tickers = AsyncMock(side_effect=slow_fetch)
+    resolver = PriceResolver(config_manager, batch_window=0)
+    first = asyncio.ensure_future(resolver.fetch_ticker('LTC/BTC'))
+    await asyncio.sleep(0.01)
+    second = asyncio.ensure_future(resolver.fetch_tickers(['LTC/BTC', 'DASH/BTC']))
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await first == {'info': {}}
+    assert set(await second) == {'LTC/BTC', 'DASH/BTC'}
+    calls = [call.args[1] for call in config_manager.ccxt_manager.ccxt_call_fetch_tickers.await_args_list]
+    assert calls == [['LTC/BTC'], ['DASH/BTC']]
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_resolves_to_missing(config_manager):
+    """Tests that a failed fetch or a per-symbol proxy error yields no ticker and reports the error."""
+    resolver = PriceResolver(config_manager, batch_window=0)
+    config_manager.ccxt_manager.ccxt_call_fetch_tickers = AsyncMock(side_effect=Exception("down"))
+    assert await resolver.fetch_ticker('LTC/BTC') is None
+    config_manager.error_handler.handle_async.assert_awaited_once()
+
+    config_manager.ccxt_manager.ccxt_call_fetch_tickers = AsyncMock(
+        return_value={'LTC/BTC': {'error': 'Ticker data not found after refresh'}})
+    assert await resolver.fetch_tickers(['LTC/BTC']) == {}
+
+
+def test_ticker_last_price_prefers_consolidated():
+    assert ticker_last_price({'info': {'lastPrice': '2'}}, 'lastPrice') == 2.0
+    assert ticker_last_price({'info': {'lastPrice': '2'}, 'consolidated': {'last': 2.5}}, 'lastPrice') == 2.5
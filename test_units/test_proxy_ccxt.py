@@ -11,7 +11,12 @@ import pytest_asyncio
 
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from proxy_ccxt import PriceFetcher, WebServer, async_retry
+from aiohttp import web
+
+from definitions.markets_cache import MarketsCache
+from definitions.rpc import rpc_call
+from definitions.ticker_stream import TickerStream
+from proxy_ccxt import PriceFetcher, WebServer, aggregate_price, async_retry
 
 
 @pytest_asyncio.fixture
@@ -59,6 +64,39 @@ async def test_price_fetcher_initialization():
             assert isinstance(fetcher.ccxt_i, MagicMock), "CCXT instance not properly initialized"
 
 
+@pytest.mark.asyncio
+async def test_price_fetcher_initialization_uses_markets_cache(tmp_path):
+    """Test that cached markets skip the download and a stale cache is reloaded in the background."""
+    markets = {"BTC/USD": {"type": "spot"}}
+    cache = MarketsCache(str(tmp_path))
+    assert cache.save("kraken", None, markets, {})
+    config = MagicMock()
+    config.ccxt_exchange = "kraken"
+    config.ccxt_hostname = None
+    config.ccxt_aggregate_exchanges = []
+
+    with patch('proxy_ccxt.ccxt.kraken', new_callable=MagicMock) as mock_exchange:
+        exchange = mock_exchange.return_value
+        exchange.id = "kraken"
+        exchange.load_markets = AsyncMock()
+        async with aiohttp.ClientSession() as session:
+            fetcher = PriceFetcher(config, session)
+            fetcher.markets_cache = cache
+            await fetcher.initialize()
+            exchange.set_markets.assert_called_once_with(markets, {})
+            exchange.load_markets.assert_not_awaited()
+            assert fetcher._markets_refresh_tasks == []
+
+            cache.ttl = -1
+            fetcher = PriceFetcher(config, session)
+            fetcher.markets_cache = cache
+            with patch.object(cache, "save_in_background") as mock_save:
+                await fetcher.initialize()
+                await asyncio.gather(*fetcher._markets_refresh_tasks)
+            exchange.load_markets.assert_awaited_once_with(True)
+            mock_save.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_ccxt_ticker_fetching(mock_price_fetcher):
     """Test fetching CCXT tickers and caching behavior."""
@@ -443,3 +481,256 @@ async def test_invalid_exchange_configuration():
         fetcher = PriceFetcher(config, session)
         with pytest.raises(ValueError, match="not supported by ccxt"):
             await fetcher.initialize()
+
+
+@pytest.mark.asyncio
+async def test_ticker_subscription_pushes_deltas(mock_price_fetcher):
+    """Test that a subscriber gets a snapshot, then only changed tickers after each refresh."""
+    fetcher = mock_price_fetcher
+    fetcher.ccxt_i.fetchTickers = AsyncMock(return_value={
+        "BTC/USD": {"last": 50000}, "ETH/USD": {"last": 3000}
+    })
+    server = WebServer(fetcher, "127.0.0.1", 0)
+    runner = web.AppRunner(server.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    stream = TickerStream(f"http://127.0.0.1:{port}/ws", ["BTC/USD", "ETH/USD"])
+    try:
+        stream.start()
+        for _ in range(100):
+            if stream.is_live():
+                break
+            await asyncio.sleep(0.01)
+        assert stream.tickers == {"BTC/USD": {"last": 50000}, "ETH/USD": {"last": 3000}}
+        assert len(server.subscribers) == 1
+        version = stream.version
+
+        fetcher.ccxt_i.fetchTickers.return_value = {"BTC/USD": {"last": 51000}, "ETH/USD": {"last": 3000}}
+        with patch.object(server, "broadcast_tickers", wraps=server.broadcast_tickers) as broadcast:
+            fetcher._listeners = [broadcast]
+            await fetcher.refresh_ccxt_tickers()
+            broadcast.assert_awaited_once_with({"BTC/USD": {"last": 51000}})
+        for _ in range(100):
+            if stream.version > version:
+                break
+            await asyncio.sleep(0.01)
+        assert stream.tickers["BTC/USD"] == {"last": 51000}
+        assert fetcher.ccxt_i.fetchTickers.await_count == 2
+    finally:
+        await stream.close()
+        await server.stop()
+        await runner.cleanup()
+    assert not stream.is_live()
+
+
+@pytest.mark.asyncio
+async def test_stale_tickers_served_while_revalidating(mock_price_fetcher):
+    """Test that stale tickers are served immediately and refreshed in the background, up to a hard limit."""
+    fetcher = mock_price_fetcher
+    fetcher.ccxt_i.fetchTickers = AsyncMock(return_value={"BTC/USD": {"last": 50000}})
+    now = 1000.0
+
+    with patch('proxy_ccxt.monotonic', side_effect=lambda: now):
+        await fetcher.get_ccxt_tickers("BTC/USD")
+        assert fetcher.ccxt_i.fetchTickers.await_count == 1
+
+        # Stale but servable: old value returned at once, refresh happens behind the request
+        now += fetcher.max_age + 1
+        fetcher.ccxt_i.fetchTickers.return_value = {"BTC/USD": {"last": 51000}}
+        result = await fetcher.get_ccxt_tickers("BTC/USD")
+        assert result["BTC/USD"] == {"last": 50000}
+        await fetcher._revalidate_task
+        assert fetcher.ccxt_i.fetchTickers.await_count == 2
+        assert fetcher.tickers["BTC/USD"] == {"last": 51000}
+
+        # A tighter per-request max age makes the same ticker stale
+        now += 5
+        await fetcher.get_ccxt_tickers("BTC/USD", max_age=1)
+        await fetcher._revalidate_task
+        assert fetcher.ccxt_i.fetchTickers.await_count == 3
+
+        # Past the serve limit the request waits, and a failed refresh yields an error, not an old price
+        now += fetcher.max_age + fetcher.stale_while_revalidate + 1
+        fetcher.ccxt_i.fetchTickers.side_effect = ccxt.BadRequest("down")
+        with pytest.raises(ccxt.BadRequest):
+            await fetcher.get_ccxt_tickers("BTC/USD")
+        fetcher.ccxt_i.fetchTickers.side_effect = None
+        fetcher.ccxt_i.fetchTickers.return_value = {}
+        result = await fetcher.get_ccxt_tickers("BTC/USD")
+        assert result["BTC/USD"] == {'error': 'Ticker data is stale'}
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_failure_keeps_previous_tickers(mock_price_fetcher):
+    """Test that a failing market type does not blank out cached tickers of other symbols."""
+    fetcher = mock_price_fetcher
+    fetcher.symbols_list = ["BTC/USD", "XRP/USD:SWAP"]
+    fetcher.ccxt_i.fetchTickers.side_effect = [
+        {"BTC/USD": {"last": 50000}}, {"XRP/USD:SWAP": {"last": 0.5}},
+        {"BTC/USD": {"last": 51000}}, ccxt.BadRequest("swap endpoint down"),
+    ]
+    await fetcher.refresh_ccxt_tickers()
+    swap_fetched_at = fetcher.ticker_times["XRP/USD:SWAP"]
+
+    with pytest.raises(ccxt.BadRequest):
+        await fetcher.refresh_ccxt_tickers()
+    assert fetcher.tickers == {"BTC/USD": {"last": 51000}, "XRP/USD:SWAP": {"last": 0.5}}
+    assert fetcher.ticker_times["XRP/USD:SWAP"] == swap_fetched_at
+
+
+@pytest.mark.asyncio
+async def test_demand_driven_refresh_plan(mock_price_fetcher):
+    """Test that hot symbols refresh faster, idle ones are evicted, and intervals respect the rate limit."""
+    fetcher = mock_price_fetcher
+    fetcher.ccxt_i.rateLimit = 0  # No rate limit known
+    fetcher.ccxt_i.fetchTickers = AsyncMock(side_effect=lambda symbols: {s: {"last": 1} for s in symbols})
+    now = 1000.0
+
+    with patch('proxy_ccxt.monotonic', side_effect=lambda: now):
+        await fetcher.get_ccxt_tickers("BTC/USD", requester="bot1")
+        await fetcher.get_ccxt_tickers("BTC/USD", "ETH/USD", requester="bot2")
+        assert fetcher.requester_count("BTC/USD") == 2
+        intervals = fetcher.refresh_intervals(15)
+        assert intervals == {"BTC/USD": 5.0, "ETH/USD": 15}
+
+        # Only the hot symbol is due after its short interval
+        now += 6
+        assert fetcher.due_symbols(intervals) == ["BTC/USD"]
+        # ETH/USD is past half its interval and rides along in the same spot call
+        now += 2
+        assert sorted(fetcher.due_symbols(intervals)) == ["BTC/USD", "ETH/USD"]
+
+        # A one request-per-4s exchange allows 0.125 periodic calls/s: 1/5 + 1/15 gets scaled up
+        fetcher.ccxt_i.rateLimit = 4000
+        intervals = fetcher.refresh_intervals(15)
+        assert intervals["BTC/USD"] == pytest.approx(5 * (1 / 5 + 1 / 15) / 0.125)
+        assert intervals["ETH/USD"] / intervals["BTC/USD"] == pytest.approx(3)
+
+        # Symbols nobody asked for within the idle timeout are dropped with their cached tickers
+        now += fetcher.IDLE_TIMEOUT - 1
+        await fetcher.get_ccxt_tickers("ETH/USD", requester="bot2")
+        now += 2
+        assert fetcher.evict_idle() == ["BTC/USD"]
+        assert fetcher.symbols_list == ["ETH/USD"]
+        assert "BTC/USD" not in fetcher.tickers
+        assert fetcher.requester_count("ETH/USD") == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_polls_from_one_bot_are_one_requester(mock_price_fetcher):
+    """Test that a bot polling over a new connection each time does not make its symbols hot."""
+    fetcher = mock_price_fetcher
+    fetcher.ccxt_i.rateLimit = 0
+    fetcher.ccxt_i.fetchTickers = AsyncMock(side_effect=lambda symbols: {s: {"last": 1} for s in symbols})
+    server = WebServer(fetcher, "127.0.0.1", 0)
+    runner = web.AppRunner(server.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        for _ in range(3):
+            # Same request as CCXTManager.ccxt_call_fetch_tickers, each on a fresh session
+            await rpc_call("ccxt_call_fetch_tickers", {"symbols": ["BTC/USD"], "client": "bot-1"}, rpc_port=port)
+        assert fetcher.requester_count("BTC/USD") == 1
+        assert fetcher.refresh_intervals(15) == {"BTC/USD": 15}
+
+        # Without a client id, requests from one host still count once
+        for _ in range(2):
+            await rpc_call("ccxt_call_fetch_tickers", ["ETH/USD"], rpc_port=port)
+        assert fetcher.requester_count("ETH/USD") == 1
+
+        await rpc_call("ccxt_call_fetch_tickers", {"symbols": ["BTC/USD"], "client": "bot-2"}, rpc_port=port)
+        assert fetcher.refresh_intervals(15)["BTC/USD"] == 5.0
+    finally:
+        await server.stop()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_periodic_refresh_skips_symbols_not_due(mock_price_fetcher):
+    """Test that a planned refresh only fetches due symbols and nothing when none are due."""
+    fetcher = mock_price_fetcher
+    fetcher.ccxt_i.rateLimit = 0
+    fetcher.ccxt_i.fetchTickers = AsyncMock(side_effect=lambda symbols: {s: {"last": 1} for s in symbols})
+    await fetcher.get_ccxt_tickers("BTC/USD", "XRP/USD:SWAP")
+    assert fetcher.ccxt_i.fetchTickers.await_count == 2
+
+    await fetcher.refresh_all_tickers(15)
+    assert fetcher.ccxt_i.fetchTickers.await_count == 2
+
+    fetcher.ticker_times = {**fetcher.ticker_times, "XRP/USD:SWAP": fetcher.ticker_times["XRP/USD:SWAP"] - 20}
+    fetcher.refresh_attempts["XRP/USD:SWAP"] -= 20
+    await fetcher.refresh_all_tickers(15)
+    fetcher.ccxt_i.fetchTickers.assert_awaited_with(["XRP/USD:SWAP"])
+
+
+def test_aggregate_price():
+    """Test median and volume-weighted consolidation of venue prices."""
+    assert aggregate_price([(100.0, 1), (102.0, 1), (130.0, 1)]) == 102.0
+    assert aggregate_price([(100.0, 3), (104.0, 1)], 'vwap') == 101.0
+    # Missing volume falls back to the median, missing prices are ignored
+    assert aggregate_price([(100.0, 3), (104.0, None)], 'vwap') == 102.0
+    assert aggregate_price([(None, 1), (0, 1), (99.0, None)]) == 99.0
+    assert aggregate_price([(None, 1)]) is None
+
+
+@pytest.mark.asyncio
+async def test_aggregated_refresh_survives_venue_outage(mock_price_fetcher):
+    """Test that tickers are consolidated across venues and a failed or slow venue is skipped."""
+    fetcher = mock_price_fetcher
+    fetcher.ccxt_i.id = "kraken"
+    fetcher.venue_grace = 0.05
+    fetcher.ccxt_i.fetchTickers = AsyncMock(return_value={"BTC/USD": {"last": 100.0, "info": {"c": "100"}}})
+    fast = AsyncMock()
+    fast.markets = {"BTC/USD": {}}
+    fast.fetchTickers = AsyncMock(return_value={"BTC/USD": {"last": 102.0}})
+
+    async def slow_fetch(symbols):
+        await asyncio.sleep(10)
+
+    slow = AsyncMock()
+    slow.markets = {"BTC/USD": {}}
+    slow.fetchTickers = slow_fetch
+    fetcher.venues = {"kucoin": fast, "binance": slow}
+    fetcher.symbols_list = ["BTC/USD"]
+
+    await fetcher.refresh_ccxt_tickers()
+    ticker = fetcher.tickers["BTC/USD"]
+    assert ticker["last"] == 101.0
+    assert ticker["consolidated"]["venue_count"] == 2
+    assert set(ticker["venues"]) == {"kraken", "kucoin"}
+    assert ticker["info"] == {"c": "100"}
+
+    # Primary exchange down: the remaining venue still provides a price
+    fetcher.ccxt_i.fetchTickers.side_effect = ccxt.ExchangeNotAvailable("maintenance")
+    await fetcher.refresh_ccxt_tickers()
+    assert fetcher.tickers["BTC/USD"]["last"] == 102.0
+    assert set(fetcher.tickers["BTC/USD"]["venues"]) == {"kucoin"}
+
+
+@pytest.mark.asyncio
+async def test_failed_venue_does_not_start_grace_window(mock_price_fetcher):
+    """Test that a venue failing fast does not cut short the wait for the others."""
+    fetcher = mock_price_fetcher
+    fetcher.ccxt_i.id = "kraken"
+    fetcher.venue_grace = 0.01
+    fetcher.fetch_timeout = 5
+
+    async def primary_fetch(symbols):
+        await asyncio.sleep(0.1)  # Much longer than the grace window
+        return {"BTC/USD": {"last": 100.0}}
+
+    fetcher.ccxt_i.fetchTickers = primary_fetch
+    down = AsyncMock()
+    down.markets = {"BTC/USD": {}}
+    down.fetchTickers = AsyncMock(side_effect=ccxt.NetworkError("connection refused"))
+    fetcher.venues = {"kucoin": down}
+    fetcher.symbols_list = ["BTC/USD"]
+
+    await fetcher.refresh_ccxt_tickers()
+    assert fetcher.tickers["BTC/USD"]["last"] == 100.0
+    assert set(fetcher.tickers["BTC/USD"]["venues"]) == {"kraken"}
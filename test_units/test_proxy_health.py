@@ -0,0 +1,55 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.proxy_health import ProxyHealth
+
+
+@pytest.mark.asyncio
+async def test_probe_tracks_listening_port():
+    """Tests that the async probe reports a listening port up and a closed one down."""
+    server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    health = ProxyHealth("127.0.0.1", port)
+    assert health.state is None
+
+    assert await health.probe() is True
+    assert health.is_up()
+
+    server.close()
+    await server.wait_closed()
+    assert await health.probe() is False
+    assert health.state is False
+    assert health.consecutive_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_only_when_stale():
+    """Tests that a recent real request suppresses probing and that probes run one at a time."""
+    health = ProxyHealth("127.0.0.1", 1, probe_interval=5.0)
+    health.record_success()
+    assert health.refresh_in_background() is None
+
+    with patch("definitions.proxy_health.monotonic", return_value=10 ** 9):
+        task = health.refresh_in_background()
+        assert task is not None
+        assert health.refresh_in_background() is None  # already probing
+    await task
+    assert health.is_up() is False
+
+
+def test_restart_attempts_are_rate_limited():
+    """Tests that a down proxy is restarted at most once per restart interval."""
+    health = ProxyHealth("127.0.0.1", 1, restart_interval=60.0)
+    health.record_failure()
+    with patch("definitions.proxy_health.monotonic", return_value=100.0):
+        assert health.should_restart() is True
+        assert health.should_restart() is False
+    with patch("definitions.proxy_health.monotonic", return_value=161.0):
+        assert health.should_restart() is True
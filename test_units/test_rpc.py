@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.error_handler import OperationalError
+from definitions.rpc import RpcBatchUnsupportedError, RpcLimiter, rpc_batch_call
+
+
+@pytest.mark.asyncio
+async def test_limiter_serves_waiters_by_priority():
+    """Tests that queued waiters are released lowest priority value first, FIFO within a priority."""
+    limiter = RpcLimiter(1)
+    order = []
+
+    async def worker(name, priority):
+        async with limiter.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await limiter.acquire()
+    tasks = [asyncio.create_task(worker("orderbook", 3)),
+             asyncio.create_task(worker("balance", 2)),
+             asyncio.create_task(worker("cancel", 0)),
+             asyncio.create_task(worker("balance2", 2))]
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["queue_depth"] == 4
+
+    limiter.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["cancel", "balance", "balance2", "orderbook"]
+    stats = limiter.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["available"] == 1
+    assert stats["waited"] == 4
+    assert stats["max_wait"] > 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_does_not_leak_permit():
+    """Tests that cancelling a queued waiter leaves the permit count intact."""
+    limiter = RpcLimiter(1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter.release()
+    assert limiter.stats()["available"] == 1
+    assert limiter.stats()["queue_depth"] == 0
+    async with limiter:
+        assert limiter.stats()["available"] == 0
+
+
+def test_limiter_enforces_global_cap_across_loops():
+    """Tests that the cap holds for callers running on different event loops in different threads."""
+    limiter = RpcLimiter(2)
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+
+    async def worker():
+        nonlocal active, max_active
+        async with limiter:
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            await asyncio.sleep(0.02)
+            with lock:
+                active -= 1
+
+    async def run_many():
+        await asyncio.gather(*(worker() for _ in range(5)))
+
+    threads = [threading.Thread(target=asyncio.run, args=(run_many(),)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+
+    assert max_active == 2
+    assert limiter.stats()["available"] == 2
+    assert limiter.stats()["acquired"] == 15
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_extra_release():
+    """Tests that releasing more permits than acquired raises like a bounded semaphore."""
+    limiter = RpcLimiter(1)
+    with pytest.raises(ValueError):
+        limiter.release()
+
+
+class _FakeResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self._text = json.dumps(body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def text(self):
+        return self._text
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    def __init__(self, status, body):
+        self.response = _FakeResponse(status, body)
+
+    def post(self, *args, **kwargs):
+        return self.response
+
+
+@pytest.mark.asyncio
+async def test_batch_call_error_object_is_not_a_batch_rejection():
+    """Tests that an HTTP error about one call is surfaced as a call failure, not as missing batch support."""
+    session = _FakeSession(500, {"result": None, "error": {"code": -5, "message": "Invalid order id"}, "id": 1})
+    with pytest.raises(OperationalError) as excinfo:
+        await rpc_batch_call([("dxGetOrder", ["a"]), ("dxGetOrder", ["b"])], rpc_port=1234, session=session)
+    assert not isinstance(excinfo.value, RpcBatchUnsupportedError)
+
+    session = _FakeSession(500, {"result": None, "error": {"code": -32700, "message": "Top-level object parse error"},
+                                 "id": None})
+    with pytest.raises(RpcBatchUnsupportedError):
+        await rpc_batch_call([("dxGetOrder", ["a"]), ("dxGetOrder", ["b"])], rpc_port=1234, session=session)
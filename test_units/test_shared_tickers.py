@@ -0,0 +1,67 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from definitions.shared_tickers import SEQ_OFFSET, SharedTickerReader, SharedTickerWriter, _U64
+
+
+@pytest.fixture
+def writer():
+    writer = SharedTickerWriter(name=f"xbt_test_{uuid.uuid4().hex[:12]}", capacity=8)
+    yield writer
+    writer.close()
+
+
+def test_round_trip(writer):
+    """Tests that published tickers are read back per symbol, with missing fields as None."""
+    assert writer.publish({
+        'LTC/BTC': {'last': 0.001, 'bid': 0.00099, 'ask': 0.00101},
+        'DASH/BTC': {'last': 0.0005, 'bid': None, 'ask': None},
+        'BAD/BTC': {'error': 'symbol not found'},
+    }) == 2
+
+    reader = SharedTickerReader.attach(writer.name)
+    assert reader is not None
+    try:
+        rows = reader.read(['LTC/BTC', 'DASH/BTC', 'BAD/BTC', 'XYZ/BTC'])
+        assert set(rows) == {'LTC/BTC', 'DASH/BTC'}
+        assert rows['LTC/BTC'][:3] == (0.001, 0.00099, 0.00101)
+        assert rows['LTC/BTC'][3] is not None
+        assert rows['DASH/BTC'][:3] == (0.0005, None, None)
+
+        # Updates and newly added symbols are visible to an attached reader
+        writer.publish({'LTC/BTC': {'last': 0.002}, 'DOGE/BTC': {'last': 0.000001}})
+        rows = reader.read(['LTC/BTC', 'DOGE/BTC'])
+        assert rows['LTC/BTC'][0] == 0.002
+        assert rows['DOGE/BTC'][0] == 0.000001
+    finally:
+        reader.close()
+
+
+def test_capacity_limit(writer):
+    """Tests that symbols beyond the table capacity are skipped instead of overflowing."""
+    tickers = {f"T{i}/BTC": {'last': float(i)} for i in range(12)}
+    assert writer.publish(tickers) == 8
+
+
+def test_attach_missing_segment():
+    """Tests that attaching to a segment that does not exist returns None."""
+    assert SharedTickerReader.attach(f"xbt_missing_{uuid.uuid4().hex[:12]}") is None
+
+
+def test_read_during_write_returns_none(writer):
+    """Tests that a reader never returns data while the writer's sequence counter is odd."""
+    writer.publish({'LTC/BTC': {'last': 0.001}})
+    reader = SharedTickerReader.attach(writer.name)
+    reader.MAX_RETRIES = 10
+    try:
+        _U64.pack_into(writer.buf, SEQ_OFFSET, 3)
+        assert reader.read(['LTC/BTC']) is None
+        _U64.pack_into(writer.buf, SEQ_OFFSET, 4)
+        assert reader.read(['LTC/BTC'])['LTC/BTC'][0] == 0.001
+    finally:
+        reader.close()
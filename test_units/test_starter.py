@@ -2,6 +2,7 @@ import asyncio
 import os
 import sys
 import threading
+import time
 from unittest.mock import MagicMock, AsyncMock, patch, create_autospec, call
 
 import pytest
@@ -16,8 +17,12 @@ from definitions.starter import (
     PriceHandler,
     MainController,
     run_async_main,
+    SHARED_TICKERS_KEEPALIVE,
 )
 from definitions.errors import RPCConfigError
+from definitions.metrics import metrics
+from definitions.orders import VirtualOrder
+from definitions.price_resolver import PriceResolver
 
 
 @pytest.fixture
@@ -62,6 +67,7 @@ def mock_config_manager():
     cm.ccxt_manager = AsyncMock()
     cm.resource_lock = threading.RLock()  # Mock lock for async context
     cm.controller = None
+    cm.price_resolver = PriceResolver(cm, batch_window=0)
     return cm
 
 
@@ -130,6 +136,22 @@ async def test_price_handler_update(mock_config_manager):
     assert ltc_token.cex.usd_price == 0.003 * 50000.0
 
 
+@pytest.mark.asyncio
+async def test_price_handler_prefers_consolidated_price(mock_config_manager):
+    """Tests that a multi-exchange consolidated price from the proxy wins over the exchange-specific field."""
+    mock_main_controller = MagicMock()
+    btc_mock = MagicMock(symbol='BTC')
+    btc_mock.cex = create_autospec(CexToken, instance=True, usd_price=None, cex_price=None)
+    mock_main_controller.tokens_dict = {'BTC': btc_mock}
+    mock_main_controller.config_manager = mock_config_manager
+    mock_main_controller.shutdown_event = asyncio.Event()
+    price_handler = PriceHandler(mock_main_controller, asyncio.get_event_loop())
+
+    tickers = {'BTC/USDT': {'info': {'lastPrice': '50000'}, 'consolidated': {'last': 50100.0}}}
+    price_handler._update_token_price(tickers, 'BTC/USDT', 'lastPrice', btc_mock)
+    assert btc_mock.cex.usd_price == 50100.0
+
+
 @pytest.mark.asyncio
 async def test_main_controller_loops(mock_main_controller):
     """Tests that MainController's init and main loops call sub-components."""
@@ -208,6 +230,74 @@ async def test_trading_processor_sync(mock_config_manager):
     mock_controller.loop.run_in_executor.assert_called_once_with(None, sync_mock, mock_controller.pairs_dict['pair1'])
 
 
+@pytest.mark.asyncio
+async def test_price_handler_uses_live_ticker_stream(mock_config_manager):
+    """Tests that pushed tickers replace polling while the stream is live, and polling resumes otherwise."""
+    mock_controller = MagicMock()
+    mock_controller.tokens_dict = {'T1': MagicMock(symbol='T1')}
+    mock_controller.config_manager = mock_config_manager
+    mock_controller.shutdown_event = asyncio.Event()
+    price_handler = PriceHandler(mock_controller, asyncio.get_running_loop())
+    price_handler._update_token_prices = AsyncMock()
+    stream = MagicMock()
+    stream.is_live.return_value = True
+    stream.tickers = {'T1/BTC': {'info': {}}}
+    stream.close = AsyncMock()
+    price_handler.ticker_stream = stream
+
+    await price_handler._fetch_and_update_prices()
+    price_handler._update_token_prices.assert_awaited_once_with(stream.tickers, include_custom=True)
+    mock_config_manager.ccxt_manager.ccxt_call_fetch_tickers.assert_not_awaited()
+
+    stream.is_live.return_value = False
+    await price_handler._fetch_and_update_prices()
+    mock_config_manager.ccxt_manager.ccxt_call_fetch_tickers.assert_awaited_once()
+
+    await price_handler.close()
+    stream.close.assert_awaited_once()
+    assert price_handler.ticker_stream is None
+
+
+@pytest.mark.asyncio
+async def test_price_handler_reads_shared_ticker_table(mock_config_manager):
+    """Tests that fresh shared-memory prices are used without an RPC, and stale ones fall back to it."""
+    mock_config_manager.config_coins.usd_ticker_custom = type('', (), {})()
+    mock_controller = MagicMock()
+    mock_controller.config_manager = mock_config_manager
+    mock_controller.shutdown_event = asyncio.Event()
+    token = MagicMock()
+    token.symbol = 'BTC'
+    mock_controller.tokens_dict = {'BTC': token}
+    price_handler = PriceHandler(mock_controller, asyncio.get_running_loop())
+    price_handler.ccxt_i = MagicMock()
+    price_handler.ccxt_i.symbols = ['BTC/USDT']
+    price_handler._start_ticker_stream = MagicMock()
+    reader = MagicMock()
+    reader.read.return_value = {'BTC/USDT': (65000.0, 64990.0, 65010.0, time.time())}
+    price_handler.shared_tickers = reader
+    price_handler._proxy_demand_timer = time.time()
+
+    await price_handler._fetch_and_update_prices()
+    reader.read.assert_called_once_with(['BTC/USDT'])
+    assert token.cex.usd_price == 65000.0
+    mock_config_manager.ccxt_manager.ccxt_call_fetch_tickers.assert_not_awaited()
+
+    reader.read.return_value = {'BTC/USDT': (65000.0, 64990.0, 65010.0, time.time() - 3600)}
+    mock_config_manager.ccxt_manager.ccxt_call_fetch_tickers.return_value = {}
+    await price_handler._fetch_and_update_prices()
+    mock_config_manager.ccxt_manager.ccxt_call_fetch_tickers.assert_awaited_once()
+
+    # Fresh shared prices still go through the proxy once the keep-alive is due
+    reader.read.return_value = {'BTC/USDT': (65000.0, 64990.0, 65010.0, time.time())}
+    price_handler._proxy_demand_timer = time.time() - SHARED_TICKERS_KEEPALIVE - 1
+    await price_handler._fetch_and_update_prices()
+    assert mock_config_manager.ccxt_manager.ccxt_call_fetch_tickers.await_count == 2
+
+    await price_handler.close()
+    reader.close.assert_called_once()
+    assert price_handler.shared_tickers is None
+
+
 @pytest.mark.asyncio
 async def test_price_handler_custom_coin(mock_config_manager):
     """Test PriceHandler handles custom coins correctly."""
@@ -251,6 +341,147 @@ async def test_balance_manager_token_not_in_xb_tokens(mock_config_manager):
     assert token.dex.free_balance is None
 
 
+@pytest.mark.asyncio
+async def test_balance_manager_fetches_utxos_only_on_change(mock_config_manager):
+    """Tests that UTXOs are only re-read for tokens whose bulk balance changed, without holding the lock."""
+    mock_config_manager.strategy_instance.dry_mode = False
+    mock_config_manager.resource_lock = threading.Lock()
+    xbm = mock_config_manager.xbridge_manager
+    xbm.getlocaltokens.return_value = ['T1', 'T2']
+    xbm.gettokenbalances.return_value = {'T1': '10.0', 'T2': '1.0'}
+
+    async def gettokenutxo(symbol, used=False):
+        assert not mock_config_manager.resource_lock.locked()
+        return [{'txid': symbol, 'vout': 0, 'amount': '10.0', 'orderid': ''},
+                {'txid': symbol, 'vout': 1, 'amount': '5.0', 'orderid': 'some_id'}]
+
+    xbm.gettokenutxo.side_effect = gettokenutxo
+    balance_manager = BalanceManager(mock_config_manager.tokens, mock_config_manager, asyncio.get_event_loop())
+
+    await balance_manager.update_balances()
+    assert xbm.gettokenutxo.await_count == 2
+    assert mock_config_manager.tokens['T1'].dex.total_balance == 15.0
+    assert mock_config_manager.tokens['T1'].dex.free_balance == 10.0
+
+    # Nothing changed: no UTXO reads
+    balance_manager.timer_main_dx_update_bals = 0
+    await balance_manager.update_balances()
+    assert xbm.gettokenutxo.await_count == 2
+
+    # Only T2 changed
+    xbm.gettokenbalances.return_value = {'T1': '10.0', 'T2': '0.5'}
+    balance_manager.timer_main_dx_update_bals = 0
+    await balance_manager.update_balances()
+    assert xbm.gettokenutxo.await_count == 3
+    xbm.gettokenutxo.assert_awaited_with('T2', used=True)
+
+
+def test_calculate_balances(mock_config_manager):
+    """Tests that locked UTXOs count toward the total balance only."""
+    balance_manager = BalanceManager({}, mock_config_manager, MagicMock())
+    utxos = [{'txid': 'a', 'vout': 0, 'amount': '1.0', 'orderid': ''},
+             {'txid': 'b', 'vout': 0, 'amount': '2.0', 'orderid': 'o1'},
+             {'txid': 'c', 'vout': 1, 'amount': '0.5'}]
+    assert balance_manager._calculate_balances(utxos) == (3.5, 1.5)
+    assert balance_manager._calculate_balances([]) == (0.0, 0.0)
+    assert balance_manager._calculate_balances(None) == (0.0, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_main_controller_order_snapshot(mock_config_manager):
+    """Tests that the order snapshot is fetched once and indexed by id, only when pairs have orders."""
+    controller = MainController(mock_config_manager, asyncio.get_event_loop())
+    xbm = mock_config_manager.xbridge_manager
+    xbm.getmyorders.return_value = [{'id': 'a', 'status': 'open'}, {'id': 'b', 'status': 'finished'}]
+
+    mock_config_manager.pairs['pair1'].dex.order = None
+    await controller.refresh_order_snapshot()
+    xbm.getmyorders.assert_not_awaited()
+    assert controller.order_snapshot == {}
+
+    mock_config_manager.pairs['pair1'].dex.order = {'id': 'a'}
+    await controller.refresh_order_snapshot()
+    xbm.getmyorders.assert_awaited_once()
+    assert set(controller.order_snapshot) == {'a', 'b'}
+    assert controller.order_snapshot['b']['status'] == 'finished'
+
+
+@pytest.mark.asyncio
+async def test_main_controller_scheduled_loop_wakes_on_events(mock_main_controller, mock_config_manager):
+    """Tests that a scheduled cycle only processes due pairs, and that events wake idle pairs."""
+    controller = mock_main_controller
+    mock_config_manager.strategy_instance.get_pair_interval.return_value = 60
+    for pair in mock_config_manager.pairs.values():
+        pair.dex.order = None
+        pair.dex.current_order = None
+        pair.t1.symbol, pair.t2.symbol = 'T1', 'T2'
+    controller.balance_manager.changed_tokens = set()
+    controller.schedule_pairs()
+
+    # Nothing due, no events: strategy step skipped
+    await controller.main_loop(scheduled=True)
+    controller.processor.process_pairs.assert_not_awaited()
+
+    # A balance change on T1 wakes the enabled pair for this cycle
+    controller.balance_manager.changed_tokens = {'T1'}
+    await controller.main_loop(scheduled=True)
+    controller.processor.process_pairs.assert_awaited_once()
+    assert controller.processor.process_pairs.await_args.args[1] == ['pair1']
+    assert controller.scheduler.next_due_in() > 50
+
+
+
+@pytest.mark.asyncio
+async def test_main_controller_reschedules_pairs_when_processing_fails(mock_main_controller, mock_config_manager):
+    """Tests that due pairs are rescheduled even if processing them raises."""
+    controller = mock_main_controller
+    mock_config_manager.strategy_instance.get_pair_interval.return_value = 60
+    mock_config_manager.error_handler.handle_async = AsyncMock()
+    for pair in mock_config_manager.pairs.values():
+        pair.dex.order = None
+        pair.dex.current_order = None
+    controller.balance_manager.changed_tokens = set()
+    controller.schedule_pairs()
+    controller.scheduler.wake('pair1')
+    controller.processor.process_pairs.side_effect = RuntimeError("boom")
+
+    await controller.main_loop(scheduled=True)
+
+    mock_config_manager.error_handler.handle_async.assert_awaited_once()
+    assert 'pair1' in controller.scheduler
+    assert controller.scheduler.next_due_in() > 50
+
+@pytest.mark.asyncio
+async def test_main_controller_watch_tick_makes_no_rpc(mock_main_controller, mock_config_manager):
+    """Tests that a watch tick only re-prices pairs from pushed prices and wakes those out of range."""
+    controller = mock_main_controller
+    mock_config_manager.strategy_instance.get_pair_interval.return_value = 60
+    for pair in mock_config_manager.pairs.values():
+        pair.dex.order = {'id': 'a', 'status': 'open'}
+        pair.dex.current_order = None
+    controller.balance_manager.changed_tokens = {'T1'}  # Stale: already handled by the last full refresh
+    controller.order_snapshot = {'a': {'id': 'a', 'status': 'finished'}}
+    controller.schedule_pairs()
+
+    controller.price_handler.update_pushed_prices.return_value = False
+    assert await controller.watch_tick() is False
+    mock_config_manager.pairs['pair1'].cex.update_pricing.assert_not_awaited()
+
+    controller.price_handler.update_pushed_prices.return_value = True
+    assert await controller.watch_tick() is False  # Balance/order events are left to the full refresh
+    mock_config_manager.pairs['pair1'].cex.update_pricing.assert_awaited_once()
+
+    pair1 = mock_config_manager.pairs['pair1']
+    pair1.dex.current_order = VirtualOrder(org_pprice=1.0)
+    pair1.dex.check_price_in_range.return_value = False
+    assert await controller.watch_tick() is True
+    assert controller.scheduler.pop_due() == ['pair1']
+
+    controller.balance_manager.update_balances.assert_not_awaited()
+    controller.price_handler.update_ccxt_prices.assert_not_awaited()
+    mock_config_manager.xbridge_manager.getmyorders.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_main_controller_close_session(mock_config_manager):
     """Test HTTP session closure logic."""
@@ -264,3 +495,115 @@ async def test_main_controller_close_session(mock_config_manager):
     await controller.close_http_session()
     session.close.assert_awaited_once()
     assert controller.http_session is None
+
+
+@pytest.mark.asyncio
+async def test_trading_processor_slow_pair_does_not_block_cycle(mock_config_manager):
+    """Tests that a pair past the deadline keeps running in the background and is skipped until done."""
+    mock_controller = MagicMock()
+    mock_controller.pairs_dict = {
+        'fast': MagicMock(disabled=False),
+        'slow': MagicMock(disabled=False)
+    }
+    mock_controller.shutdown_event = asyncio.Event()
+    mock_controller.config_manager.strategy = 'test_slow_pair'
+    mock_controller.config_manager.config_xbridge.pair_timeout = 0.05
+    mock_controller.config_manager.config_xbridge.pair_concurrency = 1
+    processor = TradingProcessor(mock_controller)
+    assert processor.pair_concurrency == 1
+    release = asyncio.Event()
+    calls = []
+
+    async def target(pair):
+        calls.append(pair)
+        if pair is mock_controller.pairs_dict['slow']:
+            await release.wait()
+
+    await asyncio.wait_for(processor.process_pairs(target), timeout=1)
+    assert 'slow' in processor._stragglers
+    assert metrics.histogram("stage", stage="pair_step", strategy='test_slow_pair', pair='fast').count == 1
+
+    # Next cycle skips the straggler
+    await processor.process_pairs(target)
+    assert calls.count(mock_controller.pairs_dict['slow']) == 1
+    assert calls.count(mock_controller.pairs_dict['fast']) == 2
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert processor._stragglers == {}
+    assert metrics.histogram("stage", stage="pair_step", strategy='test_slow_pair', pair='slow').count == 1
+
+
+@pytest.mark.asyncio
+async def test_trading_processor_timeout_starts_when_pair_runs(mock_config_manager):
+    """Tests that time spent waiting for a concurrency slot does not count toward the pair timeout."""
+    mock_controller = MagicMock()
+    mock_controller.pairs_dict = {f'p{i}': MagicMock(disabled=False) for i in range(4)}
+    mock_controller.shutdown_event = asyncio.Event()
+    mock_controller.config_manager.strategy = 'test_pair_timeout'
+    mock_controller.config_manager.config_xbridge.pair_timeout = 0.1
+    mock_controller.config_manager.config_xbridge.pair_concurrency = 1
+    processor = TradingProcessor(mock_controller)
+
+    async def target(pair):
+        await asyncio.sleep(0.04)  # Under the timeout, but 4 in a row are not
+
+    await asyncio.wait_for(processor.process_pairs(target), timeout=2)
+    assert processor._stragglers == {}
+    assert all(metrics.histogram("stage", stage="pair_step", strategy='test_pair_timeout', pair=name).count == 1
+               for name in mock_controller.pairs_dict)
+
+
+@pytest.mark.asyncio
+async def test_trading_processor_failing_pair_does_not_orphan_others(mock_config_manager):
+    """Tests that a pair raising is reported while slow pairs are still tracked as running."""
+    mock_controller = MagicMock()
+    mock_controller.pairs_dict = {'bad': MagicMock(disabled=False), 'slow': MagicMock(disabled=False)}
+    mock_controller.shutdown_event = asyncio.Event()
+    mock_controller.config_manager.config_xbridge.pair_timeout = 0.05
+    mock_controller.config_manager.config_xbridge.pair_concurrency = 0
+    mock_controller.config_manager.error_handler.handle_async = AsyncMock()
+    processor = TradingProcessor(mock_controller)
+    release = asyncio.Event()
+
+    async def target(pair):
+        if pair is mock_controller.pairs_dict['bad']:
+            raise ValueError("boom")
+        await release.wait()
+
+    await asyncio.wait_for(processor.process_pairs(target), timeout=1)
+    error, = mock_controller.config_manager.error_handler.handle_async.await_args.args
+    assert isinstance(error, ValueError)
+    assert list(processor._stragglers) == ['slow']
+    release.set()
+    await asyncio.sleep(0.01)
+    assert processor._stragglers == {}
+
+
+@pytest.mark.asyncio
+async def test_trading_processor_reports_each_pair_as_it_finishes(mock_config_manager):
+    """Tests that a failed pair is reported without waiting for the slowest pair of the cycle."""
+    mock_controller = MagicMock()
+    mock_controller.pairs_dict = {'bad': MagicMock(disabled=False), 'slow': MagicMock(disabled=False)}
+    mock_controller.shutdown_event = asyncio.Event()
+    mock_controller.config_manager.config_xbridge.pair_timeout = 5
+    mock_controller.config_manager.config_xbridge.pair_concurrency = 0
+    handle_async = mock_controller.config_manager.error_handler.handle_async = AsyncMock()
+    processor = TradingProcessor(mock_controller)
+    release = asyncio.Event()
+
+    async def target(pair):
+        if pair is mock_controller.pairs_dict['bad']:
+            raise ValueError("boom")
+        await release.wait()
+
+    cycle = asyncio.ensure_future(processor.process_pairs(target))
+    await asyncio.sleep(0.05)
+    assert not cycle.done()
+    handle_async.assert_awaited_once()
+    assert handle_async.await_args.kwargs["context"] == {"pair": "bad", "stage": "process_pair"}
+
+    release.set()
+    await asyncio.wait_for(cycle, timeout=1)
+    handle_async.assert_awaited_once()
+    assert processor._stragglers == {}
@@ -0,0 +1,59 @@
+import os
+import sys
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.order_journal import OrderJournal
+from definitions.state_store import SqliteStateStore
+
+
+def _store(tmp_path):
+    return SqliteStateStore(str(tmp_path / "data" / "state.sqlite3"))
+
+
+def test_records_survive_reopen(tmp_path):
+    """Tests that puts, deletes and clears are committed and visible after a restart."""
+    store = _store(tmp_path)
+    store.put("dex_history", "pingpong_A_B", {"side": "SELL", "dex_price": 0.3})
+    store.put("dex_history", "pingpong_C_D", {"side": "BUY"})
+    store.put("dex_history", "pingpong_A_B", {"side": "BUY", "dex_price": 0.29})
+    store.delete("dex_history", "pingpong_C_D")
+    store.put("arbitrage_states", "abc", {"status": "XBRIDGE_INITIATED"})
+    store.clear("arbitrage_states")
+    store.close()
+
+    reopened = _store(tmp_path)
+    assert reopened.items("dex_history") == {"pingpong_A_B": {"side": "BUY", "dex_price": 0.29}}
+    assert reopened.get("arbitrage_states", "abc") is None
+    assert reopened._connect().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_find_by_status_and_time(tmp_path):
+    """Tests the indexed status/timestamp lookups, oldest first."""
+    store = _store(tmp_path)
+    store.put("arbitrage_states", "c", {"status": "THORCHAIN_INITIATED", "timestamp": 300.0})
+    store.put("arbitrage_states", "a", {"status": "XBRIDGE_INITIATED", "timestamp": 100.0})
+    store.put("arbitrage_states", "b", {"status": "THORCHAIN_INITIATED", "timestamp": 200.0})
+    store.put("other", "d", {"status": "THORCHAIN_INITIATED", "timestamp": 250.0})
+
+    assert list(store.find("arbitrage_states", status="THORCHAIN_INITIATED")) == ["b", "c"]
+    assert list(store.find("arbitrage_states", since=150.0)) == ["b", "c"]
+    assert list(store.find("arbitrage_states", since=100.0, until=300.0)) == ["a", "b"]
+    plan = store._connect().execute(
+        "EXPLAIN QUERY PLAN SELECT key FROM records WHERE namespace = ? AND status = ?", ("x", "y")).fetchall()
+    assert "records_status" in str(plan)
+
+
+def test_existing_journal_is_imported_once(tmp_path):
+    """Tests that records of an order journal left by an earlier version move into the database."""
+    journal = OrderJournal(str(tmp_path / "data" / "order_journal.jsonl"))
+    journal.put("dex_history", "pingpong_A_B", {"side": "SELL"})
+    journal.put("arbitrage_states", "abc", {"status": "XBRIDGE_INITIATED", "timestamp": 1.0})
+    journal.close()
+
+    store = _store(tmp_path)
+    assert store.get("dex_history", "pingpong_A_B") == {"side": "SELL"}
+    assert list(store.find("arbitrage_states", status="XBRIDGE_INITIATED")) == ["abc"]
+    assert not os.path.exists(journal.path)
+    assert os.path.exists(journal.path + ".imported")
@@ -120,8 +120,8 @@ async def test_cex_token_update_price_custom_ticker(token):
 async def test_cex_token_update_price_api_failure(token):
     """Test CexToken.update_price when API call fails repeatedly."""
     token.config_manager.my_ccxt.symbols = ['TEST/BTC']
-    # Mock `ccxt_call_fetch_ticker` to simulate a persistent failure.
-    token.config_manager.ccxt_manager.ccxt_call_fetch_ticker = AsyncMock(side_effect=Exception("API Error"))
+    # Mock the price resolver to simulate a persistent failure.
+    token.config_manager.price_resolver.fetch_ticker = AsyncMock(side_effect=Exception("API Error"))
 
     # Invalidate timer to ensure fetch is attempted
     token.cex.cex_price_timer = None
@@ -187,13 +187,13 @@ async def test_cex_token_update_price_exchange_success(token):
     token.config_manager.my_ccxt.symbols = ['TEST/BTC']
     token.config_manager.tokens['BTC'].cex.usd_price = 50000.0
 
-    # Mock the ccxt_manager's fetch_ticker method to return a valid ticker
+    # Mock the price resolver to return a valid ticker
     mock_ticker = {
         'info': {
             'lastTradeRate': '0.0002'
         }
     }
-    token.config_manager.ccxt_manager.ccxt_call_fetch_ticker = AsyncMock(return_value=mock_ticker)
+    token.config_manager.price_resolver.fetch_ticker = AsyncMock(return_value=mock_ticker)
 
     await token.cex.update_price()
 
@@ -209,14 +209,14 @@ async def test_cex_token_update_price_btc(token):
     token.config_manager.tokens['BTC'].cex.usd_price = 50000.0
 
     # We don't expect any external calls for BTC since it's handled as a special case
-    token.config_manager.ccxt_manager.ccxt_call_fetch_ticker = AsyncMock()
+    token.config_manager.price_resolver.fetch_ticker = AsyncMock()
 
     await token.cex.update_price()
 
     # For BTC, cex_price should be 1 and usd_price should be the BTC token's USD price (50000.0)
     assert token.cex.cex_price == 1.0
     assert token.cex.usd_price == 50000.0
-    token.config_manager.ccxt_manager.ccxt_call_fetch_ticker.assert_not_awaited()
+    token.config_manager.price_resolver.fetch_ticker.assert_not_awaited()
 
 
 # Token class property tests
@@ -0,0 +1,150 @@
+import os
+import sys
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add parent directory to path for module imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from definitions.file_io import ControlFile
+from definitions.state_store import SqliteStateStore
+from definitions.write_behind import WriteBehindRecord
+from strategies.thorchain_continuous_strategy import (ContinuousTradeState, ThorChainContinuousStrategy,
+                                                      TradeDirection, TradeMetrics)
+
+
+def test_burst_of_saves_is_one_write():
+    """Tests that snapshots submitted within the debounce delay are coalesced into the latest one."""
+    store = MagicMock()
+    writer = WriteBehindRecord(store, "ns", "key", delay=0.05, max_delay=5.0)
+    for i in range(20):
+        writer.submit({"n": i})
+    assert writer.flush(timeout=5)
+    store.put.assert_called_once_with("ns", "key", {"n": 19})
+    store.sync.assert_not_called()
+    writer.close()
+
+
+def test_flush_submit_writes_and_syncs_without_debounce():
+    """Tests that a critical save is stored and synced without waiting for the delay."""
+    store = MagicMock()
+    synced = threading.Event()
+    store.sync.side_effect = synced.set
+    writer = WriteBehindRecord(store, "ns", "key", delay=3600, max_delay=3600)
+    writer.submit({"status": "AWAITING_REFUND"}, flush=True)
+    assert synced.wait(timeout=5)
+    store.put.assert_called_once_with("ns", "key", {"status": "AWAITING_REFUND"})
+    store.sync.assert_called_once()
+    writer.close()
+
+
+def test_discard_drops_pending_snapshot():
+    store = MagicMock()
+    writer = WriteBehindRecord(store, "ns", "key", delay=3600, max_delay=3600)
+    writer.submit({"n": 1})
+    writer.discard()
+    assert writer.flush(timeout=1)
+    store.put.assert_not_called()
+    writer.close()
+
+
+@pytest.fixture
+def continuous_state(tmp_path):
+    strategy = MagicMock()
+    strategy.config_manager.state_store = SqliteStateStore(str(tmp_path / "state.sqlite3"))
+    strategy.get_dex_history_file_path.return_value = str(tmp_path / "thorchain_LTC_DOGE_state.yaml")
+    strategy.starting_balances = {"LTC": 1.0, "DOGE": 100.0}
+    strategy.token1, strategy.token2 = "LTC", "DOGE"
+    strategy.dry_mode = True
+    state = ContinuousTradeState(strategy)
+    state.writer.delay = 3600
+    state.writer.max_delay = 3600
+    yield state
+    state.writer.close()
+    strategy.config_manager.state_store.close()
+
+
+def test_continuous_state_save_is_write_behind(continuous_state):
+    """Tests that save() only queues the state, and the writer stores it normalized."""
+    store = continuous_state.strategy.config_manager.state_store
+    continuous_state.state_data['metrics'] = TradeMetrics(0.5, 0.01, 0.0, 0.0, 0.0, 0.0, cumulative_trades=3)
+    continuous_state.save({'anchor_rate': '0.25', 'last_direction': TradeDirection.TOKEN1_TO_TOKEN2})
+    assert store.get(ContinuousTradeState.NAMESPACE, continuous_state.state_key) is None
+
+    # Later in-memory changes are not part of the queued snapshot
+    continuous_state.state_data['metrics'].cumulative_trades = 4
+    continuous_state.state_data['virtual_balances']['LTC'] = 0.0
+    assert continuous_state.writer.flush(timeout=5)
+
+    stored = store.get(ContinuousTradeState.NAMESPACE, continuous_state.state_key)
+    assert stored['anchor_rate'] == 0.25
+    assert stored['last_direction'] == "TOKEN1_TO_TOKEN2"
+    assert stored['metrics']['cumulative_trades'] == 3
+    assert stored['virtual_balances'] == {"LTC": 1.0, "DOGE": 100.0}
+
+
+def test_archive_discards_queued_save(continuous_state):
+    store = continuous_state.strategy.config_manager.state_store
+    continuous_state.save({'pause_reason': 'Circuit breaker'})
+    continuous_state.archive('Circuit breaker')
+    assert continuous_state.writer.flush(timeout=5)
+    assert store.get(ContinuousTradeState.NAMESPACE, continuous_state.state_key) is None
+    assert len(store.items(f"{ContinuousTradeState.NAMESPACE}/archive")) == 1
+
+
+def _live_strategy(state, tmp_path):
+    """Real swap and recovery methods of the strategy bound to a mock holding ``state``."""
+    strategy = MagicMock()
+    strategy.state = state
+    strategy.dry_mode = False
+    strategy.max_fee_threshold = 0.01
+    strategy.pause_file_path = str(tmp_path / "TRADING_PAUSED.json")
+    strategy.config_manager.pairs = {'LTC/DOGE': MagicMock()}
+    strategy.config_manager.xbridge_manager.xbridge_conf = {}
+    for name in ('_execute_live_swap', '_settle_live_swap', '_recover_pending_swap'):
+        setattr(strategy, name, getattr(ThorChainContinuousStrategy, name).__get__(strategy))
+    return strategy
+
+
+@pytest.mark.asyncio
+async def test_live_swap_pending_record_is_stored_and_cleared(continuous_state, tmp_path):
+    """Tests that a sent swap is stored before it settles, and cleared when it fails."""
+    store = continuous_state.strategy.config_manager.state_store
+    strategy = _live_strategy(continuous_state, tmp_path)
+    quote = {'amount_base': 1.0, 'inbound_address': 'addr', 'memo': 'm', 'fees': {'outbound': 0}}
+
+    async def monitor(txid):
+        # The record is already stored (not only queued) while the swap is in flight
+        stored = store.get(ContinuousTradeState.NAMESPACE, continuous_state.state_key)
+        assert stored['pending_swap']['txid'] == 'tx1'
+        return 'refunded'
+
+    strategy._monitor_thorchain_swap = monitor
+    with patch('strategies.thorchain_continuous_strategy.execute_thorchain_swap', AsyncMock(return_value='tx1')):
+        result = await strategy._execute_live_swap(quote, TradeDirection.TOKEN1_TO_TOKEN2)
+
+    assert result == {'success': False, 'reason': 'Status: refunded'}
+    assert continuous_state.state_data['pending_swap'] is None
+    assert continuous_state.writer.flush(timeout=5)
+    assert store.get(ContinuousTradeState.NAMESPACE, continuous_state.state_key)['pending_swap'] is None
+
+
+@pytest.mark.asyncio
+async def test_leftover_pending_swap_pauses_trading(continuous_state, tmp_path):
+    """Tests that a swap sent before a restart without a recorded result pauses trading once."""
+    strategy = _live_strategy(continuous_state, tmp_path)
+    continuous_state.state_data['pending_swap'] = {'txid': 'tx1', 'direction': 'TOKEN1_TO_TOKEN2', 'amount': 1.0}
+
+    await strategy._recover_pending_swap()
+
+    pause_file = ControlFile.watch(strategy.pause_file_path)
+    try:
+        assert pause_file.exists
+        assert 'tx1' in pause_file.data['reason']
+        assert pause_file.data['pending_swap']['txid'] == 'tx1'
+        store = continuous_state.strategy.config_manager.state_store
+        assert store.get(ContinuousTradeState.NAMESPACE, continuous_state.state_key)['pending_swap'] is None
+    finally:
+        ControlFile._instances.pop(strategy.pause_file_path, None)
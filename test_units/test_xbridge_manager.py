@@ -9,13 +9,17 @@ import pytest
 # Add parent directory to path for module imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from definitions.rpc import RpcBatchUnsupportedError
 from definitions.xbridge_manager import XBridgeManager
 
 
 @pytest.fixture(autouse=True)
 def reset_xbridge_manager_class_vars():
     XBridgeManager._active_rpc_counter = 0
-    XBridgeManager._rpc_semaphore = None
+    XBridgeManager._rpc_limiter = None
+    XBridgeManager._batch_supported = True
+    XBridgeManager._rpc_cache = None
+    XBridgeManager._read_stats = {"hits": 0, "misses": 0, "coalesced": 0}
     yield
 
 
@@ -65,7 +69,8 @@ async def test_gettokenutxo_caching(xbridge_manager):
     # 3. Third call after cache duration (cache miss)
     xbridge_manager.mock_rpc_call.reset_mock()
     # Manually expire cache for test reliability
-    with patch('time.time', return_value=time.time() + xbridge_manager.UTXO_CACHE_DURATION + 1):
+    ttl = XBridgeManager._rpc_cache.ttls['dxgetutxos']
+    with patch('definitions.rpc_cache.monotonic', return_value=time.monotonic() + ttl + 1):
         result3 = await xbridge_manager.gettokenutxo(token)
         assert result3 == mock_utxos
         xbridge_manager.mock_rpc_call.assert_called_once()
@@ -102,6 +107,212 @@ async def test_rpc_wrapper_concurrency_and_counter(xbridge_manager):
     assert manager.active_rpc_counter == 0
 
 
+@pytest.mark.asyncio
+async def test_rpc_wrapper_reuses_pooled_session(xbridge_manager):
+    """Tests that calls on the same loop share one keep-alive session until it is closed."""
+    manager = xbridge_manager
+    manager.mock_rpc_call.return_value = {"status": "open"}
+
+    await manager.rpc_wrapper("dxGetOrder", ["id1"])
+    first_session = manager.mock_rpc_call.call_args.kwargs['session']
+    await manager.rpc_wrapper("dxGetOrder", ["id2"])
+    second_session = manager.mock_rpc_call.call_args.kwargs['session']
+
+    assert first_session is not None
+    assert first_session is second_session
+
+    await manager.close_session()
+    assert first_session.closed
+    assert asyncio.get_running_loop() not in XBridgeManager._sessions
+
+
+@pytest.mark.asyncio
+async def test_rpc_wrapper_batches_concurrent_reads(xbridge_manager):
+    """Tests that concurrent read-only calls are sent as one batch and demultiplexed per caller."""
+    manager = xbridge_manager
+    responses = [
+        {"jsonrpc": "2.0", "result": {"id": "a", "status": "open"}, "id": 0},
+        {"jsonrpc": "2.0", "error": {"code": 1004, "message": "Order not found"}, "id": 1},
+        {"jsonrpc": "2.0", "result": [{"amount": "1.0"}], "id": 2},
+    ]
+    with patch('definitions.xbridge_manager.rpc_batch_call', new_callable=AsyncMock,
+               return_value=responses) as mock_batch:
+        results = await asyncio.gather(
+            manager.getorderstatus("a"),
+            manager.getorderstatus("b"),
+            manager.rpc_wrapper("dxgetutxos", ["BLOCK", True]),
+        )
+
+    mock_batch.assert_awaited_once()
+    assert mock_batch.call_args.args[0] == [("dxGetOrder", ["a"]), ("dxGetOrder", ["b"]),
+                                            ("dxgetutxos", ["BLOCK", True])]
+    assert results[0] == {"id": "a", "status": "open"}
+    assert results[1]["error"]["code"] == 1004
+    assert results[2] == [{"amount": "1.0"}]
+    manager.mock_rpc_call.assert_not_called()
+    assert manager.active_rpc_counter == 0
+
+
+@pytest.mark.asyncio
+async def test_rpc_wrapper_batch_rejected_falls_back_to_single_calls(xbridge_manager):
+    """Tests that a node rejecting batch requests disables batching and retries each call alone."""
+    manager = xbridge_manager
+    manager.mock_rpc_call.return_value = {"status": "open"}
+    with patch('definitions.xbridge_manager.rpc_batch_call', new_callable=AsyncMock,
+               side_effect=RpcBatchUnsupportedError("not a batch")) as mock_batch:
+        results = await asyncio.gather(manager.getorderstatus("a"), manager.getorderstatus("b"))
+        assert results == [{"status": "open"}, {"status": "open"}]
+        assert manager.mock_rpc_call.await_count == 2
+        assert XBridgeManager._batch_supported is False
+
+        # Subsequent calls skip the batch path entirely
+        await asyncio.gather(manager.getorderstatus("c"), manager.getorderstatus("d"))
+        mock_batch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_rpc_wrapper_caps_batch_size(xbridge_manager):
+    """Tests that a burst of reads is split into batches of at most RPC_BATCH_MAX_SIZE calls."""
+    manager = xbridge_manager
+    manager.rpc_batch_window = 3600  # Only a full queue can trigger a flush in time
+
+    async def answer(calls, **kwargs):
+        return [{"result": params[0], "id": i} for i, (_, params) in enumerate(calls)]
+
+    with patch.object(XBridgeManager, 'RPC_BATCH_MAX_SIZE', 4), \
+            patch('definitions.xbridge_manager.rpc_batch_call', new_callable=AsyncMock,
+                  side_effect=answer) as mock_batch:
+        results = await asyncio.wait_for(
+            asyncio.gather(*(manager.getorderstatus(str(i)) for i in range(8))), timeout=5)
+
+    assert results == [str(i) for i in range(8)]
+    assert [len(call.args[0]) for call in mock_batch.await_args_list] == [4, 4]
+    assert XBridgeManager._batch_supported is True
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_reads_share_one_request(xbridge_manager):
+    """Tests that concurrent identical read-only calls are coalesced into a single RPC."""
+    manager = xbridge_manager
+
+    async def delayed_rpc(*args, **kwargs):
+        await asyncio.sleep(0.02)
+        return ["BLOCK", "LTC"]
+
+    manager.mock_rpc_call.side_effect = delayed_rpc
+
+    results = await asyncio.gather(*(manager.getlocaltokens() for _ in range(4)))
+
+    assert results == [["BLOCK", "LTC"]] * 4
+    manager.mock_rpc_call.assert_awaited_once()
+    reads = manager.rpc_stats()["reads"]
+    assert reads["misses"] == 1
+    assert reads["coalesced"] == 3
+    assert not XBridgeManager._inflight_reads.get(asyncio.get_running_loop())
+
+    # Each caller owns its result: mutating one does not change the others
+    results[0].append("DASH")
+    assert results[1:] == [["BLOCK", "LTC"]] * 3
+
+
+@pytest.mark.asyncio
+async def test_coalesced_read_propagates_leader_error(xbridge_manager):
+    """Tests that followers of a failed single-flight read receive the same error."""
+    manager = xbridge_manager
+
+    async def failing_rpc(*args, **kwargs):
+        await asyncio.sleep(0.02)
+        raise ConnectionError("node down")
+
+    manager.mock_rpc_call.side_effect = failing_rpc
+
+    results = await asyncio.gather(manager.getmyordersbymarket("A", "B"), manager.rpc_wrapper("dxGetMyOrders"),
+                                   return_exceptions=True)
+
+    assert all(isinstance(r, Exception) for r in results)
+    manager.mock_rpc_call.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_call_invalidates_related_cached_reads(xbridge_manager):
+    """Tests that placing an order drops cached reads for its tokens but keeps unrelated ones."""
+    manager = xbridge_manager
+    manager.mock_rpc_call.return_value = [{"amount": "1.0"}]
+    await manager.gettokenutxo("BLOCK", used=True)
+    await manager.gettokenutxo("LTC", used=True)
+    await manager.gettokenutxo("DASH", used=True)
+    assert manager.mock_rpc_call.await_count == 3
+
+    manager.mock_rpc_call.return_value = {"id": "new_order"}
+    await manager.makeorder("BLOCK", "1.0", "m_addr", "LTC", "0.1", "t_addr")
+
+    manager.mock_rpc_call.reset_mock()
+    manager.mock_rpc_call.return_value = [{"amount": "2.0"}]
+    assert await manager.gettokenutxo("DASH", used=True) == [{"amount": "1.0"}]
+    manager.mock_rpc_call.assert_not_called()
+    assert await manager.gettokenutxo("BLOCK", used=True) == [{"amount": "2.0"}]
+    assert await manager.gettokenutxo("LTC", used=True) == [{"amount": "2.0"}]
+    assert manager.mock_rpc_call.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rpc_error_results_are_not_cached(xbridge_manager):
+    """Tests that JSON-RPC error responses are returned but never cached."""
+    manager = xbridge_manager
+    manager.mock_rpc_call.return_value = {"error": {"code": 1004, "message": "Order not found"}}
+    await manager.getorderstatus("missing")
+    await manager.getorderstatus("missing")
+    assert manager.mock_rpc_call.await_count == 2
+
+
+def test_rpc_cache_evicts_least_recently_used():
+    """Tests LRU eviction once the cache is full."""
+    from definitions.rpc_cache import RpcCache
+    cache = RpcCache({"dxGetOrder": 60}, max_entries=2)
+    cache.set("dxGetOrder", ("a",), 1)
+    cache.set("dxGetOrder", ("b",), 2)
+    assert cache.get("dxGetOrder", ("a",)) == (True, 1)
+    cache.set("dxGetOrder", ("c",), 3)
+
+    assert cache.get("dxGetOrder", ("b",)) == (False, None)
+    assert cache.get("dxGetOrder", ("a",)) == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_results_are_isolated_between_callers(xbridge_manager):
+    """Tests that mutating a (cached) result does not change what later callers read."""
+    manager = xbridge_manager
+    manager.mock_rpc_call.return_value = [{"txid": "123", "amount": 100}]
+
+    first = await manager.gettokenutxo("BLOCK")
+    first[0]["amount"] = 0
+    first.append({"txid": "456"})
+
+    second = await manager.gettokenutxo("BLOCK")
+    manager.mock_rpc_call.assert_awaited_once()
+    assert second == [{"txid": "123", "amount": 100}]
+    second.clear()
+    assert await manager.gettokenutxo("BLOCK") == [{"txid": "123", "amount": 100}]
+
+
+@pytest.mark.asyncio
+async def test_rpc_latency_only_times_daemon_calls(xbridge_manager):
+    """Tests that cache hits are not recorded in the per-method RPC latency histogram."""
+    from definitions.metrics import metrics
+    manager = xbridge_manager
+    manager.mock_rpc_call.return_value = ["BLOCK", "LTC"]
+    histogram = metrics.histogram("rpc", method="dxgetlocaltokens")
+    before = histogram.count
+
+    for _ in range(5):
+        await manager.getlocaltokens()
+
+    manager.mock_rpc_call.assert_awaited_once()
+    assert histogram.count - before == 1
+    assert manager.rpc_stats()["reads"]["hits"] == 4
+
+
 @pytest.mark.asyncio
 async def test_makeorder_dryrun(xbridge_manager):
     """Tests that makeorder calls rpc_wrapper with the correct 'dryrun' parameter."""